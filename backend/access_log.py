@@ -0,0 +1,203 @@
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, request
+
+from davinciapi.instrumentation import begin_request, request_bridge_calls
+
+logger = logging.getLogger('DaVinciAPI.access')
+
+# Routes polled often enough that only every Nth request is logged
+ACCESS_LOG_SAMPLING = {
+    "/api/health": 50,
+    "/api/davinci/status": 10,
+    "/api/davinci/snapshot": 10,
+    "/api/davinci/project": 5,
+    "/api/davinci/timeline": 5,
+    "/api/davinci/mediapool": 5,
+    "/api/davinci/renderjobs": 5,
+    "/api/metrics": 10,
+}
+
+# Requests slower than this many milliseconds are logged even when sampled out
+SLOW_REQUEST_MS = 500.0
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock prepare() formats the message in the logging thread; here the record is
+    queued as is, so a request thread only pays for building the record.
+    """
+
+    def prepare(self, record):
+        return record
+
+def start_queue_logging():
+    """Move the root logger's handlers behind a queue so no request thread blocks on log I/O.
+
+    Returns:
+        QueueListener: The listener writing to the original handlers, None if already started
+    """
+    root = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        return None
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+class AccessLog:
+    """Structured, sampled access log written as one JSON object per line.
+
+    Each entry carries the route, status, duration in ms and the number of Resolve bridge
+    calls the request made. Routes in the sampling table are only logged every Nth time;
+    errors (status >= 500) and requests slower than slow_ms are always logged. Entries go
+    through a queue and are written to stdout by a listener thread.
+    """
+
+    def __init__(self, sampling=None, slow_ms=SLOW_REQUEST_MS, stream=None):
+        self.sampling = dict(ACCESS_LOG_SAMPLING if sampling is None else sampling)
+        self.slow_ms = slow_ms
+        self.stream = stream
+        self.logged = 0
+        self.sampled_out = 0
+        self._seen = {}
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def init_app(self, app):
+        """Register the request hooks (first, so the duration covers the other hooks) and start the writer."""
+        app.before_request_funcs.setdefault(None, []).insert(0, self._before_request)
+        app.after_request(self._after_request)
+        self.start()
+
+    def start(self):
+        if self._listener:
+            return
+        handler = logging.StreamHandler(self.stream or sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        # Access entries are JSON lines of their own, not wrapped in the root format
+        logger.propagate = False
+        self._listener = QueueListener(log_queue, handler)
+        self._listener.start()
+
+    def stop(self):
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+
+    def _before_request(self):
+        g.access_started = time.perf_counter()
+
+    def _sampled(self, route, status, duration_ms):
+        """Count the request and decide whether it is logged."""
+        rate = self.sampling.get(route)
+        always = not rate or rate <= 1 or status >= 500 or duration_ms >= self.slow_ms
+        with self._lock:
+            if always:
+                sampled = True
+            else:
+                seen = self._seen.get(route, 0)
+                self._seen[route] = seen + 1
+                sampled = seen % rate == 0
+            if sampled:
+                self.logged += 1
+            else:
+                self.sampled_out += 1
+        return sampled
+
+    def _after_request(self, response):
+        started = g.get("access_started")
+        if started is None:
+            return response
+        # Streaming responses (/api/events) are logged when their headers go out
+        self.record(request.method, request.path, request.url_rule.rule if request.url_rule else None,
+                    response.status_code, (time.perf_counter() - started) * 1000, request.remote_addr)
+        return response
+
+    def record(self, method, path, route, status, duration_ms, remote_addr):
+        """Count a finished request and log it unless it is sampled out."""
+        if not self._sampled(route, status, duration_ms):
+            return
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s", _AccessEntry({
+                "time": time.time(),
+                "method": method,
+                "path": path,
+                "route": route,
+                "status": status,
+                "duration_ms": round(duration_ms, 2),
+                "bridge_calls": request_bridge_calls(),
+                "remote_addr": remote_addr,
+                "sample_rate": self.sampling.get(route, 1)
+            }))
+
+    def get_stats(self):
+        with self._lock:
+            logged, sampled_out = self.logged, self.sampled_out
+        return {
+            "logged": logged,
+            "sampled_out": sampled_out,
+            "sampling": self.sampling,
+            "slow_ms": self.slow_ms
+        }
+
+class AccessLogMiddleware:
+    """ASGI middleware writing the routes an ASGI app serves itself to an AccessLog.
+
+    Requests for other paths pass through untouched; the Flask app mounted below the ASGI
+    app logs those with its own hooks.
+    """
+
+    def __init__(self, app, access_log, routes):
+        self.app = app
+        self.access_log = access_log
+        self.routes = frozenset(routes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        client = scope.get("client")
+        remote_addr = client[0] if client else None
+        started = time.perf_counter()
+        responded = False
+        # Same bridge call attribution as the Flask request hooks
+        begin_request(path)
+
+        async def send_logged(message):
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = True
+                self.access_log.record(scope["method"], path, path, message["status"],
+                                       (time.perf_counter() - started) * 1000, remote_addr)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_logged)
+        except Exception:
+            if not responded:
+                self.access_log.record(scope["method"], path, path, 500, (time.perf_counter() - started) * 1000, remote_addr)
+            raise
+
+class _AccessEntry:
+    """Serialized to JSON only when the listener thread formats the record."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __str__(self):
+        return json.dumps(self.fields, separators=(',', ':'))
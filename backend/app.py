@@ -1,44 +1,102 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, send_file, stream_with_context
 from flask_cors import CORS
+import atexit
 import datetime
 import os
 import sys
 import json
+import time
+
+from davinciapi.connection import ConnectionSupervisor
+from davinciapi.davinciapi import (
+    DaVinciResolveAPI,
+    MEDIA_POOL_CLIPS_PAGE_SIZE,
+    SNAPSHOT_SECTIONS,
+    TIMELINE_ITEMS_PAGE_SIZE,
+    is_verbose_logging,
+    set_verbose_logging
+)
+from davinciapi.instrumentation import begin_request
+from davinciapi.export_jobs import EXPORT_FORMATS
+from davinciapi.metadata_store import MetadataStore
+from davinciapi.thumbnails import PLACEHOLDER_SVG
+from access_log import AccessLog, start_queue_logging
+from events import EventBroker, ChangePoller, HEARTBEAT_INTERVAL, Subscription, format_sse
+from response_cache import ResponseCache
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize DaVinci Resolve API
-try:
-    from davinciapi.davinciapi import get_resolve_connection
-    davinci_api = get_resolve_connection()
-    if not davinci_api:
-        print("Warning: Could not connect to DaVinci Resolve")
-except Exception as e:
-    print(f"Error initializing DaVinci Resolve API: {str(e)}")
-    davinci_api = None
+# Log records are written by listener threads; request threads only enqueue them
+start_queue_logging()
+access_log = AccessLog()
+access_log.init_app(app)
+
+# The API starts out disconnected; the supervisor connects (and reconnects) in the background
+# so the server can bind its port without waiting for Resolve
+# Crawled metadata is persisted so the first requests after a restart are served from disk
+metadata_store = MetadataStore()
+atexit.register(metadata_store.close)
+davinci_api = DaVinciResolveAPI(connect=False, metadata_store=metadata_store)
+connection_supervisor = ConnectionSupervisor(davinci_api)
+
+# One shared poller samples Resolve and pushes changed sections to every /api/events client
+event_broker = EventBroker()
+change_poller = ChangePoller(lambda: davinci_api if davinci_api.connected else None, event_broker)
+
+# Serialized project/timeline/mediapool/renderjobs responses; a section the poller sees change is dropped
+response_cache = ResponseCache()
+change_poller.on_change = lambda section: response_cache.invalidate(section)
+
+def cached_response(section, build):
+    """Serve a read-only Resolve section through the response cache.
+    
+    Args:
+        section (str): Cache route name, one of RESPONSE_CACHE_TTLS
+        build (callable): Returns the section dict when the cache cannot answer
+    
+    Returns:
+        Response: The (possibly cached) JSON body with a strong ETag, or 304 Not Modified
+    """
+    # A reconnect may find a different Resolve state, so entries do not outlive their connection
+    scope = (id(davinci_api), davinci_api.connection["connected_at"])
+    entry, generation = response_cache.lookup(section, scope)
+    if entry is None:
+        payload = build()
+        if "error" in payload:
+            # Errors are transient and never cached
+            return jsonify(payload)
+        entry = response_cache.store(section, app.json.dumps(payload), generation, scope)
+    return response_cache.respond(entry, request)
+
+def not_connected_error():
+    """Error payload for requests that need Resolve while it is not connected."""
+    return {"error": "Not connected to DaVinci Resolve", "connection": davinci_api.get_connection_state()}
+
+def health_payload():
+    """Body of /api/health, also served natively by asgi_app.py."""
+    return {"status": "healthy", "message": "Flask backend is running!"}
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({"status": "healthy", "message": "Flask backend is running!"})
+    return jsonify(health_payload())
 
 @app.route('/api/davinci/status', methods=['GET'])
 def get_davinci_status():
     """Check if DaVinci Resolve is running and can be connected to."""
-    if not davinci_api:
-        return jsonify({"status": False, "error": "DaVinci Resolve API not initialized"})
+    if not davinci_api.connected:
+        return jsonify({"status": False, **not_connected_error()})
     
-    status = davinci_api.is_resolve_running()
-    return jsonify(status)
+    status = remember_result("status", davinci_api.is_resolve_running())
+    return jsonify(dict(status, connection=davinci_api.get_connection_state()))
 
 @app.route('/api/davinci/project', methods=['GET'])
 def get_davinci_project():
     """Get basic information about the current DaVinci Resolve project."""
-    if not davinci_api:
-        return jsonify({"error": "DaVinci Resolve API not initialized"})
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
     
-    project_info = davinci_api.get_basic_project_info()
-    return jsonify(project_info)
+    return cached_response("project", lambda: remember_result("project", davinci_api.get_basic_project_info()))
 
 @app.route('/api/test', methods=['GET'])
 def test_endpoint():
@@ -47,99 +105,668 @@ def test_endpoint():
         "timestamp": str(datetime.datetime.now())
     })
 
-@app.route('/api/diagnostics', methods=['GET'])
-def get_diagnostics():
-    """Get diagnostic information about the environment and DaVinci Resolve connection."""
+# Diagnostics detail levels, each including the previous ones: connection and Resolve state,
+# per-subsystem stats, and sys.path plus the Resolve environment variables
+DIAGNOSTICS_DETAIL_LEVELS = ("summary", "stats", "full")
+
+# Seconds a status or project result fetched by another request or the change poller is reused by diagnostics
+DIAGNOSTICS_FRESHNESS = 10.0
+
+# Diagnostics that cannot change while the backend runs, built once at startup
+STATIC_DIAGNOSTICS = {
+    "platform": sys.platform,
+    "python_version": sys.version,
+    "python_executable": sys.executable,
+    "started_at": time.time()
+}
+
+# Most recent status and project results: section -> (time.monotonic() when fetched, result)
+recent_results = {}
+
+def remember_result(section, result):
+    """Record a freshly fetched status or project result for diagnostics to reuse, returns it."""
+    if section in ("status", "project"):
+        recent_results[section] = (time.monotonic(), result)
+    return result
+
+def recent_result(section, fetch):
+    """The remembered result of a section if it is fresh enough, otherwise fetch() it now."""
+    entry = recent_results.get(section)
+    if entry and time.monotonic() - entry[0] < DIAGNOSTICS_FRESHNESS:
+        return entry[1]
+    return remember_result(section, fetch())
+
+change_poller.on_sample = remember_result
+
+def build_diagnostics(resolve_status=None, project_info=None, detail="summary"):
+    """Build the diagnostics payload.
+    
+    Args:
+        resolve_status (dict, optional): An already fetched is_resolve_running() result to reuse
+        project_info (dict, optional): An already fetched get_basic_project_info() result to reuse
+        detail (str): One of DIAGNOSTICS_DETAIL_LEVELS
+    
+    Returns:
+        dict: System, backend and DaVinci Resolve connection details
+    
+    Raises:
+        ValueError: If detail is not a known level
+    """
+    if detail not in DIAGNOSTICS_DETAIL_LEVELS:
+        raise ValueError(f"Unknown diagnostics detail: {detail}; expected one of {', '.join(DIAGNOSTICS_DETAIL_LEVELS)}")
+    level = DIAGNOSTICS_DETAIL_LEVELS.index(detail)
+    
     diagnostics = {
-        "system": {
-            "platform": sys.platform,
-            "python_version": sys.version,
-            "python_path": sys.path,
+        "detail": detail,
+        "system": dict(STATIC_DIAGNOSTICS),
+        "backend": {
+            "status": "running",
+            "api_initialized": davinci_api.connected,
+            "connection": davinci_api.get_connection_state()
+        }
+    }
+    
+    if level >= DIAGNOSTICS_DETAIL_LEVELS.index("stats"):
+        diagnostics["backend"].update({
+            "connection_supervisor": connection_supervisor.get_state(),
+            "change_poller": change_poller.get_stats(),
+            "render_monitor": davinci_api.render_monitor.get_stats(),
+            "handle_cache": davinci_api.get_handle_cache_stats(),
+            "scan_jobs": davinci_api.scan_jobs.get_stats(),
+            "thumbnails": davinci_api.thumbnails.get_stats(),
+            "export_jobs": davinci_api.export_jobs.get_stats(),
+            "metadata_store": davinci_api.metadata_store.get_stats() if davinci_api.metadata_store else None,
+            "response_cache": response_cache.get_stats(),
+            "access_log": access_log.get_stats(),
+            "bridge_worker": davinci_api.bridge.get_stats() if davinci_api.bridge else None,
+            "bridge_calls": davinci_api.get_bridge_metrics()
+        })
+    
+    if level >= DIAGNOSTICS_DETAIL_LEVELS.index("full"):
+        # Setting up the Resolve environment on connect changes these, so they are read every time
+        diagnostics["system"].update({
+            "python_path": list(sys.path),
             "environment_variables": {
                 "RESOLVE_SCRIPT_API": os.environ.get("RESOLVE_SCRIPT_API", "Not set"),
                 "RESOLVE_SCRIPT_LIB": os.environ.get("RESOLVE_SCRIPT_LIB", "Not set"),
                 "PYTHONPATH": os.environ.get("PYTHONPATH", "Not set")
             }
-        },
-        "backend": {
-            "status": "running",
-            "api_initialized": davinci_api is not None
-        }
-    }
+        })
     
-    # Add DaVinci Resolve connection info if initialized
-    if davinci_api:
-        resolve_status = davinci_api.is_resolve_running()
+    # Add DaVinci Resolve connection info if connected
+    if davinci_api.connected:
+        if resolve_status is None:
+            resolve_status = recent_result("status", davinci_api.is_resolve_running)
         diagnostics["davinci_resolve"] = resolve_status
         
         if resolve_status.get("status", False):
-            try:
-                project_info = davinci_api.get_basic_project_info()
-                diagnostics["project_info"] = project_info
-            except Exception as e:
-                diagnostics["project_info"] = {"error": str(e)}
+            if project_info is None:
+                try:
+                    project_info = recent_result("project", davinci_api.get_basic_project_info)
+                except Exception as e:
+                    project_info = {"error": str(e)}
+            diagnostics["project_info"] = project_info
+    else:
+        diagnostics["davinci_resolve"] = {"status": False, **not_connected_error()}
+    
+    return diagnostics
+
+@app.route('/api/diagnostics', methods=['GET'])
+def get_diagnostics():
+    """Get diagnostic information about the environment and DaVinci Resolve connection.
+    
+    Status and project details younger than DIAGNOSTICS_FRESHNESS seconds are reused
+    instead of asking Resolve again.
+    
+    Query parameters:
+        detail: summary (default), stats for per-subsystem stats, or full to add sys.path
+            and the Resolve environment variables
+    """
+    try:
+        return jsonify(build_diagnostics(detail=request.args.get('detail', 'summary')))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Bridge call counts and latency histograms per method and route, in Prometheus text format."""
+    if not davinci_api.bridge_metrics:
+        return Response("", mimetype='text/plain; version=0.0.4')
+    return Response(davinci_api.bridge_metrics.prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/logging', methods=['GET', 'POST'])
+def logging_settings():
+    """Get or change logging at runtime.
+    
+    POST body (JSON, every key optional):
+        verbose: true to log every Resolve call at DEBUG, false to switch that off again
+        sampling: {route: N} to log only every Nth request of a route (1 logs every request)
+    """
+    if request.method == 'POST':
+        settings = request.get_json(silent=True) or {}
+        sampling = settings.get("sampling") or {}
+        if "verbose" in settings and not isinstance(settings["verbose"], bool):
+            return jsonify({"error": "verbose must be true or false"}), 400
+        for route, rate in sampling.items():
+            if not isinstance(rate, int) or rate < 1:
+                return jsonify({"error": f"Sampling rate of {route} must be a positive integer"}), 400
+        
+        if "verbose" in settings:
+            set_verbose_logging(settings["verbose"])
+        access_log.sampling.update(sampling)
+    
+    return jsonify({"verbose": is_verbose_logging(), "access_log": access_log.get_stats()})
+
+@app.route('/api/davinci/snapshot', methods=['GET'])
+def get_davinci_snapshot():
+    """Get status, project, timeline, media pool, render jobs and diagnostics in one request.
+    
+    Query parameters:
+        sections: Comma separated subset of status,project,timeline,mediapool,renderjobs,diagnostics
+        detail: Detail level of the diagnostics section, see /api/diagnostics
+    """
+    detail = request.args.get('detail', 'summary')
+    if detail not in DIAGNOSTICS_DETAIL_LEVELS:
+        return jsonify({"error": f"Unknown diagnostics detail: {detail}; expected one of {', '.join(DIAGNOSTICS_DETAIL_LEVELS)}"}), 400
+    
+    requested = request.args.get('sections')
+    if requested:
+        sections = [section.strip() for section in requested.split(',') if section.strip()]
     else:
-        diagnostics["davinci_resolve"] = {"status": False, "error": "DaVinci Resolve API not initialized"}
+        sections = list(SNAPSHOT_SECTIONS) + ["diagnostics"]
+    
+    unknown = [section for section in sections if section not in SNAPSHOT_SECTIONS and section != "diagnostics"]
+    if unknown:
+        return jsonify({"error": f"Unknown snapshot sections: {', '.join(unknown)}"}), 400
+    
+    if not davinci_api.connected:
+        snapshot = {"status": {"status": False, **not_connected_error()}, "timings": {}}
+        if "diagnostics" in sections:
+            snapshot["diagnostics"] = build_diagnostics(detail=detail)
+        return jsonify(snapshot)
+    
+    try:
+        resolve_sections = [section for section in sections if section != "diagnostics"]
+        snapshot = davinci_api.get_snapshot(resolve_sections)
+        for section in ("status", "project"):
+            if section in snapshot:
+                remember_result(section, snapshot[section])
+        
+        if "diagnostics" in sections:
+            started = time.perf_counter()
+            # Reuses the status and project sections, or recent results if they were not requested
+            snapshot["diagnostics"] = build_diagnostics(snapshot.get("status"), snapshot.get("project"), detail)
+            snapshot["timings"]["diagnostics"] = round((time.perf_counter() - started) * 1000, 2)
+        
+        return jsonify(snapshot)
+    except Exception as e:
+        app.logger.error(f"Error getting snapshot: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+def render_snapshot():
+    """Every job of the render monitor's last poll, for clients that join between changes."""
+    result = davinci_api.render_monitor.get_last_result()
+    return {"rendering": result["rendering"], "jobs": result["jobs"]} if result else None
+
+# Render events only carry the jobs that changed, so new subscribers start from the full list
+event_broker.set_snapshot("render", render_snapshot)
+
+def subscribe_events(channels=None, subscription_class=Subscription):
+    """Subscribe a client to the event stream and start whatever feeds its channels.
+    
+    Args:
+        channels (str, optional): Comma separated event names, defaults to every event
+        subscription_class (type): Subscription, or AsyncSubscription when served from an event loop
     
-    return jsonify(diagnostics)
+    Returns:
+        Subscription: The client's subscription, to be unsubscribed when it disconnects
+    """
+    if channels:
+        channels = [channel.strip() for channel in channels.split(',') if channel.strip()]
+    
+    subscription = event_broker.subscribe(channels, subscription_class)
+    change_poller.ensure_started()
+    if subscription.wants("render"):
+        davinci_api.start_render_monitor(
+            on_update=lambda jobs, rendering: event_broker.publish("render", {"rendering": rendering, "jobs": jobs}, remember=False),
+            should_poll=lambda: bool(event_broker.wanted(["render"]))
+        )
+    return subscription
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Stream changed Resolve state as server-sent events.
+    
+    Each snapshot section (status, project, timeline, mediapool, renderjobs) is its own
+    event, sent once on connect and then only when its content changes. A heartbeat
+    event is sent periodically so clients can tell the backend is still alive.
+    
+    The "render" channel carries per-job progress, ETA and frames/sec from the render
+    monitor, which polls fast while Resolve renders and backs off while it is idle.
+    
+    Query parameters:
+        channels: Optional comma separated list of event names to receive
+    """
+    subscription = subscribe_events(request.args.get('channels'))
+    
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            while not subscription.closed:
+                message = subscription.get(timeout=HEARTBEAT_INTERVAL)
+                if message is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                event, data = message
+                yield format_sse(event, data)
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.route('/api/davinci/timeline', methods=['GET'])
 def get_timeline_info():
     """Get information about the current timeline"""
     try:
-        if davinci_api is None:
-            initialize_davinci_api()
-            
-        if davinci_api:
-            timeline_info = davinci_api.get_timeline_info()
-            return jsonify(timeline_info)
-        else:
-            return jsonify({"error": "DaVinci Resolve API not initialized"}), 500
+        if not davinci_api.connected:
+            return jsonify(not_connected_error()), 503
+        
+        return cached_response("timeline", davinci_api.get_timeline_info)
     except Exception as e:
         app.logger.error(f"Error getting timeline info: {str(e)}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+def timeline_items_error(result):
+    """Error response of the timeline items route in either format: 410 for an expired cursor, 404 otherwise."""
+    return jsonify(result), 410 if result.get("expired") else 404
+
+@app.route('/api/davinci/timeline/items', methods=['GET'])
+def get_timeline_items():
+    """Get the items on the current timeline from the in-memory timeline index.
+    
+    Query parameters:
+        track_type, track: Limit to one track type / 1-based track number
+        frame: Only items under this frame
+        start, end: Only items overlapping this inclusive frame range
+        cursor, limit: Cursor pagination (pass next_cursor from the previous page)
+        format: "json" (default, paginated) or "ndjson" (every match streamed, one item per line)
+        refresh: 1 to rebuild the index from Resolve first
+    """
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    query = {
+        "track_type": request.args.get('track_type'),
+        "track": request.args.get('track', type=int),
+        "frame": request.args.get('frame', type=int),
+        "start": request.args.get('start', type=int),
+        "end": request.args.get('end', type=int)
+    }
+    refresh = request.args.get('refresh') in ('1', 'true')
+    
+    try:
+        if request.args.get('format') == 'ndjson':
+            davinci_api.check_timeline_item_query(**query)
+            index = davinci_api.get_timeline_index(refresh=refresh)
+            if isinstance(index, dict):
+                return timeline_items_error(index)
+            items = index.select(**query)
+            
+            def generate():
+                # Batch lines so a large timeline is not written one tiny chunk at a time
+                for batch_start in range(0, len(items), 500):
+                    yield "".join(json.dumps(item) + "\n" for item in items[batch_start:batch_start + 500])
+            
+            return Response(
+                generate(),
+                mimetype='application/x-ndjson',
+                headers={"X-Timeline-Revision": index.revision, "X-Item-Count": str(len(items))}
+            )
+        
+        result = davinci_api.get_timeline_items(
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', TIMELINE_ITEMS_PAGE_SIZE, type=int),
+            refresh=refresh,
+            **query
+        )
+        if "error" in result:
+            return timeline_items_error(result)
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error getting timeline items: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/davinci/markers', methods=['GET'])
+def get_markers():
+    """Get the markers of the current timeline, its items and their clips from the marker index.
+    
+    Query parameters:
+        start, end: Inclusive range of timeline frames
+        color: Only markers of this color
+        name: Only markers whose name contains this text
+        source: Only "timeline", "item" or "clip" markers
+        refresh: 1 to rebuild the marker index from Resolve first
+    """
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    try:
+        result = davinci_api.get_markers(
+            start=request.args.get('start', type=int),
+            end=request.args.get('end', type=int),
+            color=request.args.get('color') or None,
+            name=request.args.get('name') or None,
+            source=request.args.get('source') or None,
+            refresh=request.args.get('refresh') in ('1', 'true')
+        )
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error getting markers: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+# Seconds a client may reuse a thumbnail before revalidating it with its ETag
+THUMBNAIL_MAX_AGE = 60
+
+@app.route('/api/davinci/thumbnail/<item_id>', methods=['GET'])
+def get_thumbnail(item_id):
+    """Get the thumbnail of a timeline video item (or of the first item using a media pool clip).
+    
+    Ready thumbnails are served with a content hash ETag. Otherwise a placeholder image is
+    returned straight away (202 while the thumbnail is being generated) and the
+    X-Thumbnail-State header tells why; ?format=json returns the state as JSON instead.
+    """
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    try:
+        result = davinci_api.get_thumbnail(item_id)
+    except Exception as e:
+        app.logger.error(f"Error getting thumbnail: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+    
+    if "state" not in result:
+        return jsonify(result), 404 if result.get("unknown") else 500
+    state = result["state"]
+    if request.args.get('format') == 'json':
+        return jsonify({key: value for key, value in result.items() if key != "path"})
+    
+    if state == "ready":
+        response = send_file(result["path"], mimetype=result["mimetype"], etag=result["etag"],
+                             max_age=THUMBNAIL_MAX_AGE, conditional=True)
+    else:
+        response = Response(PLACEHOLDER_SVG, status=202 if state in ("queued", "busy") else 200,
+                            mimetype='image/svg+xml')
+        response.headers['Cache-Control'] = 'no-store'
+        if state in ("queued", "busy"):
+            response.headers['Retry-After'] = '1'
+    response.headers['X-Thumbnail-State'] = state
+    return response
+
+@app.route('/api/davinci/scans', methods=['GET', 'POST'])
+def timeline_scans():
+    """Start a background timeline summary scan (POST) or list recent scan jobs (GET).
+    
+    POST body:
+        all_projects: true to scan every project in the current ProjectManager folder
+        wait: true to block until the scan has finished
+    """
+    if request.method == 'GET':
+        return jsonify({"jobs": davinci_api.scan_jobs.list_jobs()})
+    
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    body = request.get_json(silent=True) or {}
+    try:
+        job = davinci_api.start_timeline_scan(all_projects=bool(body.get('all_projects')),
+                                              wait=bool(body.get('wait')))
+        return jsonify(job), 200 if job["state"] in ("done", "failed") else 202
+    except Exception as e:
+        app.logger.error(f"Error starting timeline scan: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/davinci/scans/<job_id>', methods=['GET'])
+def get_timeline_scan(job_id):
+    """Get the state and progress of a timeline scan job."""
+    job = davinci_api.get_scan_job(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown scan job: {job_id}"}), 404
+    return jsonify(job)
+
+@app.route('/api/davinci/batch', methods=['POST'])
+def apply_batch():
+    """Apply many write operations in one pass through the bridge.
+    
+    Body:
+        operations: List of {"op": "SetClipProperty" | "SetMetadata" | "AddMarker" | "SetClipColor",
+            "clip" | "item" | "timeline": target ID, ...arguments}
+        dry_run: true to validate and read the current values without writing
+    
+    Every operation gets its own result; a failing operation does not stop the others.
+    """
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    body = request.get_json(silent=True) or {}
+    try:
+        result = davinci_api.apply_batch(body.get('operations'), dry_run=bool(body.get('dry_run')))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error applying batch: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+    
+    if not result.get("dry_run") and result.get("succeeded"):
+        # Cached sections may show what was just changed
+        response_cache.invalidate()
+    return jsonify(result)
+
+@app.route('/api/davinci/exports', methods=['GET', 'POST'])
+def timeline_exports():
+    """Start a background export job (POST) or list recent export jobs and the formats on offer (GET).
+    
+    POST body:
+        timelines: Timeline unique IDs or names, defaults to the current timeline
+        formats: Export formats, e.g. ["edl", "fcpxml", "otio"]; defaults to ["edl"]
+        force: true to export again even if an unchanged export exists
+        wait: true to block until the job has finished
+    """
+    if request.method == 'GET':
+        return jsonify({"formats": list(EXPORT_FORMATS), "jobs": davinci_api.export_jobs.list_jobs()})
+    
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    body = request.get_json(silent=True) or {}
+    try:
+        job = davinci_api.start_export(
+            timelines=body.get('timelines') or None,
+            formats=body.get('formats') or ["edl"],
+            force=bool(body.get('force')),
+            wait=bool(body.get('wait'))
+        )
+        return jsonify(job), 200 if job["state"] in ("done", "failed") else 202
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error starting export: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/davinci/exports/<job_id>', methods=['GET'])
+def get_timeline_export(job_id):
+    """Get the state and per-export progress of an export job."""
+    job = davinci_api.get_export_job(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown export job: {job_id}"}), 404
+    return jsonify(job)
+
+@app.route('/api/davinci/exports/<job_id>/download', methods=['GET'])
+def download_timeline_export(job_id):
+    """Stream the exported files of a job as a zip, each file as soon as it has been exported."""
+    job = davinci_api.export_jobs.get_job(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown export job: {job_id}"}), 404
+    
+    response = Response(stream_with_context(davinci_api.export_jobs.stream_zip(job)), mimetype='application/zip')
+    response.headers['Content-Disposition'] = f'attachment; filename="exports-{job.id}.zip"'
+    return response
+
+@app.route('/api/davinci/timelines/summary', methods=['GET'])
+def get_timeline_summary():
+    """Get the stored timeline summary written by the last scan, without calling into Resolve.
+    
+    Query parameters:
+        project_id: Project to read, defaults to the current project
+        all: 1 to list the totals of every scanned project instead
+    """
+    try:
+        if request.args.get('all') in ('1', 'true'):
+            return jsonify({"projects": davinci_api.scan_jobs.list_summaries()})
+        
+        project_id = request.args.get('project_id')
+        if project_id is None and not davinci_api.connected:
+            return jsonify(not_connected_error()), 503
+        
+        result = davinci_api.get_timeline_summary(project_id)
+        if result.get("scanned") is False:
+            return jsonify(result), 404
+        return jsonify(result)
+    except Exception as e:
+        app.logger.error(f"Error getting timeline summary: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 @app.route('/api/davinci/mediapool', methods=['GET'])
 def get_media_pool_info():
     """Get information about the current media pool"""
     try:
-        if davinci_api is None:
-            initialize_davinci_api()
-            
-        if davinci_api:
-            media_pool_info = davinci_api.get_media_pool_info()
-            return jsonify(media_pool_info)
-        else:
-            return jsonify({"error": "DaVinci Resolve API not initialized"}), 500
+        if not davinci_api.connected:
+            return jsonify(not_connected_error()), 503
+        
+        return cached_response("mediapool", davinci_api.get_media_pool_info)
     except Exception as e:
         app.logger.error(f"Error getting media pool info: {str(e)}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+def _media_pool_response(result):
+    """Status code for a media pool inventory result: 202 while the first crawl is running."""
+    if result.get("pending"):
+        return jsonify(result), 202
+    return jsonify(result)
+
+@app.route('/api/davinci/mediapool/tree', methods=['GET'])
+def get_media_pool_tree():
+    """Get the media pool folder tree from the crawled inventory.
+    
+    Query parameters:
+        folder: Folder ID to start from, defaults to the root folder
+        refresh: 1 to re-crawl changed folders, "full" to re-read every clip
+        wait: 1 to block until the crawl has finished
+    """
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    try:
+        refresh = request.args.get('refresh')
+        result = davinci_api.get_media_pool_tree(
+            folder_id=request.args.get('folder'),
+            refresh=refresh in ('1', 'true'),
+            full=refresh == 'full',
+            wait=request.args.get('wait') in ('1', 'true')
+        )
+        return _media_pool_response(result)
+    except Exception as e:
+        app.logger.error(f"Error getting media pool tree: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/davinci/mediapool/clips', methods=['GET'])
+def get_media_pool_clips():
+    """Get media pool clips with their properties from the crawled inventory.
+    
+    Query parameters:
+        folder: Only clips in this folder ID
+        recursive: 1 to include the folder's subfolders
+        offset, limit: Pagination
+        refresh, wait: As for /api/davinci/mediapool/tree
+    """
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    try:
+        refresh = request.args.get('refresh')
+        result = davinci_api.get_media_pool_clips(
+            folder_id=request.args.get('folder'),
+            recursive=request.args.get('recursive') in ('1', 'true'),
+            offset=request.args.get('offset', 0, type=int),
+            limit=request.args.get('limit', MEDIA_POOL_CLIPS_PAGE_SIZE, type=int),
+            refresh=refresh in ('1', 'true'),
+            full=refresh == 'full',
+            wait=request.args.get('wait') in ('1', 'true')
+        )
+        return _media_pool_response(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error getting media pool clips: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route('/api/davinci/clips/properties', methods=['GET', 'POST'])
+def get_clip_properties():
+    """Fetch properties of many media pool clips as a columnar payload.
+    
+    GET takes comma separated ?ids=&keys=; POST takes {"ids": [...], "keys": [...]} for long ID lists.
+    Omitting keys returns every property.
+    """
+    if not davinci_api.connected:
+        return jsonify(not_connected_error()), 503
+    
+    if request.method == 'POST':
+        body = request.get_json(silent=True) or {}
+        clip_ids = body.get('ids') or []
+        keys = body.get('keys') or None
+    else:
+        clip_ids = [clip_id for clip_id in request.args.get('ids', '').split(',') if clip_id]
+        keys = [key for key in request.args.get('keys', '').split(',') if key] or None
+    
+    try:
+        return jsonify(davinci_api.get_clip_properties(clip_ids, keys))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error getting clip properties: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 @app.route('/api/davinci/renderjobs', methods=['GET'])
 def get_render_jobs():
     """Get information about render jobs"""
     try:
-        if davinci_api is None:
-            initialize_davinci_api()
-            
-        if davinci_api:
-            render_jobs = davinci_api.get_render_jobs()
-            return jsonify(render_jobs)
-        else:
-            return jsonify({"error": "DaVinci Resolve API not initialized"}), 500
+        if not davinci_api.connected:
+            return jsonify(not_connected_error()), 503
+        
+        return cached_response("renderjobs", davinci_api.get_render_jobs)
     except Exception as e:
         app.logger.error(f"Error getting render jobs: {str(e)}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 @app.before_request
-def log_request_info():
-    print(f"Request: {request.method} {request.path} from {request.remote_addr}")
+def start_connection_supervisor():
+    # Normally already started by run_server.py; covers other ways of serving the app
+    connection_supervisor.ensure_started()
 
-@app.after_request
-def log_response_info(response):
-    print(f"Response: {response.status}")
-    return response
+@app.before_request
+def tag_bridge_calls():
+    # Bridge calls made while handling this request are attributed to its URL rule and counted for the access log
+    begin_request(request.url_rule.rule if request.url_rule else request.path)
 
 if __name__ == '__main__':
     print("Starting Flask server on 0.0.0.0:5001")
+    connection_supervisor.ensure_started()
     app.run(port=5001, host='0.0.0.0', debug=False) 
\ No newline at end of file
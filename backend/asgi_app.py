@@ -0,0 +1,78 @@
+"""ASGI entry point serving the same routes as app.py, e.g. under uvicorn (see run_asgi.py).
+
+/api/health and /api/events are served natively on the event loop, so an open event
+stream costs a coroutine instead of a server thread and health checks never queue behind
+slow requests. They go to the Flask app's access log through AccessLogMiddleware. Every
+other route is the Flask app itself, run on a bounded pool of threads, which keeps
+blocking DaVinciResolveAPI calls off the event loop.
+"""
+import contextlib
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+import app as flask_app
+from access_log import AccessLogMiddleware
+from events import HEARTBEAT_INTERVAL, AsyncSubscription, format_sse
+
+# Threads running Flask routes; requests beyond this wait for a free thread instead of starting new ones
+ASGI_WORKER_THREADS = 16
+
+# Responses of the native routes carry the same CORS header Flask-CORS adds to the others
+CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+
+async def health_check(request):
+    return JSONResponse(flask_app.health_payload(), headers=CORS_HEADERS)
+
+async def stream_events(request):
+    """Stream changed Resolve state as server-sent events, like app.stream_events().
+
+    Query parameters:
+        channels: Optional comma separated list of event names to receive
+    """
+    subscription = flask_app.subscribe_events(request.query_params.get('channels'), AsyncSubscription)
+
+    async def generate():
+        try:
+            yield "retry: 3000\n\n"
+            while not subscription.closed:
+                message = await subscription.get_async(timeout=HEARTBEAT_INTERVAL)
+                if message is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                event, data = message
+                yield format_sse(event, data)
+        finally:
+            flask_app.event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        generate(),
+        media_type='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **CORS_HEADERS}
+    )
+
+@contextlib.asynccontextmanager
+async def lifespan(application):
+    # Connects to Resolve in the background, the port is bound without waiting for it
+    flask_app.connection_supervisor.ensure_started()
+    yield
+
+native_routes = [
+    Route('/api/health', health_check, methods=['GET']),
+    Route('/api/events', stream_events, methods=['GET']),
+]
+
+app = Starlette(
+    routes=native_routes + [
+        Mount('/', app=WSGIMiddleware(flask_app.app, workers=ASGI_WORKER_THREADS)),
+    ],
+    middleware=[
+        # Flask logs the mounted routes itself
+        Middleware(AccessLogMiddleware, access_log=flask_app.access_log, routes=[route.path for route in native_routes]),
+    ],
+    lifespan=lifespan
+)
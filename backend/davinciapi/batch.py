@@ -0,0 +1,148 @@
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger('DaVinciAPI.batch')
+
+# Maximum number of operations in one batch; larger batches are rejected, not truncated
+BATCH_MAX_OPERATIONS = 1000
+
+# Kinds of objects an operation can target, named by the key holding the target's ID
+BATCH_TARGETS = ("clip", "item", "timeline")
+
+# Write operations accepted in a batch and the target kinds each applies to
+BATCH_OPERATIONS = {
+    "SetClipProperty": ("clip",),
+    "SetMetadata": ("clip",),
+    "AddMarker": ("clip", "item", "timeline"),
+    "SetClipColor": ("clip", "item"),
+}
+
+def _require(operation, key, kind):
+    value = operation.get(key)
+    if value is None or not isinstance(value, kind):
+        raise ValueError(f"{operation.get('op')} needs {key}")
+    return value
+
+def parse_operation(operation):
+    """Validate one batch operation.
+
+    Args:
+        operation (dict): {"op": name, "<target kind>": target ID, ...arguments}, e.g.
+            {"op": "SetClipProperty", "clip": id, "key": "Comments", "value": "Selected"},
+            {"op": "SetMetadata", "clip": id, "key": ..., "value": ...} or {..., "metadata": {...}},
+            {"op": "AddMarker", "item": id, "frame": 12, "color": "Blue", "name": ..., "note": ...,
+            "duration": 1, "custom_data": ...} (a timeline target may be "current") and
+            {"op": "SetClipColor", "clip": id, "color": "Orange"}
+
+    Returns:
+        tuple: (op, target kind, target ID, arguments for the Resolve call)
+
+    Raises:
+        ValueError: If the operation is malformed
+    """
+    if not isinstance(operation, dict):
+        raise ValueError("Operation must be an object")
+    op = operation.get("op")
+    if op not in BATCH_OPERATIONS:
+        raise ValueError(f"Unknown operation: {op}; expected one of {', '.join(BATCH_OPERATIONS)}")
+    targets = [kind for kind in BATCH_TARGETS if operation.get(kind) is not None]
+    if len(targets) != 1:
+        raise ValueError(f"{op} needs exactly one target: {' or '.join(BATCH_OPERATIONS[op])}")
+    kind = targets[0]
+    if kind not in BATCH_OPERATIONS[op]:
+        raise ValueError(f"{op} cannot target a {kind}")
+    target_id = str(operation[kind])
+
+    if op == "SetClipProperty":
+        args = (_require(operation, "key", str), str(_require(operation, "value", (str, int, float))))
+    elif op == "SetMetadata":
+        if isinstance(operation.get("metadata"), dict):
+            args = ({str(key): str(value) for key, value in operation["metadata"].items()},)
+        else:
+            args = (_require(operation, "key", str), str(_require(operation, "value", (str, int, float))))
+    elif op == "AddMarker":
+        frame = _require(operation, "frame", (int, float))
+        duration = operation.get("duration", 1)
+        if not isinstance(duration, (int, float)) or duration < 1:
+            raise ValueError("AddMarker duration must be at least 1")
+        args = (frame, _require(operation, "color", str), str(operation.get("name", "")),
+                str(operation.get("note", "")), duration, str(operation.get("custom_data", "")))
+    else:
+        args = (_require(operation, "color", str),)
+    return op, kind, target_id, args
+
+def plan_batch(operations, max_operations=BATCH_MAX_OPERATIONS):
+    """Validate a batch and group its operations by target, keeping their order within each target.
+
+    Returns:
+        tuple: (groups, rejected). groups maps (kind, target ID) to [(index, op, args)];
+            rejected holds a failed result for every malformed operation
+
+    Raises:
+        ValueError: If operations is not a non-empty list or longer than max_operations
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+    if len(operations) > max_operations:
+        raise ValueError(f"At most {max_operations} operations can be sent in one batch, got {len(operations)}")
+
+    groups = OrderedDict()
+    rejected = []
+    for index, operation in enumerate(operations):
+        try:
+            op, kind, target_id, args = parse_operation(operation)
+        except ValueError as e:
+            rejected.append({"index": index, "op": operation.get("op") if isinstance(operation, dict) else None,
+                             "ok": False, "error": str(e)})
+            continue
+        groups.setdefault((kind, target_id), []).append((index, op, args))
+    return groups, rejected
+
+def _current_value(handle, op, args):
+    """What a write would replace, read for dry runs."""
+    if op == "SetClipProperty":
+        return handle.GetClipProperty(args[0])
+    if op == "SetMetadata":
+        if isinstance(args[0], dict):
+            return {key: handle.GetMetadata(key) for key in args[0]}
+        return handle.GetMetadata(args[0])
+    if op == "SetClipColor":
+        return handle.GetClipColor()
+    return None
+
+def run_group(kind, target_id, handle, operations, dry_run=False):
+    """Apply (or with dry_run only check) the operations of one target through its handle.
+
+    Returns:
+        list: One result per operation: index, op, target, ok and error, plus the current
+            value in a dry run
+    """
+    results = []
+    marker_frames = None
+    for index, op, args in operations:
+        result = {"index": index, "op": op, "target": {kind: target_id}}
+        try:
+            if op == "AddMarker" and marker_frames is None:
+                # Read once per target; a dry run reports markers the real run would collide with
+                marker_frames = {float(frame) for frame in (handle.GetMarkers() or {})} if dry_run else set()
+            if dry_run:
+                result["dry_run"] = True
+                if op == "AddMarker":
+                    collides = float(args[0]) in marker_frames
+                    marker_frames.add(float(args[0]))
+                    result["ok"] = not collides
+                    if collides:
+                        result["error"] = f"There already is a marker at frame {args[0]}"
+                else:
+                    result["current"] = _current_value(handle, op, args)
+                    result["ok"] = True
+            else:
+                result["ok"] = bool(getattr(handle, op)(*args))
+                if not result["ok"]:
+                    result["error"] = "Resolve rejected the operation"
+        except Exception as e:
+            logger.error(f"Error applying {op} to {kind} {target_id}: {str(e)}")
+            result["ok"] = False
+            result["error"] = str(e)
+        results.append(result)
+    return results
@@ -0,0 +1,180 @@
+import contextvars
+import functools
+import logging
+import queue
+import threading
+import time
+
+from .instrumentation import current_route, set_route
+
+logger = logging.getLogger('DaVinciAPI.bridge')
+
+# Seconds a caller waits for its bridge job before giving up (the job itself keeps running)
+BRIDGE_CALL_TIMEOUT = 120.0
+
+# Token of the outermost bridged call running in this context, shared by the calls it makes
+_batch = contextvars.ContextVar("resolve_batch", default=None)
+
+def current_batch():
+    """Token of the running bridged call, None outside of one.
+
+    Everything a bridged method does, including the bridged methods it calls, belongs to
+    one batch, so state checked once in a batch can be trusted for the rest of it.
+    """
+    return _batch.get()
+
+def _run_batch(method, *args, **kwargs):
+    if _batch.get() is not None:
+        return method(*args, **kwargs)
+    token = _batch.set(object())
+    try:
+        return method(*args, **kwargs)
+    finally:
+        _batch.reset(token)
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "key", "context", "done", "result", "error", "waiters", "queued_at")
+
+    def __init__(self, fn, args, kwargs, key):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        # Carries the caller's route tag (or thread name) into the worker so bridge metrics stay attributed
+        route = current_route()
+        self.context = contextvars.copy_context()
+        self.context.run(set_route, route)
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 1
+        self.queued_at = time.perf_counter()
+
+class BridgeWorker:
+    """Runs every call into Resolve on one dedicated thread.
+
+    The fusionscript bridge is not safe to use from several threads at once, so request
+    threads and background threads hand their Resolve work to this worker as jobs and
+    block until it is done. A job submitted with a key while an identical job is still
+    queued or running is not queued again; the caller waits for the running job and
+    gets the same result (or exception).
+    """
+
+    def __init__(self, name="resolve-bridge", timeout=BRIDGE_CALL_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {"jobs": 0, "coalesced": 0, "errors": 0, "timeouts": 0, "max_queue_depth": 0,
+                       "busy_ms": 0.0, "max_wait_ms": 0.0}
+
+    def on_worker_thread(self):
+        return threading.current_thread() is self._thread
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def run(self, fn, args=(), kwargs=None, key=None):
+        """Run fn(*args, **kwargs) on the bridge thread and return its result.
+
+        Args:
+            fn (callable): The work to do, free to make any number of Resolve calls
+            args (tuple): Positional arguments for fn
+            kwargs (dict, optional): Keyword arguments for fn
+            key (hashable, optional): Identifies a read; callers with the same key share one run
+
+        Raises:
+            TimeoutError: If the job did not finish within the worker's timeout
+        """
+        kwargs = kwargs or {}
+        if self.on_worker_thread():
+            # Nested call from a job already running on the bridge
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            self._ensure_started()
+            job = self._inflight.get(key) if key is not None else None
+            if job is not None:
+                job.waiters += 1
+                self._stats["coalesced"] += 1
+            else:
+                job = _Job(fn, args, kwargs, key)
+                if key is not None:
+                    self._inflight[key] = job
+                self._queue.put(job)
+                self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+
+        if not job.done.wait(self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise TimeoutError(f"Resolve bridge did not answer within {self.timeout} seconds")
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            started = time.perf_counter()
+            try:
+                job.result = job.context.run(job.fn, *job.args, **job.kwargs)
+            except BaseException as e:
+                job.error = e
+                self._stats["errors"] += 1
+            finished = time.perf_counter()
+            with self._lock:
+                if job.key is not None and self._inflight.get(job.key) is job:
+                    del self._inflight[job.key]
+                self._stats["jobs"] += 1
+                self._stats["busy_ms"] += (finished - started) * 1000
+                self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], (started - job.queued_at) * 1000)
+            job.done.set()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["busy_ms"] = round(stats["busy_ms"], 2)
+        stats["max_wait_ms"] = round(stats["max_wait_ms"], 2)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["running"] = bool(self._thread and self._thread.is_alive())
+        return stats
+
+def _freeze(value):
+    """Hashable form of call arguments for the coalescing key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+def bridged(method=None, coalesce=True):
+    """Run a DaVinciResolveAPI method on the instance's bridge worker.
+
+    Reads are coalesced by default: concurrent calls with equal arguments share one
+    run. Pass coalesce=False for methods that change Resolve state.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bridge = self.bridge
+            if bridge is None:
+                return _run_batch(method, self, *args, **kwargs)
+            key = None
+            if coalesce:
+                try:
+                    key = (method.__name__, _freeze(args), _freeze(kwargs))
+                except TypeError:
+                    key = None
+            return bridge.run(functools.partial(_run_batch, method), (self,) + args, kwargs, key=key)
+        return wrapper
+
+    if method is not None:
+        return decorate(method)
+    return decorate
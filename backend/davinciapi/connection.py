@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger('DaVinciAPI.connection')
+
+# Seconds before the first reconnect attempt, doubled after every failure up to the maximum
+RECONNECT_MIN_BACKOFF = 1.0
+RECONNECT_MAX_BACKOFF = 30.0
+
+# Seconds between GetVersionString() health checks while connected
+HEALTH_CHECK_INTERVAL = 5.0
+
+class ConnectionSupervisor:
+    """Connects a DaVinciResolveAPI in the background and keeps it connected.
+
+    While disconnected, connect() is retried with exponential backoff. While connected,
+    GetVersionString() is called every HEALTH_CHECK_INTERVAL seconds; a failure (Resolve
+    quit or restarted) drops the connection and every cache built on it, and the
+    reconnect loop starts over. Requests never wait for any of this, they see the
+    current state through api.connected and api.get_connection_state().
+    """
+
+    def __init__(self, api, min_backoff=RECONNECT_MIN_BACKOFF, max_backoff=RECONNECT_MAX_BACKOFF,
+                 health_interval=HEALTH_CHECK_INTERVAL):
+        self.api = api
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.health_interval = health_interval
+        self.backoff = min_backoff
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self.api.on_connection_lost = lambda error: self.wake()
+            self._thread = threading.Thread(target=self._run, name="resolve-connection", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Check the connection (or retry connecting) right away."""
+        self.backoff = self.min_backoff
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.api.connected:
+                self.api.check_connection()
+                delay = self.health_interval if self.api.connected else 0.0
+            else:
+                delay = self._attempt()
+
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _attempt(self):
+        """Try to connect once, returns the seconds to wait before the next check."""
+        first = self.api.connection["attempts"] == 0
+        try:
+            self.api.connect()
+        except Exception as e:
+            delay = self.backoff
+            self.backoff = min(self.max_backoff, self.backoff * 2)
+            self.api.connection["next_attempt_at"] = time.monotonic() + delay
+            if first:
+                logger.warning(f"DaVinci Resolve is not reachable, retrying in the background: {str(e)}")
+            else:
+                logger.debug(f"Reconnect attempt failed, next one in {delay} seconds: {str(e)}")
+            return delay
+
+        self.backoff = self.min_backoff
+        logger.info(f"Connected to DaVinci Resolve {self.api.connection['version']}")
+        return self.health_interval
+
+    def get_state(self):
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "backoff": self.backoff,
+            "health_interval": self.health_interval
+        }
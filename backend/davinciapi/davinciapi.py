@@ -2,12 +2,75 @@ import sys
 import os
 import platform
 import logging
+import tempfile
+import threading
+import time
 import traceback
+from collections import OrderedDict
+
+from .batch import BATCH_MAX_OPERATIONS, plan_batch, run_group
+from .bridge import BridgeWorker, bridged, current_batch
+from .export_jobs import ExportJobManager
+from .instrumentation import BridgeMetrics, instrument
+from .marker_index import MARKER_SOURCES, build_marker_index
+from .mediapool_crawler import MediaPoolCrawler, MediaPoolInventory
+from .render_monitor import RenderMonitor
+from .scan_jobs import ScanJobManager
+from .thumbnails import ThumbnailService, thumbnail_frame
+from .timecode import FrameRate
+from .timeline_index import TRACK_TYPES, TimelineIndex, build_timeline_index, get_timeline_fingerprint
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('DaVinciAPI')
 
+# The per-call chatter ("Getting current project...") is logged at DEBUG with lazy %-formatting,
+# so it costs a level check unless switched on with set_verbose_logging(True)
+def set_verbose_logging(verbose):
+    """Switch the per-call DEBUG logging of the DaVinciAPI loggers on or off at runtime."""
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+def is_verbose_logging():
+    return logger.isEnabledFor(logging.DEBUG)
+
+# Sections that get_snapshot() knows how to build, in the order they are built
+SNAPSHOT_SECTIONS = ("status", "project", "timeline", "mediapool", "renderjobs")
+
+# Handles resolved from another handle, dropped together with their parent
+HANDLE_CHILDREN = {
+    "project_manager": ("project",),
+    "project": ("timeline", "mediapool"),
+}
+
+# Seconds a timeline index is served before its fingerprint is compared with Resolve again
+TIMELINE_INDEX_CHECK_INTERVAL = 2.0
+
+# Timeline index revisions kept so cursors survive one rebuild
+TIMELINE_INDEX_REVISIONS = 2
+
+# Default and maximum page size of get_timeline_items()
+TIMELINE_ITEMS_PAGE_SIZE = 500
+TIMELINE_ITEMS_MAX_PAGE_SIZE = 5000
+
+# Seconds a marker index is served for an unchanged timeline revision; marker edits do not
+# change the timeline fingerprint, so they show up after at most this long (or on refresh)
+MARKER_INDEX_MAX_AGE = 30.0
+
+# Default and maximum page size of get_media_pool_clips()
+MEDIA_POOL_CLIPS_PAGE_SIZE = 500
+MEDIA_POOL_CLIPS_MAX_PAGE_SIZE = 5000
+
+# Up to this many keys are fetched with one GetClipProperty(key) call each; for more keys a
+# single whole-dict GetClipProperty() per clip is cheaper than the extra round trips
+CLIP_PROPERTY_PER_KEY_LIMIT = 3
+
+# Maximum number of clips per get_clip_properties() call
+CLIP_PROPERTIES_MAX_CLIPS = 5000
+
+def _elapsed_ms(started):
+    """Milliseconds since a time.perf_counter() reading, rounded for JSON output."""
+    return round((time.perf_counter() - started) * 1000, 2)
+
 # Setup environment variables for DaVinci Resolve
 def setup_resolve_env():
     """Configure environment variables based on the operating system."""
@@ -74,8 +137,9 @@ def setup_resolve_env():
         logger.error(f"Resolve scripting modules path does not exist: {modules_path}")
         raise FileNotFoundError(f"Resolve scripting modules path not found: {modules_path}")
         
-    logger.info(f"Adding to Python path: {modules_path}")
-    sys.path.append(modules_path)
+    if modules_path not in sys.path:
+        logger.info(f"Adding to Python path: {modules_path}")
+        sys.path.append(modules_path)
     
     # Log current environment for debugging
     logger.info(f"RESOLVE_SCRIPT_API set to: {os.environ.get('RESOLVE_SCRIPT_API')}")
@@ -112,9 +176,68 @@ def import_resolve_script():
         return None
 
 class DaVinciResolveAPI:
-    def __init__(self):
-        """Initialize connection to the actual DaVinci Resolve API."""
+    def __init__(self, cache_handles=True, resolve=None, instrumented=True, serialized=True, connect=True,
+                 metadata_store=None):
+        """Initialize connection to the actual DaVinci Resolve API.
+        
+        Args:
+            cache_handles (bool): Keep the ProjectManager for the connection's lifetime and check the
+                cached Project/Timeline with one GetUniqueId() per bridged call. False walks the
+                object graph on every lookup.
+            resolve (optional): An already connected Resolve object, e.g. from fake_resolve for tests
+                and benchmarks. Skips the environment setup and import of DaVinciResolveScript.
+            instrumented (bool): Record count and latency of every bridge call in self.bridge_metrics
+            serialized (bool): Run every Resolve call on a single bridge worker thread (self.bridge)
+            connect (bool): Connect right away, raising if Resolve cannot be reached. Pass False to
+                construct a disconnected API and call connect() later (see connection.ConnectionSupervisor).
+            metadata_store (MetadataStore, optional): Persists media pool inventories and timeline indexes,
+                which are then served from disk after a restart while Resolve is crawled again
+        """
         self.resolve = None
+        self.bridge_metrics = BridgeMetrics() if instrumented else None
+        self.cache_handles = cache_handles
+        self._handles = {}
+        self._handle_lock = threading.RLock()
+        self._handle_stats = {
+            kind: {"hits": 0, "misses": 0, "revalidations": 0, "invalidations": 0}
+            for kind in ("project_manager", "project", "timeline", "mediapool")
+        }
+        self._timeline_indexes = OrderedDict()
+        self._timeline_index_checked_at = 0.0
+        self._timeline_index_lock = threading.Lock()
+        self._marker_index = None
+        self.bridge = BridgeWorker() if serialized else None
+        self.metadata_store = metadata_store
+        self.media_pool_crawler = MediaPoolCrawler(bridge=self.bridge, on_crawled=self._store_inventory)
+        self.render_monitor = RenderMonitor(bridge=self.bridge)
+        self.scan_jobs = ScanJobManager(bridge=self.bridge, store=metadata_store)
+        self.export_jobs = ExportJobManager(bridge=self.bridge)
+        self.thumbnails = ThumbnailService(bridge=self.bridge, store=metadata_store)
+        self.connection = {"state": "disconnected", "version": None, "connected_at": None,
+                           "attempts": 0, "last_error": None, "next_attempt_at": None}
+        # Called with the reason whenever an established connection is found to be dead
+        self.on_connection_lost = None
+        if resolve is not None:
+            self._set_connected(self._instrument(resolve))
+        elif connect:
+            self.connect()
+
+    @property
+    def connected(self):
+        return self.resolve is not None
+
+    @bridged
+    def connect(self):
+        """Set up the environment, import DaVinciResolveScript and connect to the running Resolve.
+        
+        Every cache is reset on success, since handles of an earlier connection are dead.
+        
+        Raises:
+            ImportError: If DaVinciResolveScript cannot be found
+            ConnectionError: If Resolve is not running or refuses the connection
+        """
+        self.connection["attempts"] += 1
+        self.connection["state"] = "connecting"
         try:
             logger.info("Setting up DaVinci Resolve environment...")
             setup_resolve_env()
@@ -126,33 +249,380 @@ class DaVinciResolveAPI:
                 raise ImportError("Could not find DaVinciResolveScript module. Make sure DaVinci Resolve is installed and running, and scripting is enabled in preferences.")
             
             logger.info("Connecting to DaVinci Resolve application...")
-            self.resolve = dvr_script.scriptapp("Resolve")
-            if not self.resolve:
+            resolve = self._instrument(dvr_script.scriptapp("Resolve"))
+            if not resolve:
                 logger.error("Unable to connect to DaVinci Resolve application")
                 raise ConnectionError("Unable to connect to DaVinci Resolve. Make sure it's running and that scripting is enabled in preferences.")
             
+            self._set_connected(resolve)
             logger.info("Successfully connected to DaVinci Resolve")
         except ImportError as e:
             logger.error(f"ImportError: {str(e)}")
+            self._set_disconnected(str(e))
             raise ImportError(str(e))
         except Exception as e:
             logger.error(f"Error connecting to DaVinci Resolve: {str(e)}")
-            logger.error(traceback.format_exc())
+            if self.connection["attempts"] == 1:
+                # Reconnect attempts fail the same way, one traceback is enough
+                logger.error(traceback.format_exc())
+            self._set_disconnected(str(e))
             raise ConnectionError(f"Error connecting to DaVinci Resolve: {str(e)}")
 
+    def _set_connected(self, resolve):
+        self.reset_caches()
+        self.resolve = resolve
+        self.connection.update(state="connected", connected_at=time.time(), last_error=None, next_attempt_at=None)
+        try:
+            self.connection["version"] = resolve.GetVersionString()
+        except Exception:
+            self.connection["version"] = None
+
+    def _set_disconnected(self, error):
+        was_connected = self.resolve is not None
+        self.resolve = None
+        self.reset_caches()
+        self.connection.update(state="disconnected", version=None, connected_at=None, last_error=error)
+        if was_connected and self.on_connection_lost:
+            self.on_connection_lost(error)
+
+    @bridged(coalesce=False)
+    def disconnect(self, error=None):
+        """Drop the Resolve object and every cache built from it, e.g. after Resolve quit."""
+        if self.resolve is not None:
+            logger.warning(f"Lost connection to DaVinci Resolve: {error}")
+        self._set_disconnected(error)
+
+    @bridged
+    def check_connection(self):
+        """Health check: ask Resolve for its version, disconnecting if it does not answer.
+        
+        Returns:
+            bool: True if Resolve answered
+        """
+        if self.resolve is None:
+            return False
+        try:
+            version = self.resolve.GetVersionString()
+        except Exception as e:
+            self.disconnect(str(e))
+            return False
+        if not version:
+            self.disconnect("Resolve did not report a version")
+            return False
+        self.connection["version"] = version
+        return True
+
+    def get_connection_state(self):
+        """Get the state of the connection to Resolve.
+        
+        Returns:
+            dict: state ("connected", "connecting" or "disconnected"), version, connected_at,
+                attempts, last_error and retry_in (seconds until the next reconnect attempt)
+        """
+        state = dict(self.connection)
+        next_attempt_at = state.pop("next_attempt_at")
+        state["retry_in"] = round(max(0.0, next_attempt_at - time.monotonic()), 1) if next_attempt_at else None
+        return state
+
+    def reset_caches(self):
+        """Forget every handle, index and inventory taken from the current Resolve connection."""
+        self.invalidate_handles()
+        with self._timeline_index_lock:
+            self._timeline_indexes.clear()
+            self._timeline_index_checked_at = 0.0
+        self._marker_index = None
+        self.media_pool_crawler.reset()
+        self.render_monitor.reset()
+        self.thumbnails.reset()
+
+    def _store_record(self, project_id, kind, object_id, record):
+        """Hand a record to the metadata store's writer, if there is a store."""
+        if self.metadata_store is not None and project_id and object_id:
+            self.metadata_store.put(project_id, kind, object_id, record)
+
+    def _load_record(self, project_id, kind, object_id=None):
+        """Read a record from the metadata store, None without a store or record."""
+        if self.metadata_store is None or not project_id:
+            return None
+        return self.metadata_store.get(project_id, kind, object_id)
+
+    def _store_inventory(self, inventory):
+        self._store_record(inventory.project_id, "mediapool", inventory.root_id, inventory.to_record())
+
+    def _instrument(self, resolve):
+        """Wrap the Resolve object so every call through it is timed, unless instrumentation is off."""
+        if self.bridge_metrics is None:
+            return resolve
+        return instrument(resolve, self.bridge_metrics)
+
+    def get_bridge_metrics(self):
+        """Per-method bridge call counts and latencies.
+
+        Returns:
+            dict: method -> {count, errors, total_ms, mean_ms, p95_ms, routes}, or {} when not instrumented
+        """
+        return self.bridge_metrics.summary() if self.bridge_metrics else {}
+
+    @bridged
     def is_resolve_running(self):
         """Check if DaVinci Resolve is running and accessible."""
         try:
             if self.resolve:
                 version = self.resolve.GetVersionString()
-                logger.info(f"DaVinci Resolve is running, version: {version}")
+                logger.debug("DaVinci Resolve is running, version: %s", version)
                 return {"status": True, "version": version}
             logger.error("Could not connect to DaVinci Resolve")
             return {"status": False, "error": "Could not connect to DaVinci Resolve"}
         except Exception as e:
             logger.error(f"Error checking if Resolve is running: {str(e)}")
+            # GetVersionString() only fails when the bridge is gone, e.g. Resolve quit or restarted
+            self.disconnect(str(e))
             return {"status": False, "error": str(e)}
 
+    def _handle_entry(self, kind):
+        """Return the cached entry for a handle kind if it can be used without asking Resolve.
+
+        The ProjectManager lives as long as the connection and the media pool as long as its
+        project. The project and timeline can be switched inside Resolve at any time, so they
+        are only trusted for the rest of the bridged call (batch) that last checked them.
+        """
+        entry = self._handles.get(kind)
+        if not entry or not self.cache_handles:
+            return None
+        if kind in ("project", "timeline") and (entry["batch"] is None or entry["batch"] is not current_batch()):
+            return None
+        self._handle_stats[kind]["hits"] += 1
+        return entry
+
+    def _store_handle(self, kind, handle, unique_id):
+        """Cache a freshly resolved handle, counting a miss unless it is the same object graph node."""
+        previous = self._handles.get(kind)
+        if previous and previous["unique_id"] == unique_id and unique_id is not None:
+            self._handle_stats[kind]["revalidations"] += 1
+        else:
+            self._handle_stats[kind]["misses"] += 1
+            if previous:
+                self._handle_stats[kind]["invalidations"] += 1
+                # Children of a replaced handle belong to the old project/timeline
+                for child in HANDLE_CHILDREN.get(kind, ()):
+                    self._drop_handle(child)
+        self._handles[kind] = {"handle": handle, "unique_id": unique_id, "batch": current_batch()}
+        return handle
+
+    def _drop_handle(self, kind):
+        """Remove a handle and everything resolved from it."""
+        if self._handles.pop(kind, None) is not None:
+            self._handle_stats[kind]["invalidations"] += 1
+        for child in HANDLE_CHILDREN.get(kind, ()):
+            self._drop_handle(child)
+
+    def invalidate_handles(self):
+        """Drop every cached Resolve handle so the next call walks the object graph again."""
+        with self._handle_lock:
+            self._drop_handle("project_manager")
+
+    def get_handle_cache_stats(self):
+        """Get hit/miss counters for the Resolve handle cache.
+        
+        Returns:
+            dict: Whether handles are cached, the unique IDs currently cached and per-handle counters
+        """
+        with self._handle_lock:
+            return {
+                "enabled": self.cache_handles,
+                "cached": {kind: entry["unique_id"] for kind, entry in self._handles.items()},
+                "handles": {kind: dict(counters) for kind, counters in self._handle_stats.items()}
+            }
+
+    def _cached_handle_id(self, kind):
+        """Unique ID of a cached handle, None if that handle is not cached."""
+        entry = self._handles.get(kind)
+        return entry["unique_id"] if entry else None
+
+    @bridged
+    def _resolve_project_for_monitor(self):
+        """Resolve (project, project_id) for the render monitor, (None, None) without a project."""
+        if not self.connected:
+            return None, None
+        current_project = self._get_current_project()
+        if not current_project:
+            return None, None
+        return current_project, self._cached_handle_id("project")
+
+    def start_render_monitor(self, on_update=None, should_poll=None):
+        """Start polling the render queue in the background.
+        
+        Args:
+            on_update (callable, optional): Receives (changed_jobs, rendering) after each poll with changes
+            should_poll (callable, optional): Returns False while nobody needs render updates
+        """
+        if on_update is not None:
+            self.render_monitor.on_update = on_update
+        self.render_monitor.start(self._resolve_project_for_monitor, should_poll)
+        self.render_monitor.wake()
+
+    def _get_project_manager(self):
+        """Resolve the ProjectManager handle, reusing the cached one until the connection is reset."""
+        with self._handle_lock:
+            entry = self._handle_entry("project_manager")
+            if entry:
+                return entry["handle"]
+            
+            logger.debug("Getting project manager...")
+            project_manager = self.resolve.GetProjectManager()
+            # The ProjectManager has no unique ID; it only changes when Resolve reconnects
+            return self._store_handle("project_manager", project_manager, "project_manager")
+
+    def _get_current_project(self):
+        """Resolve the current project handle.
+        
+        Within a bridged call the cached handle is returned without touching Resolve. The
+        first lookup of every call fetches the current project again and compares it by
+        GetUniqueId(), dropping the cached timeline and media pool if the project changed.
+
+        Returns:
+            Project or None: The currently loaded project, None if no project is open
+        """
+        with self._handle_lock:
+            entry = self._handle_entry("project")
+            if entry:
+                return entry["handle"]
+            
+            project_manager = self._get_project_manager()
+            
+            logger.debug("Getting current project...")
+            current_project = project_manager.GetCurrentProject()
+            if not current_project:
+                self._drop_handle("project")
+                return None
+            return self._store_handle("project", current_project, current_project.GetUniqueId())
+
+    def _get_current_timeline(self, current_project):
+        """Resolve the current timeline handle of an already resolved project.
+        
+        Returns:
+            Timeline or None: The current timeline, None if no timeline is open
+        """
+        with self._handle_lock:
+            entry = self._handle_entry("timeline")
+            if entry:
+                return entry["handle"]
+            
+            logger.debug("Getting current timeline...")
+            current_timeline = current_project.GetCurrentTimeline()
+            if not current_timeline:
+                self._drop_handle("timeline")
+                return None
+            return self._store_handle("timeline", current_timeline, current_timeline.GetUniqueId())
+
+    def _get_media_pool(self, current_project):
+        """Resolve the media pool handle of an already resolved project.
+        
+        Returns:
+            MediaPool or None: The project's media pool, None if it could not be accessed
+        """
+        with self._handle_lock:
+            entry = self._handle_entry("mediapool")
+            if entry:
+                return entry["handle"]
+            
+            logger.debug("Getting media pool...")
+            media_pool = current_project.GetMediaPool()
+            if not media_pool:
+                self._drop_handle("mediapool")
+                return None
+            return self._store_handle("mediapool", media_pool, media_pool.GetUniqueId())
+
+    def _build_project_info(self, current_project):
+        """Build the basic project section from an already resolved project handle."""
+        # Get only the requested basic project information
+        project_name = current_project.GetName()
+        framerate = current_project.GetSetting("timelineFrameRate")
+        timeline_count = current_project.GetTimelineCount()
+        
+        logger.debug("Project info retrieved: %s, framerate: %s, timeline count: %s", project_name, framerate, timeline_count)
+        
+        return {
+            "name": project_name,
+            "framerate": framerate,
+            "timeline_count": timeline_count
+        }
+
+    def _build_timeline_info(self, current_timeline):
+        """Build the timeline section from an already resolved timeline handle."""
+        # Get timeline information
+        name = current_timeline.GetName()
+        start_frame = current_timeline.GetStartFrame()
+        end_frame = current_timeline.GetEndFrame()
+        start_timecode = current_timeline.GetStartTimecode()
+        frame_rate = FrameRate.from_timeline(current_timeline, start_timecode)
+        
+        # Get current timecode (when available)
+        try:
+            current_timecode = current_timeline.GetCurrentTimecode()
+        except:
+            current_timecode = None
+        
+        # Get track counts
+        video_track_count = current_timeline.GetTrackCount("video")
+        audio_track_count = current_timeline.GetTrackCount("audio")
+        subtitle_track_count = current_timeline.GetTrackCount("subtitle")
+        
+        logger.debug("Timeline info retrieved: %s, frames: %s-%s, tracks: V%s/A%s/S%s",
+                     name, start_frame, end_frame, video_track_count, audio_track_count, subtitle_track_count)
+        
+        return {
+            "name": name,
+            "start_frame": start_frame,
+            "end_frame": end_frame,
+            "start_timecode": start_timecode,
+            "end_timecode": frame_rate.to_timecode(end_frame),
+            "current_timecode": current_timecode,
+            "frame_rate": frame_rate.fps,
+            "drop_frame": frame_rate.drop_frame,
+            "track_count": {
+                "video": video_track_count,
+                "audio": audio_track_count,
+                "subtitle": subtitle_track_count
+            }
+        }
+
+    def _build_media_pool_info(self, media_pool):
+        """Build the media pool section from an already resolved media pool handle."""
+        # Get media pool information
+        root_folder = media_pool.GetRootFolder()
+        current_folder = media_pool.GetCurrentFolder()
+        selected_clips = media_pool.GetSelectedClips()
+        
+        root_folder_name = root_folder.GetName() if root_folder else "Unknown"
+        current_folder_name = current_folder.GetName() if current_folder else "Unknown"
+        selected_clips_count = len(selected_clips) if selected_clips else 0
+        
+        logger.debug("Media pool info retrieved: Current folder: %s, Selected clips: %s", current_folder_name, selected_clips_count)
+        
+        return {
+            "root_folder": root_folder_name,
+            "current_folder": current_folder_name,
+            "selected_clips": selected_clips_count
+        }
+
+    def _build_render_jobs(self, current_project):
+        """Build the render jobs section from an already resolved project handle.
+        
+        Goes through the render monitor, which skips GetRenderJobStatus() for jobs that
+        already finished and adds ETA and frames/sec for jobs that are rendering.
+        """
+        render_jobs_info = self.render_monitor.poll(current_project, self._cached_handle_id("project"))
+        
+        if not render_jobs_info["job_count"]:
+            logger.debug("No render jobs found")
+        else:
+            logger.debug("Found %s render jobs", render_jobs_info['job_count'])
+        
+        return render_jobs_info
+
+    @bridged
+    @bridged
     def get_basic_project_info(self):
         """Get just the basic project information requested.
         
@@ -160,35 +630,21 @@ class DaVinciResolveAPI:
             dict: Contains project name, framerate, and timeline count
         """
         try:
-            logger.info("Getting project manager...")
-            project_manager = self.resolve.GetProjectManager()
-            
-            logger.info("Getting current project...")
-            current_project = project_manager.GetCurrentProject()
+            current_project = self._get_current_project()
             
             if not current_project:
                 logger.warning("No project is currently open")
                 return {"error": "No project is currently open"}
             
-            # Get only the requested basic project information
-            project_name = current_project.GetName()
-            framerate = current_project.GetSetting("timelineFrameRate")
-            timeline_count = current_project.GetTimelineCount()
-            
-            logger.info(f"Project info retrieved: {project_name}, framerate: {framerate}, timeline count: {timeline_count}")
-            
-            project_info = {
-                "name": project_name,
-                "framerate": framerate,
-                "timeline_count": timeline_count
-            }
-            
-            return project_info
+            return self._build_project_info(current_project)
         
         except Exception as e:
             logger.error(f"Error getting project info: {str(e)}")
+            # A failing call usually means a cached handle went stale (project closed, Resolve restarted)
+            self.invalidate_handles()
             return {"error": f"Error getting project info: {str(e)}"}
 
+    @bridged
     def get_timeline_info(self):
         """Get current timeline information.
         
@@ -196,62 +652,27 @@ class DaVinciResolveAPI:
             dict: Contains timeline details like name, frames, timecode and track counts
         """
         try:
-            logger.info("Getting project manager...")
-            project_manager = self.resolve.GetProjectManager()
-            
-            logger.info("Getting current project...")
-            current_project = project_manager.GetCurrentProject()
+            current_project = self._get_current_project()
             
             if not current_project:
                 logger.warning("No project is currently open")
                 return {"error": "No project is currently open"}
             
-            logger.info("Getting current timeline...")
-            current_timeline = current_project.GetCurrentTimeline()
+            current_timeline = self._get_current_timeline(current_project)
             
             if not current_timeline:
                 logger.warning("No timeline is currently open")
                 return {"error": "No timeline is currently open"}
             
-            # Get timeline information
-            name = current_timeline.GetName()
-            start_frame = current_timeline.GetStartFrame()
-            end_frame = current_timeline.GetEndFrame()
-            start_timecode = current_timeline.GetStartTimecode()
-            
-            # Get current timecode (when available)
-            try:
-                current_timecode = current_timeline.GetCurrentTimecode()
-            except:
-                current_timecode = None
-            
-            # Get track counts
-            video_track_count = current_timeline.GetTrackCount("video")
-            audio_track_count = current_timeline.GetTrackCount("audio")
-            subtitle_track_count = current_timeline.GetTrackCount("subtitle")
-            
-            logger.info(f"Timeline info retrieved: {name}, frames: {start_frame}-{end_frame}, tracks: V{video_track_count}/A{audio_track_count}/S{subtitle_track_count}")
-            
-            timeline_info = {
-                "name": name,
-                "start_frame": start_frame,
-                "end_frame": end_frame,
-                "start_timecode": start_timecode,
-                "current_timecode": current_timecode,
-                "track_count": {
-                    "video": video_track_count,
-                    "audio": audio_track_count,
-                    "subtitle": subtitle_track_count
-                }
-            }
-            
-            return timeline_info
+            return self._build_timeline_info(current_timeline)
         
         except Exception as e:
             logger.error(f"Error getting timeline info: {str(e)}")
+            self.invalidate_handles()
             logger.error(traceback.format_exc())
             return {"error": f"Error getting timeline info: {str(e)}"}
 
+    @bridged
     def get_media_pool_info(self):
         """Get information about the current media pool.
         
@@ -259,47 +680,249 @@ class DaVinciResolveAPI:
             dict: Contains media pool information like current folder and selected clips
         """
         try:
-            logger.info("Getting project manager...")
-            project_manager = self.resolve.GetProjectManager()
-            
-            logger.info("Getting current project...")
-            current_project = project_manager.GetCurrentProject()
+            current_project = self._get_current_project()
             
             if not current_project:
                 logger.warning("No project is currently open")
                 return {"error": "No project is currently open"}
             
-            logger.info("Getting media pool...")
-            media_pool = current_project.GetMediaPool()
+            media_pool = self._get_media_pool(current_project)
             
             if not media_pool:
                 logger.warning("Could not access media pool")
                 return {"error": "Could not access media pool"}
             
-            # Get media pool information
-            root_folder = media_pool.GetRootFolder()
-            current_folder = media_pool.GetCurrentFolder()
-            selected_clips = media_pool.GetSelectedClips()
-            
-            root_folder_name = root_folder.GetName() if root_folder else "Unknown"
-            current_folder_name = current_folder.GetName() if current_folder else "Unknown"
-            selected_clips_count = len(selected_clips) if selected_clips else 0
-            
-            logger.info(f"Media pool info retrieved: Current folder: {current_folder_name}, Selected clips: {selected_clips_count}")
-            
-            media_pool_info = {
-                "root_folder": root_folder_name,
-                "current_folder": current_folder_name,
-                "selected_clips": selected_clips_count
-            }
-            
-            return media_pool_info
+            return self._build_media_pool_info(media_pool)
         
         except Exception as e:
             logger.error(f"Error getting media pool info: {str(e)}")
+            self.invalidate_handles()
             logger.error(traceback.format_exc())
             return {"error": f"Error getting media pool info: {str(e)}"}
 
+    @bridged
+    def _resolve_media_pool_for_crawl(self):
+        """Resolve (media_pool, project_id) for a media pool crawl, raises if there is none."""
+        current_project = self._get_current_project()
+        if not current_project:
+            raise LookupError("No project is currently open")
+        media_pool = self._get_media_pool(current_project)
+        if not media_pool:
+            raise LookupError("Could not access media pool")
+        return media_pool, current_project.GetUniqueId()
+
+    @bridged
+    def _current_project_id(self):
+        """Unique ID of the current project, None if no project is open."""
+        current_project = self._get_current_project()
+        if not current_project:
+            return None
+        return self._cached_handle_id("project")
+
+    def get_media_pool_inventory(self, refresh=False, full=False, wait=False):
+        """Get the cached media pool inventory, starting a background crawl when it is stale.
+        
+        Args:
+            refresh (bool): Re-crawl even if the inventory is still fresh
+            full (bool): Re-read the properties of every clip instead of only changed folders
+            wait (bool): Block until a running crawl has finished
+        
+        Returns:
+            MediaPoolInventory or dict: The inventory of the current project, or a dict with
+                "error" (and "pending" while the first crawl is still running)
+        """
+        try:
+            project_id = self._current_project_id()
+            if not project_id:
+                logger.warning("No project is currently open")
+                return {"error": "No project is currently open"}
+        except Exception as e:
+            logger.error(f"Error getting media pool inventory: {str(e)}")
+            self.invalidate_handles()
+            return {"error": f"Error getting media pool inventory: {str(e)}"}
+        
+        crawler = self.media_pool_crawler
+        inventory = crawler.inventory
+        if inventory is None or inventory.project_id != project_id:
+            record = self._load_record(project_id, "mediapool")
+            if record:
+                # Served from disk while the crawl started below reconciles it with Resolve
+                crawler.warm_start(MediaPoolInventory.from_record(record))
+                inventory = crawler.inventory
+        if inventory and inventory.project_id != project_id:
+            # Another project was crawled, crawl the new one instead of ageing out the old one
+            refresh = True
+        crawler.ensure_fresh(self._resolve_media_pool_for_crawl, refresh=refresh, full=full, wait=wait)
+        
+        inventory = crawler.inventory
+        if inventory and inventory.project_id == project_id:
+            return inventory
+        if crawler.crawling:
+            return {"error": "Media pool is being crawled, try again shortly", "pending": True, "crawl": crawler.get_state()}
+        return {"error": f"Error crawling media pool: {crawler.last_error}", "crawl": crawler.get_state()}
+
+    def _get_clip_inventory(self, clip_ids=(), refresh_missing=False):
+        """Get an inventory with clip handles, waiting for a crawl only when it has to.
+        
+        An aged inventory is served while the background crawl refreshes it. The call only
+        blocks while there is no inventory with handles yet (none, or one loaded from the
+        metadata store), or with refresh_missing when one of clip_ids is not in it.
+        
+        Args:
+            clip_ids (iterable): Clips the caller needs handles for
+            refresh_missing (bool): Re-crawl and wait if one of clip_ids is unknown
+        
+        Returns:
+            MediaPoolInventory or dict: See get_media_pool_inventory()
+        """
+        inventory = self.get_media_pool_inventory()
+        if isinstance(inventory, dict):
+            if not inventory.get("pending"):
+                return inventory
+            return self.get_media_pool_inventory(wait=True)
+        if inventory.source == "store":
+            return self.get_media_pool_inventory(wait=True)
+        if refresh_missing and any(clip_id not in inventory.handles for clip_id in clip_ids):
+            return self.get_media_pool_inventory(refresh=True, wait=True)
+        return inventory
+
+    def get_media_pool_tree(self, folder_id=None, refresh=False, full=False, wait=False):
+        """Get the media pool folder tree from the cached inventory.
+        
+        Args:
+            folder_id (str, optional): Folder to start from, defaults to the root folder
+            refresh, full, wait: See get_media_pool_inventory()
+        
+        Returns:
+            dict: Nested folders with their clip counts plus the crawl state
+        """
+        inventory = self.get_media_pool_inventory(refresh=refresh, full=full, wait=wait)
+        if isinstance(inventory, dict):
+            return inventory
+        
+        tree = inventory.tree(folder_id)
+        if tree is None:
+            return {"error": f"Unknown folder: {folder_id}"}
+        return {
+            "project_id": inventory.project_id,
+            "folder_count": len(inventory.folders),
+            "clip_count": len(inventory.clips),
+            "tree": tree,
+            "crawl": self.media_pool_crawler.get_state()
+        }
+
+    def get_media_pool_clips(self, folder_id=None, recursive=False, offset=0, limit=MEDIA_POOL_CLIPS_PAGE_SIZE,
+                             refresh=False, full=False, wait=False):
+        """Get a page of media pool clips and their properties from the cached inventory.
+        
+        Args:
+            folder_id (str, optional): Only clips in this folder, default is every clip
+            recursive (bool): Include the clips of folder_id's subfolders
+            offset (int): Index of the first clip of the page
+            limit (int): Maximum number of clips on the page
+            refresh, full, wait: See get_media_pool_inventory()
+        
+        Returns:
+            dict: Contains the clips, the total count and the crawl state
+        
+        Raises:
+            ValueError: If offset or limit are out of range
+        """
+        if offset < 0 or not 1 <= limit <= MEDIA_POOL_CLIPS_MAX_PAGE_SIZE:
+            raise ValueError(f"offset must be >= 0 and limit between 1 and {MEDIA_POOL_CLIPS_MAX_PAGE_SIZE}")
+        
+        inventory = self.get_media_pool_inventory(refresh=refresh, full=full, wait=wait)
+        if isinstance(inventory, dict):
+            return inventory
+        
+        clip_ids = inventory.clip_ids(folder_id, recursive=recursive)
+        page = clip_ids[offset:offset + limit]
+        return {
+            "project_id": inventory.project_id,
+            "total": len(clip_ids),
+            "offset": offset,
+            "clips": [inventory.clips[clip_id] for clip_id in page],
+            "crawl": self.media_pool_crawler.get_state()
+        }
+
+    def get_clip_properties(self, clip_ids, keys=None):
+        """Fetch properties of many media pool clips in as few bridge calls as possible.
+        
+        With at most CLIP_PROPERTY_PER_KEY_LIMIT keys every key is fetched on its own;
+        otherwise (or without keys) each clip's whole property dict is fetched in one
+        call and projected down to the requested keys.
+        
+        Args:
+            clip_ids (list): Media pool item unique IDs
+            keys (list, optional): Property names, defaults to every property
+        
+        Returns:
+            dict: Columnar result: "keys" and "ids" once, "columns" holding one list of
+                values per key aligned with "ids", plus "missing" IDs and the fetch strategy
+        
+        Raises:
+            ValueError: If no or too many clip IDs are given
+        """
+        if not clip_ids:
+            raise ValueError("No clip IDs given")
+        if len(clip_ids) > CLIP_PROPERTIES_MAX_CLIPS:
+            raise ValueError(f"At most {CLIP_PROPERTIES_MAX_CLIPS} clips can be fetched at once")
+        
+        inventory = self._get_clip_inventory()
+        if isinstance(inventory, dict):
+            return inventory
+        
+        found = [clip_id for clip_id in clip_ids if clip_id in inventory.handles]
+        missing = [clip_id for clip_id in clip_ids if clip_id not in inventory.handles]
+        per_key = bool(keys) and len(keys) <= CLIP_PROPERTY_PER_KEY_LIMIT
+        
+        started = time.perf_counter()
+        try:
+            rows, bridge_calls = self._fetch_clip_properties(inventory, found, keys if per_key else None)
+        except Exception as e:
+            logger.error(f"Error getting clip properties: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {"error": f"Error getting clip properties: {str(e)}"}
+        
+        if per_key:
+            columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in keys]
+        else:
+            if not keys:
+                keys = sorted({key for properties in rows for key in properties})
+            columns = [[properties.get(key) for properties in rows] for key in keys]
+        
+        logger.debug("Fetched %s properties of %s clips with %s bridge calls", len(keys), len(found), bridge_calls)
+        
+        return {
+            "keys": list(keys),
+            "ids": found,
+            "columns": columns,
+            "missing": missing,
+            "fetch": "per_key" if per_key else "whole_dict",
+            "bridge_calls": bridge_calls,
+            "fetch_ms": _elapsed_ms(started)
+        }
+
+    @bridged
+    def _fetch_clip_properties(self, inventory, clip_ids, keys=None):
+        """Read clip properties on the bridge, one call per key if keys are given, else one per clip.
+
+        Returns:
+            tuple: (rows, bridge_calls), rows holding a value list or a property dict per clip
+        """
+        rows = []
+        bridge_calls = 0
+        for clip_id in clip_ids:
+            clip = inventory.handles[clip_id]
+            if keys:
+                rows.append([clip.GetClipProperty(key) for key in keys])
+                bridge_calls += len(keys)
+            else:
+                rows.append(clip.GetClipProperty() or {})
+                bridge_calls += 1
+        return rows, bridge_calls
+
+    @bridged
     def get_render_jobs(self):
         """Get information about render jobs.
         
@@ -307,50 +930,577 @@ class DaVinciResolveAPI:
             dict: Contains render job information like count and details of each job
         """
         try:
-            logger.info("Getting project manager...")
-            project_manager = self.resolve.GetProjectManager()
-            
-            logger.info("Getting current project...")
-            current_project = project_manager.GetCurrentProject()
+            current_project = self._get_current_project()
             
             if not current_project:
                 logger.warning("No project is currently open")
                 return {"error": "No project is currently open"}
             
-            # Get render jobs list
-            job_list = current_project.GetRenderJobList()
+            return self._build_render_jobs(current_project)
+        
+        except Exception as e:
+            logger.error(f"Error getting render jobs info: {str(e)}")
+            self.invalidate_handles()
+            logger.error(traceback.format_exc())
+            return {"error": f"Error getting render jobs info: {str(e)}"}
+
+    def get_timeline_index(self, refresh=False, revision=None):
+        """Get the item index of the current timeline, building it when needed.
+        
+        The index is rebuilt only when the timeline fingerprint (unique ID, end frame,
+        track counts) changes; between checks it is served without touching Resolve.
+        
+        Args:
+            refresh (bool): Rebuild even if the fingerprint is unchanged
+            revision (str, optional): Return this earlier revision if it is still held
+        
+        Returns:
+            TimelineIndex or dict: The index, or a dict with "error" (and "expired" for
+                a revision that is no longer held)
+        """
+        with self._timeline_index_lock:
+            if revision is not None:
+                index = self._timeline_indexes.get(revision)
+                if index:
+                    return index
+                return {"error": "Timeline changed since this cursor was issued, restart from the first page", "expired": True}
             
-            if not job_list:
-                logger.info("No render jobs found")
-                return {"job_count": 0, "jobs": []}
+            current = next(reversed(self._timeline_indexes.values()), None)
+            if current and not refresh and time.monotonic() - self._timeline_index_checked_at < TIMELINE_INDEX_CHECK_INTERVAL:
+                return current
+        
+        # Only the fingerprint check and rebuild need the bridge; pages of a held revision do not queue
+        return self._refresh_timeline_index(refresh)
+
+    @bridged
+    def _refresh_timeline_index(self, refresh=False):
+        """Compare the current timeline's fingerprint with the newest index and rebuild it if needed."""
+        with self._timeline_index_lock:
+            current = next(reversed(self._timeline_indexes.values()), None)
+            if current and not refresh and time.monotonic() - self._timeline_index_checked_at < TIMELINE_INDEX_CHECK_INTERVAL:
+                # Checked by a job that ran while this one was queued
+                return current
             
-            jobs = []
-            for job in job_list:
-                # Get job status
-                job_id = job['JobId']
-                job_status = current_project.GetRenderJobStatus(job_id)
+            try:
+                current_project = self._get_current_project()
+                if not current_project:
+                    logger.warning("No project is currently open")
+                    return {"error": "No project is currently open"}
                 
-                job_info = {
-                    "id": job_id,
-                    "name": job.get('TimelineName', 'Unknown'),
-                    "status": job_status.get('JobStatus', 'Unknown'),
-                    "progress": job_status.get('CompletionPercentage', 0)
-                }
-                jobs.append(job_info)
-            
-            logger.info(f"Found {len(jobs)} render jobs")
+                current_timeline = self._get_current_timeline(current_project)
+                if not current_timeline:
+                    logger.warning("No timeline is currently open")
+                    return {"error": "No timeline is currently open"}
+                
+                fingerprint = get_timeline_fingerprint(current_timeline)
+                self._timeline_index_checked_at = time.monotonic()
+                if current and not refresh and current.fingerprint == fingerprint:
+                    return current
+                
+                project_id = self._cached_handle_id("project")
+                index = None
+                if not refresh:
+                    record = self._load_record(project_id, "timeline_index", fingerprint[0])
+                    stored = TimelineIndex.from_record(record) if record else None
+                    if stored and stored.fingerprint == fingerprint:
+                        index = stored
+                        logger.info(f"Loaded index of {len(index.items)} timeline items from the metadata store")
+                
+                if index is None:
+                    logger.debug("Building timeline item index...")
+                    index = build_timeline_index(current_timeline, fingerprint)
+                    self._store_record(project_id, "timeline_index", index.timeline_id, index.to_record())
+                else:
+                    # Items can change without changing the fingerprint; rebuild from Resolve in the background
+                    threading.Thread(target=self._refresh_timeline_index, kwargs={"refresh": True},
+                                     name="timeline-index-reconcile", daemon=True).start()
+            except Exception as e:
+                logger.error(f"Error indexing timeline items: {str(e)}")
+                logger.error(traceback.format_exc())
+                self.invalidate_handles()
+                return {"error": f"Error indexing timeline items: {str(e)}"}
             
-            render_jobs_info = {
-                "job_count": len(jobs),
-                "jobs": jobs
-            }
+            self._timeline_indexes[index.revision] = index
+            while len(self._timeline_indexes) > TIMELINE_INDEX_REVISIONS:
+                self._timeline_indexes.popitem(last=False)
+            return index
+
+    @staticmethod
+    def check_timeline_item_query(track_type=None, **query):
+        """Validate the filters of a timeline item query before the index is built.
+        
+        Raises:
+            ValueError: If track_type is not one of TRACK_TYPES
+        """
+        if track_type is not None and track_type not in TRACK_TYPES:
+            raise ValueError(f"Unknown track type: {track_type}")
+
+    def get_timeline_items(self, track_type=None, track=None, frame=None, start=None, end=None,
+                           cursor=None, limit=TIMELINE_ITEMS_PAGE_SIZE, refresh=False):
+        """Get a page of timeline items from the timeline index.
+        
+        Args:
+            track_type (str, optional): "video", "audio" or "subtitle"
+            track (int, optional): 1-based track number within track_type
+            frame (int, optional): Only items under this frame
+            start (int, optional): Only items overlapping frames from start...
+            end (int, optional): ...to end (inclusive)
+            cursor (str, optional): next_cursor of the previous page, pins the index revision
+            limit (int): Maximum number of items on the page
+            refresh (bool): Rebuild the index first
+        
+        Returns:
+            dict: Contains the matching items, the total match count and next_cursor
+                (None on the last page)
+        
+        Raises:
+            ValueError: If a parameter or the cursor is malformed
+        """
+        self.check_timeline_item_query(track_type=track_type)
+        if not 1 <= limit <= TIMELINE_ITEMS_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {TIMELINE_ITEMS_MAX_PAGE_SIZE}")
+        
+        revision, offset = None, 0
+        if cursor:
+            try:
+                revision, offset = cursor.split(":")
+                offset = int(offset)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+        
+        index = self.get_timeline_index(refresh=refresh and not cursor, revision=revision)
+        if isinstance(index, dict):
+            return index
+        
+        items = index.select(track_type=track_type, track=track, frame=frame, start=start, end=end)
+        page = items[offset:offset + limit]
+        next_offset = offset + len(page)
+        
+        return {
+            "timeline_id": index.timeline_id,
+            "revision": index.revision,
+            "total": len(items),
+            "items": page,
+            "next_cursor": f"{index.revision}:{next_offset}" if next_offset < len(items) else None
+        }
+
+    def get_marker_index(self, refresh=False):
+        """Get the marker index of the current timeline, building it when needed.
+        
+        The index belongs to one timeline index revision and is rebuilt when the timeline
+        changes, when it is older than MARKER_INDEX_MAX_AGE or on refresh.
+        
+        Args:
+            refresh (bool): Rebuild the marker index (the timeline index is reused)
+        
+        Returns:
+            MarkerIndex or dict: The index, or a dict with "error"
+        """
+        timeline_index = self.get_timeline_index()
+        if isinstance(timeline_index, dict):
+            return timeline_index
+        if timeline_index.source == "store":
+            # Markers are read through the item handles, which an index loaded from disk does not have
+            timeline_index = self._refresh_timeline_index(refresh=True)
+            if isinstance(timeline_index, dict):
+                return timeline_index
+        
+        marker_index = self._marker_index
+        if (marker_index and not refresh and marker_index.revision == timeline_index.revision
+                and time.monotonic() - marker_index.created < MARKER_INDEX_MAX_AGE):
+            return marker_index
+        return self._build_marker_index(timeline_index, refresh)
+
+    @bridged
+    def _build_marker_index(self, timeline_index, refresh=False):
+        """Read every marker of the indexed timeline on the bridge."""
+        marker_index = self._marker_index
+        if (marker_index and not refresh and marker_index.revision == timeline_index.revision
+                and time.monotonic() - marker_index.created < MARKER_INDEX_MAX_AGE):
+            # Built by a job that ran while this one was queued
+            return marker_index
+        
+        try:
+            current_project = self._get_current_project()
+            if not current_project:
+                return {"error": "No project is currently open"}
+            current_timeline = self._get_current_timeline(current_project)
+            if not current_timeline or self._cached_handle_id("timeline") != timeline_index.timeline_id:
+                return {"error": "The current timeline changed, try again"}
             
-            return render_jobs_info
+            logger.debug("Building marker index...")
+            marker_index = build_marker_index(current_timeline, timeline_index)
+        except Exception as e:
+            logger.error(f"Error indexing markers: {str(e)}")
+            logger.error(traceback.format_exc())
+            self.invalidate_handles()
+            return {"error": f"Error indexing markers: {str(e)}"}
+        
+        self._marker_index = marker_index
+        return marker_index
+
+    def get_markers(self, start=None, end=None, color=None, name=None, source=None, refresh=False):
+        """Get the markers of the current timeline, its items and their clips from the marker index.
+        
+        Args:
+            start, end (int, optional): Inclusive range of timeline frames
+            color (str, optional): Only markers of this color (case-insensitive)
+            name (str, optional): Only markers whose name contains this text (case-insensitive)
+            source (str, optional): Only "timeline", "item" or "clip" markers
+            refresh (bool): Rebuild the marker index first
+        
+        Returns:
+            dict: Contains the matching markers sorted by frame and their count
+        
+        Raises:
+            ValueError: If source is unknown or start is after end
+        """
+        if source is not None and source not in MARKER_SOURCES:
+            raise ValueError(f"Unknown marker source: {source}")
+        if start is not None and end is not None and start > end:
+            raise ValueError("start must not be after end")
+        
+        marker_index = self.get_marker_index(refresh=refresh)
+        if isinstance(marker_index, dict):
+            return marker_index
+        
+        markers = marker_index.select(start=start, end=end, color=color, name=name, source=source)
+        return {
+            "timeline_id": marker_index.timeline_id,
+            "revision": marker_index.revision,
+            "total": len(markers),
+            "markers": markers
+        }
+
+    def start_timeline_scan(self, all_projects=False, wait=False):
+        """Start a background scan summarizing every timeline of the current project or of all projects.
+        
+        A scan that is already queued or running for the same scope is returned instead of
+        starting another one. While an all-projects scan runs, Resolve switches between the
+        projects of the current folder, so the other getters see whichever project is loaded.
+        
+        Args:
+            all_projects (bool): Scan every project in the ProjectManager's current folder
+            wait (bool): Block until the scan has finished
+        
+        Returns:
+            dict: The scan job (id, state, progress, errors)
+        """
+        job = self.scan_jobs.start(self._get_project_manager, all_projects=all_projects,
+                                   on_project_switch=self.invalidate_handles)
+        if wait:
+            job.done.wait()
+        return job.to_dict()
+
+    def get_scan_job(self, job_id):
+        """Get the state and progress of a scan job, None if the ID is unknown."""
+        job = self.scan_jobs.get_job(job_id)
+        return job.to_dict() if job else None
+
+    def get_timeline_summary(self, project_id=None):
+        """Get the stored timeline summary of a project, as written by its last scan.
+        
+        Args:
+            project_id (str, optional): Defaults to the current project
+        
+        Returns:
+            dict: project_id, project_name, scanned_at and one entry per timeline, or a dict
+                with "error" ("scanned": False when the project was never scanned)
+        """
+        if project_id is None:
+            try:
+                project_id = self._current_project_id()
+            except Exception as e:
+                logger.error(f"Error getting timeline summary: {str(e)}")
+                self.invalidate_handles()
+                return {"error": f"Error getting timeline summary: {str(e)}"}
+            if not project_id:
+                return {"error": "No project is currently open"}
+        
+        summary = self.scan_jobs.get_summary(project_id)
+        if summary is None:
+            return {"error": "The timelines of this project have not been scanned yet", "project_id": project_id,
+                    "scanned": False}
+        return summary
+
+    def apply_batch(self, operations, dry_run=False, max_operations=BATCH_MAX_OPERATIONS):
+        """Apply many write operations (clip properties, metadata, markers, clip colors) in one bridge job.
+        
+        Operations are grouped by target so every clip, timeline item or timeline handle is
+        looked up once, then all groups run in a single pass on the bridge. Resolve has no
+        transactions: operations that succeed stay applied when others fail, and the result
+        reports every operation on its own. A dry run validates the batch, resolves every
+        target and reads the values the writes would replace, without writing anything.
+        
+        Args:
+            operations (list): Operation dicts, see batch.parse_operation()
+            dry_run (bool): Check the batch without writing
+            max_operations (int): Reject batches with more operations than this
+        
+        Returns:
+            dict: total, succeeded, failed, dry_run, the number of targets and one result per
+                operation in request order, or a dict with "error"
         
+        Raises:
+            ValueError: If operations is empty, not a list or longer than max_operations
+        """
+        groups, results = plan_batch(operations, max_operations)
+        kinds = {kind for kind, _ in groups}
+        handles = {}
+        
+        if "clip" in kinds:
+            clip_ids = [target_id for kind, target_id in groups if kind == "clip"]
+            inventory = self._get_clip_inventory(clip_ids, refresh_missing=True)
+            if isinstance(inventory, dict):
+                return inventory
+            handles.update({(kind, target_id): inventory.handles.get(target_id)
+                            for kind, target_id in groups if kind == "clip"})
+        if "item" in kinds:
+            timeline_index = self.get_timeline_index()
+            if not isinstance(timeline_index, dict) and timeline_index.source == "store":
+                timeline_index = self._refresh_timeline_index(refresh=True)
+            if isinstance(timeline_index, dict):
+                return timeline_index
+            handles.update({(kind, target_id): timeline_index.handles.get(target_id)
+                            for kind, target_id in groups if kind == "item"})
+        
+        started = time.perf_counter()
+        try:
+            results.extend(self._apply_batch(groups, handles, dry_run))
         except Exception as e:
-            logger.error(f"Error getting render jobs info: {str(e)}")
+            logger.error(f"Error applying batch: {str(e)}")
             logger.error(traceback.format_exc())
-            return {"error": f"Error getting render jobs info: {str(e)}"}
+            self.invalidate_handles()
+            return {"error": f"Error applying batch: {str(e)}"}
+        results.sort(key=lambda result: result["index"])
+        
+        applied = [result for result in results if result["ok"] and not dry_run]
+        changed_clips = {result["target"]["clip"] for result in applied if "clip" in result["target"]}
+        if changed_clips:
+            # Re-read the written clips' properties in the background instead of serving stale ones
+            self.media_pool_crawler.mark_stale(changed_clips)
+            self.media_pool_crawler.ensure_fresh(self._resolve_media_pool_for_crawl, refresh=True)
+        if any(result["op"] == "AddMarker" for result in applied):
+            self._marker_index = None
+        
+        succeeded = sum(1 for result in results if result["ok"])
+        return {
+            "dry_run": dry_run,
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "targets": len(groups),
+            "apply_ms": _elapsed_ms(started),
+            "results": results
+        }
+
+    @bridged(coalesce=False)
+    def _apply_batch(self, groups, handles, dry_run=False):
+        """Run every group of a planned batch on the bridge."""
+        timeline = None
+        timeline_id = None
+        if any(kind == "timeline" for kind, _ in groups):
+            current_project = self._get_current_project()
+            timeline = self._get_current_timeline(current_project) if current_project else None
+            timeline_id = self._cached_handle_id("timeline") if timeline else None
+        
+        results = []
+        for (kind, target_id), operations in groups.items():
+            if kind == "timeline":
+                handle = timeline if target_id in ("current", timeline_id) else None
+                missing = f"Only the current timeline can be changed, not {target_id}"
+            else:
+                handle = handles.get((kind, target_id))
+                missing = f"Unknown {'media pool clip' if kind == 'clip' else 'timeline item'}: {target_id}"
+            if handle is None:
+                results.extend({"index": index, "op": op, "target": {kind: target_id}, "ok": False, "error": missing}
+                               for index, op, _ in operations)
+                continue
+            results.extend(run_group(kind, target_id, handle, operations, dry_run))
+        return results
+
+    def start_export(self, timelines=None, formats=("edl",), force=False, wait=False):
+        """Start a background job exporting timelines of the current project in one or more formats.
+        
+        Args:
+            timelines (list, optional): Timeline unique IDs or names, defaults to the current timeline
+            formats (iterable): Keys of export_jobs.EXPORT_FORMATS, e.g. "edl", "fcpxml", "otio"
+            force (bool): Export again even if an unchanged timeline was already exported
+            wait (bool): Block until every export has finished
+        
+        Returns:
+            dict: The export job (id, state, progress and one result per timeline and format)
+        
+        Raises:
+            ValueError: If a format is unknown or too many exports are requested
+        """
+        job = self.export_jobs.start(self._list_timelines_for_export, lambda: self.resolve,
+                                     timelines=timelines, formats=formats, force=force)
+        if wait:
+            job.done.wait()
+        return job.to_dict()
+
+    def get_export_job(self, job_id):
+        """Get the state and progress of an export job, None if the ID is unknown."""
+        job = self.export_jobs.get_job(job_id)
+        return job.to_dict() if job else None
+
+    def _list_timelines_for_export(self):
+        """(unique ID, name, handle) of every timeline in the current project and the current timeline's ID.
+        
+        Called on the bridge by the export job manager.
+        """
+        current_project = self._get_current_project()
+        if not current_project:
+            raise LookupError("No project is currently open")
+        timelines = []
+        for index in range(1, (current_project.GetTimelineCount() or 0) + 1):
+            timeline = current_project.GetTimelineByIndex(index)
+            if timeline:
+                timelines.append((timeline.GetUniqueId(), timeline.GetName(), timeline))
+        current_timeline = self._get_current_timeline(current_project)
+        return timelines, self._cached_handle_id("timeline") if current_timeline else None
+
+    def get_thumbnail(self, item_id):
+        """Get the thumbnail of a video item on the current timeline, queueing it if it is not ready.
+        
+        Args:
+            item_id (str): Timeline item unique ID, or a media pool clip ID for its first video item
+        
+        Returns:
+            dict: state "ready" (with path, etag and mimetype), "queued", "busy" (queue full),
+                "failed" or "unavailable" (with error), or a dict with "error" ("unknown": True
+                if there is no such item)
+        """
+        timeline_index = self.get_timeline_index()
+        if isinstance(timeline_index, dict):
+            return timeline_index
+        
+        item = timeline_index.items_by_id.get(item_id)
+        if item is None:
+            item = next((candidate for candidate in timeline_index.items
+                         if candidate["media_pool_item_id"] == item_id and candidate["track_type"] == "video"), None)
+        if item is None:
+            return {"error": f"Unknown timeline item or clip: {item_id}", "unknown": True}
+        if item["track_type"] != "video":
+            return {"state": "unavailable", "error": "Only video items have thumbnails"}
+        
+        frame = thumbnail_frame(timeline_index, item)
+        if frame is None:
+            return {"state": "unavailable", "error": "The item is covered by items on higher tracks"}
+        return self.thumbnails.request(self._cached_handle_id("project"), item, self._grab_thumbnail,
+                                       (timeline_index.timeline_id, timeline_index.frame_rate.to_timecode(frame)))
+
+    def _grab_thumbnail(self, timeline_id, timecode):
+        """Read the image at a timecode of the current timeline; runs as one bridge job.
+        
+        The playhead is moved to the timecode for GetCurrentClipThumbnailImage() and put back
+        afterwards, also if reading the image fails; it is left alone when it already is on
+        that frame. If Resolve returns no image, ExportCurrentFrameAsStill() is tried.
+        
+        Returns:
+            dict or None: {"image": ...} or {"still": bytes}, None if Resolve gave no image
+        """
+        current_project = self._get_current_project()
+        if not current_project:
+            raise LookupError("No project is currently open")
+        current_timeline = self._get_current_timeline(current_project)
+        if not current_timeline or self._cached_handle_id("timeline") != timeline_id:
+            raise LookupError("The current timeline changed")
+        
+        previous_timecode = current_timeline.GetCurrentTimecode()
+        moved = previous_timecode != timecode
+        try:
+            if moved:
+                current_timeline.SetCurrentTimecode(timecode)
+            image = current_timeline.GetCurrentClipThumbnailImage()
+            if image and image.get("data"):
+                return {"image": image}
+            
+            with tempfile.TemporaryDirectory() as directory:
+                still_path = os.path.join(directory, "still.png")
+                if current_project.ExportCurrentFrameAsStill(still_path) and os.path.exists(still_path):
+                    with open(still_path, "rb") as f:
+                        return {"still": f.read()}
+            return None
+        finally:
+            if moved and previous_timecode:
+                current_timeline.SetCurrentTimecode(previous_timecode)
+
+    @bridged
+    def get_snapshot(self, sections=None):
+        """Get several sections of Resolve state in a single pass.
+        
+        The project, timeline and media pool handles are resolved once and shared
+        by every requested section, instead of each section walking down from
+        GetProjectManager() again as the individual getters do.
+        
+        Args:
+            sections (iterable, optional): Names from SNAPSHOT_SECTIONS to include. Defaults to all of them.
+        
+        Returns:
+            dict: One entry per requested section (same payload as the matching getter)
+                plus "timings", the milliseconds spent on handle lookup and on each section
+        """
+        if sections is None:
+            sections = SNAPSHOT_SECTIONS
+        sections = [section for section in SNAPSHOT_SECTIONS if section in set(sections)]
+        
+        snapshot = {}
+        timings = {}
+        started = time.perf_counter()
+        
+        if "status" in sections:
+            section_started = time.perf_counter()
+            snapshot["status"] = self.is_resolve_running()
+            timings["status"] = _elapsed_ms(section_started)
+        
+        handle_sections = [section for section in sections if section != "status"]
+        if handle_sections:
+            section_started = time.perf_counter()
+            handles = {}
+            handle_error = None
+            try:
+                current_project = self._get_current_project()
+                if not current_project:
+                    logger.warning("No project is currently open")
+                    handle_error = "No project is currently open"
+                else:
+                    handles["project"] = current_project
+                    if "timeline" in sections:
+                        handles["timeline"] = self._get_current_timeline(current_project)
+                    if "mediapool" in sections:
+                        handles["mediapool"] = self._get_media_pool(current_project)
+            except Exception as e:
+                logger.error(f"Error resolving snapshot handles: {str(e)}")
+                self.invalidate_handles()
+                handle_error = f"Error resolving project handles: {str(e)}"
+            timings["handles"] = _elapsed_ms(section_started)
+            
+            builders = {
+                "project": ("project", self._build_project_info, "No project is currently open", "Error getting project info"),
+                "timeline": ("timeline", self._build_timeline_info, "No timeline is currently open", "Error getting timeline info"),
+                "mediapool": ("mediapool", self._build_media_pool_info, "Could not access media pool", "Error getting media pool info"),
+                "renderjobs": ("project", self._build_render_jobs, "No project is currently open", "Error getting render jobs info"),
+            }
+            for section in handle_sections:
+                handle_name, builder, missing_message, error_prefix = builders[section]
+                section_started = time.perf_counter()
+                if handle_error:
+                    snapshot[section] = {"error": handle_error}
+                elif not handles.get(handle_name):
+                    snapshot[section] = {"error": missing_message}
+                else:
+                    try:
+                        snapshot[section] = builder(handles[handle_name])
+                    except Exception as e:
+                        logger.error(f"{error_prefix}: {str(e)}")
+                        snapshot[section] = {"error": f"{error_prefix}: {str(e)}"}
+                timings[section] = _elapsed_ms(section_started)
+        
+        timings["total"] = _elapsed_ms(started)
+        snapshot["timings"] = timings
+        return snapshot
 
 def get_resolve_connection():
     """Helper function to get a connection to DaVinci Resolve.
@@ -0,0 +1,381 @@
+import atexit
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+import zipfile
+from collections import OrderedDict
+
+from .timeline_index import get_timeline_fingerprint
+
+logger = logging.getLogger('DaVinciAPI.export_jobs')
+
+# Export formats offered by the API: Resolve export type constant, subtype constant (None to
+# call Export() without one) and file extension
+EXPORT_FORMATS = {
+    "aaf": ("EXPORT_AAF", "EXPORT_AAF_NEW", ".aaf"),
+    "drt": ("EXPORT_DRT", None, ".drt"),
+    "edl": ("EXPORT_EDL", "EXPORT_NONE", ".edl"),
+    "edl_cdl": ("EXPORT_EDL", "EXPORT_CDL", ".edl"),
+    "fcp7xml": ("EXPORT_FCP_7_XML", None, ".xml"),
+    "fcpxml": ("EXPORT_FCPXML_1_10", None, ".fcpxml"),
+    "otio": ("EXPORT_OTIO", None, ".otio"),
+    "csv": ("EXPORT_TEXT_CSV", None, ".csv"),
+    "tab": ("EXPORT_TEXT_TAB", None, ".txt"),
+    "ale": ("EXPORT_ALE", None, ".ale"),
+}
+
+# Maximum number of timeline x format exports in one job
+EXPORT_MAX_TASKS = 500
+
+# Exported files kept for reuse, the least recently used are deleted first
+EXPORT_CACHE_MAX_FILES = 1000
+
+# Finished export jobs kept for status queries and downloads, the oldest are dropped first
+EXPORT_JOB_HISTORY = 20
+
+def export_fingerprint(timeline):
+    """Modification fingerprint of a timeline for reusing its exports.
+
+    Resolve has no modification time, so the cheap structural fingerprint (unique ID, end
+    frame, track counts) is combined with the name and start timecode, which end up in
+    the exported files. Edits that change none of these are not detected; export with
+    force=True to bypass reuse.
+    """
+    signature = (get_timeline_fingerprint(timeline), timeline.GetName(), timeline.GetStartTimecode())
+    return hashlib.sha1(repr(signature).encode()).hexdigest()[:16]
+
+def _safe_filename(name):
+    return re.sub(r'[^A-Za-z0-9 _.-]', '_', name).strip() or "timeline"
+
+def _call(fn, *args):
+    return fn(*args)
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable file object collecting what zipfile writes, so the archive can be streamed."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+class ExportJob:
+    """Progress and outcome of one bulk export: one task per timeline and format."""
+
+    def __init__(self, timelines, formats, force):
+        self.id = uuid.uuid4().hex[:12]
+        self.timelines = list(timelines)
+        self.formats = list(formats)
+        self.force = force
+        self.state = "queued"
+        self.progress = {"done": 0, "total": None, "reused": 0, "failed": 0}
+        self.results = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+        self._changed = threading.Condition()
+
+    @property
+    def active(self):
+        return self.state in ("queued", "running")
+
+    def add_result(self, result):
+        with self._changed:
+            self.results.append(result)
+            self.progress["done"] += 1
+            if result.get("reused"):
+                self.progress["reused"] += 1
+            if result.get("error"):
+                self.progress["failed"] += 1
+            self._changed.notify_all()
+
+    def finish(self, state, error=None):
+        with self._changed:
+            self.state = state
+            self.error = error
+            self.finished_at = time.time()
+            self._changed.notify_all()
+        self.done.set()
+
+    def iter_results(self):
+        """Yield task results as they complete, blocking until the job has finished."""
+        position = 0
+        while True:
+            with self._changed:
+                while position >= len(self.results) and self.active:
+                    self._changed.wait(1.0)
+                pending = self.results[position:]
+                finished = not self.active
+            for result in pending:
+                yield result
+            position += len(pending)
+            if finished and position >= len(self.results):
+                return
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "timelines": self.timelines,
+            "formats": self.formats,
+            "force": self.force,
+            "state": self.state,
+            "progress": dict(self.progress),
+            "results": [{key: value for key, value in result.items() if key != "path"} for result in self.results],
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+class ExportJobManager:
+    """Exports timelines in bulk in the background and streams the files back as a zip.
+
+    Jobs run one at a time on a worker thread; every timeline x format export is its own
+    bridge job, so requests are answered between exports. Files are written to a
+    temporary directory that lives as long as the backend. An export whose timeline
+    still has the same export_fingerprint() is reused instead of exported again.
+    """
+
+    def __init__(self, bridge=None, max_files=EXPORT_CACHE_MAX_FILES):
+        """
+        Args:
+            bridge (BridgeWorker, optional): Runs the exports
+            max_files (int): Exported files kept for reuse
+        """
+        self.bridge = bridge
+        self.max_files = max_files
+        self._directory = None
+        self._files = OrderedDict()
+        # Open downloads per file path, and replaced or evicted files deleted once their last download ends
+        self._streaming = {}
+        self._retired = set()
+        self._jobs = OrderedDict()
+        self._queue = []
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="nicecompanion-exports-")
+            atexit.register(shutil.rmtree, self._directory, True)
+        return self._directory
+
+    def start(self, resolve_timelines, resolve_constants, timelines=None, formats=("edl",), force=False):
+        """Queue an export job.
+
+        Args:
+            resolve_timelines (callable): Returns (timelines, current_id) on the bridge, timelines
+                being (unique ID, name, handle) tuples of the current project
+            resolve_constants (callable): Returns the object holding the EXPORT_* constants
+            timelines (list, optional): Timeline unique IDs or names, defaults to the current timeline
+            formats (iterable): Keys of EXPORT_FORMATS
+            force (bool): Export again even if an unchanged export exists
+
+        Returns:
+            ExportJob: The queued job
+
+        Raises:
+            ValueError: If a format is unknown or the job has too many exports
+        """
+        formats = list(dict.fromkeys(formats or ()))
+        if not formats:
+            raise ValueError("No export formats given")
+        unknown = [export_format for export_format in formats if export_format not in EXPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown export formats: {', '.join(unknown)}; choose from {', '.join(EXPORT_FORMATS)}")
+        timelines = list(dict.fromkeys(timelines or ()))
+        if len(timelines) * len(formats) > EXPORT_MAX_TASKS:
+            raise ValueError(f"At most {EXPORT_MAX_TASKS} exports can be queued in one job")
+
+        job = ExportJob(timelines, formats, force)
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [job_id for job_id, known in self._jobs.items() if not known.active]
+            for job_id in finished[:max(0, len(finished) - EXPORT_JOB_HISTORY)]:
+                del self._jobs[job_id]
+            self._queue.append((job, resolve_timelines, resolve_constants))
+            self._wake.notify()
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="export-jobs", daemon=True)
+                self._thread.start()
+        return job
+
+    def get_job(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        return [job.to_dict() for job in reversed(list(self._jobs.values()))]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._wake.wait()
+                job, resolve_timelines, resolve_constants = self._queue.pop(0)
+            self._run_job(job, resolve_timelines, resolve_constants)
+
+    def _run_job(self, job, resolve_timelines, resolve_constants):
+        call = (lambda fn, *args: self.bridge.run(fn, args)) if self.bridge else _call
+        job.state = "running"
+        job.started_at = time.time()
+        try:
+            available, current_id = call(resolve_timelines)
+            by_key = {}
+            for timeline in available:
+                by_key.setdefault(timeline[0], timeline)
+                by_key.setdefault(timeline[1], timeline)
+            wanted = job.timelines or ([current_id] if current_id else [])
+            if not wanted:
+                raise LookupError("No timeline is currently open")
+            constants = call(resolve_constants)
+
+            job.progress["total"] = len(wanted) * len(job.formats)
+            for key in wanted:
+                timeline = by_key.get(key)
+                for export_format in job.formats:
+                    if timeline is None:
+                        job.add_result({"timeline": key, "format": export_format, "error": f"Unknown timeline: {key}"})
+                        continue
+                    try:
+                        result = call(self._export, timeline, export_format, constants, job.force)
+                    except Exception as e:
+                        logger.error(f"Error exporting {timeline[1]} as {export_format}: {str(e)}")
+                        result = {"timeline_id": timeline[0], "timeline": timeline[1], "format": export_format,
+                                  "error": str(e)}
+                    job.add_result(result)
+            job.finish("done")
+        except Exception as e:
+            logger.error(f"Error running export job: {str(e)}")
+            logger.error(traceback.format_exc())
+            job.finish("failed", str(e))
+        logger.info(f"Export job {job.id} {job.state}: {job.progress['done']} exports, "
+                    f"{job.progress['reused']} reused, {job.progress['failed']} failed")
+
+    def _export(self, timeline, export_format, constants, force):
+        """Export one timeline in one format on the bridge, reusing an unchanged earlier export."""
+        timeline_id, name, handle = timeline
+        export_type, export_subtype, extension = EXPORT_FORMATS[export_format]
+        fingerprint = export_fingerprint(handle)
+        result = {"timeline_id": timeline_id, "timeline": name, "format": export_format, "fingerprint": fingerprint,
+                  "filename": _safe_filename(name) + extension}
+
+        cache_key = (timeline_id, export_format)
+        with self._lock:
+            cached = self._files.get(cache_key)
+            if cached and cached["fingerprint"] == fingerprint and not force and os.path.exists(cached["path"]):
+                self._files.move_to_end(cache_key)
+                return dict(result, path=cached["path"], size=cached["size"], reused=True)
+
+        directory = os.path.join(self.directory, _safe_filename(timeline_id), fingerprint)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, result["filename"])
+        export_args = [path, getattr(constants, export_type)]
+        if export_subtype:
+            export_args.append(getattr(constants, export_subtype))
+        started = time.perf_counter()
+        if not handle.Export(*export_args) or not os.path.exists(path):
+            raise RuntimeError(f"Resolve could not export {name} as {export_format}")
+
+        size = os.path.getsize(path)
+        with self._lock:
+            previous = self._files.pop(cache_key, None)
+            if previous and previous["path"] != path:
+                self._remove(previous["path"])
+            # An earlier export to the same path may be waiting for a download to end before it is deleted
+            self._retired.discard(path)
+            self._files[cache_key] = {"fingerprint": fingerprint, "path": path, "size": size}
+            while len(self._files) > self.max_files:
+                _, evicted = self._files.popitem(last=False)
+                self._remove(evicted["path"])
+        return dict(result, path=path, size=size, reused=False, export_ms=round((time.perf_counter() - started) * 1000, 2))
+
+    def _remove(self, path):
+        """Delete a replaced or evicted file, or once its last download has ended; the caller holds the lock."""
+        if self._streaming.get(path):
+            self._retired.add(path)
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _acquire(self, path):
+        with self._lock:
+            self._streaming[path] = self._streaming.get(path, 0) + 1
+
+    def _release(self, path):
+        with self._lock:
+            self._streaming[path] -= 1
+            if self._streaming[path]:
+                return
+            del self._streaming[path]
+            if path in self._retired:
+                self._retired.discard(path)
+                self._remove(path)
+
+    def stream_zip(self, job):
+        """Yield a zip of the job's exported files, adding each file as soon as it is exported.
+
+        Failed exports are listed in an errors.txt entry at the end of the archive.
+        """
+        return (chunk for chunk in self._zip_chunks(job) if chunk)
+
+    def _zip_chunks(self, job):
+        sink = _ZipSink()
+        errors = []
+        names = set()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for result in job.iter_results():
+                if result.get("error"):
+                    errors.append(f"{result.get('timeline')} ({result['format']}): {result['error']}")
+                    continue
+                arcname = f"{result['format']}/{result['filename']}"
+                if arcname in names:
+                    arcname = f"{result['format']}/{result['timeline_id']}_{result['filename']}"
+                names.add(arcname)
+                self._acquire(result["path"])
+                try:
+                    with open(result["path"], "rb") as source, archive.open(arcname, "w") as entry:
+                        for block in iter(lambda: source.read(64 * 1024), b""):
+                            entry.write(block)
+                            yield sink.take()
+                except OSError as e:
+                    errors.append(f"{result['timeline']} ({result['format']}): {str(e)}")
+                finally:
+                    self._release(result["path"])
+                yield sink.take()
+            if errors or job.error:
+                archive.writestr("errors.txt", "\n".join(([job.error] if job.error else []) + errors) + "\n")
+        yield sink.take()
+
+    def get_stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            return {
+                "active": [job.id for job in jobs if job.active],
+                "jobs": len(jobs),
+                "directory": self._directory,
+                "cached_files": len(self._files),
+                "streaming_files": len(self._streaming)
+            }
@@ -0,0 +1,193 @@
+import bisect
+import contextvars
+import threading
+import time
+
+# Upper bounds in seconds of the bridge latency histogram buckets
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Plain values returned by the bridge that are passed through without wrapping
+_PLAIN_TYPES = (str, int, float, bool, bytes, dict)
+
+_route = contextvars.ContextVar('bridge_route', default=None)
+_request_calls = contextvars.ContextVar('bridge_request_calls', default=None)
+
+def set_route(route):
+    """Tag bridge calls made by the current thread with a route (e.g. the Flask URL rule)."""
+    _route.set(route)
+
+def begin_request(route):
+    """Tag bridge calls with a route and start counting the calls made for this request."""
+    _route.set(route)
+    # A mutable cell, so calls made on the bridge worker with a copy of this context still count
+    _request_calls.set([0])
+
+def request_bridge_calls():
+    """Bridge calls made since begin_request() in this context, None outside a request."""
+    calls = _request_calls.get()
+    return calls[0] if calls is not None else None
+
+def current_route():
+    """The route bridge calls are attributed to; background threads are tagged by thread name."""
+    return _route.get() or threading.current_thread().name
+
+class BridgeMetrics:
+    """Call counts and latency histograms per (bridge method, route)."""
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method, route, seconds, error=False):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        key = (method, route)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # count, sum, errors, per-bucket counts (last slot is +Inf)
+                series = self._series[key] = [0, 0.0, 0, [0] * (len(LATENCY_BUCKETS) + 1)]
+            series[0] += 1
+            series[1] += seconds
+            if error:
+                series[2] += 1
+            series[3][bucket] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def _copy(self):
+        with self._lock:
+            return {key: (count, total, errors, list(buckets)) for key, (count, total, errors, buckets) in self._series.items()}
+
+    def prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        series = self._copy()
+        lines = [
+            "# HELP resolve_bridge_call_duration_seconds Latency of DaVinci Resolve scripting bridge calls.",
+            "# TYPE resolve_bridge_call_duration_seconds histogram"
+        ]
+        for (method, route), (count, total, errors, buckets) in sorted(series.items()):
+            labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket_count
+                lines.append(f'resolve_bridge_call_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'resolve_bridge_call_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'resolve_bridge_call_duration_seconds_sum{{{labels}}} {total:.6f}')
+            lines.append(f'resolve_bridge_call_duration_seconds_count{{{labels}}} {count}')
+
+        lines.append("# HELP resolve_bridge_call_errors_total Bridge calls that raised an exception.")
+        lines.append("# TYPE resolve_bridge_call_errors_total counter")
+        for (method, route), (count, total, errors, buckets) in sorted(series.items()):
+            lines.append(f'resolve_bridge_call_errors_total{{method="{_escape(method)}",route="{_escape(route)}"}} {errors}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Per-method totals with mean and estimated p95 latency, and call counts per route.
+
+        Returns:
+            dict: method -> {count, errors, total_ms, mean_ms, p95_ms, routes}
+        """
+        methods = {}
+        for (method, route), (count, total, errors, buckets) in self._copy().items():
+            entry = methods.setdefault(method, {"count": 0, "errors": 0, "total": 0.0,
+                                                "buckets": [0] * (len(LATENCY_BUCKETS) + 1), "routes": {}})
+            entry["count"] += count
+            entry["errors"] += errors
+            entry["total"] += total
+            entry["buckets"] = [a + b for a, b in zip(entry["buckets"], buckets)]
+            entry["routes"][route] = entry["routes"].get(route, 0) + count
+
+        return {
+            method: {
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "total_ms": round(entry["total"] * 1000, 3),
+                "mean_ms": round(entry["total"] * 1000 / entry["count"], 3),
+                "p95_ms": _bucket_quantile(entry["buckets"], entry["count"], 0.95),
+                "routes": entry["routes"]
+            }
+            for method, entry in sorted(methods.items(), key=lambda item: -item[1]["total"])
+        }
+
+def _bucket_quantile(buckets, count, quantile):
+    """Upper bound in ms of the histogram bucket holding the given quantile."""
+    target = quantile * count
+    cumulative = 0
+    for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+        cumulative += bucket_count
+        if cumulative >= target:
+            return bound * 1000
+    return None
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _wrap(value, metrics):
+    if value is None or isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, list):
+        return [_wrap(item, metrics) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_wrap(item, metrics) for item in value)
+    return InstrumentedProxy(value, metrics)
+
+def _unwrap(value):
+    if isinstance(value, InstrumentedProxy):
+        return value._target
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    return value
+
+class InstrumentedProxy:
+    """Transparent wrapper around a Resolve scripting object that times every method call.
+
+    Objects returned by a call (Project, Timeline, lists of TimelineItems, ...) are wrapped
+    as well, so the whole object graph reached from the Resolve object is instrumented.
+    Proxies passed back into the bridge as arguments are unwrapped first.
+    """
+
+    __slots__ = ("_target", "_metrics")
+
+    def __init__(self, target, metrics):
+        self._target = target
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            # Constants such as resolve.EXPORT_EDL
+            return attribute
+        metrics = self._metrics
+
+        def call(*args, **kwargs):
+            if args:
+                args = [_unwrap(arg) for arg in args]
+            if kwargs:
+                kwargs = {key: _unwrap(value) for key, value in kwargs.items()}
+            started = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception:
+                metrics.observe(name, current_route(), time.perf_counter() - started, error=True)
+                raise
+            finally:
+                calls = _request_calls.get()
+                if calls is not None:
+                    calls[0] += 1
+            metrics.observe(name, current_route(), time.perf_counter() - started)
+            return _wrap(result, metrics)
+
+        return call
+
+    def __repr__(self):
+        return f"InstrumentedProxy({self._target!r})"
+
+def instrument(resolve, metrics):
+    """Wrap a Resolve object so every bridge call reached through it is recorded in metrics."""
+    if resolve is None or isinstance(resolve, InstrumentedProxy):
+        return resolve
+    return InstrumentedProxy(resolve, metrics)
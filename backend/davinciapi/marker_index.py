@@ -0,0 +1,135 @@
+import bisect
+import logging
+import time
+
+logger = logging.getLogger('DaVinciAPI.marker_index')
+
+# Where a marker was placed, in output order for markers on the same frame
+MARKER_SOURCES = ("timeline", "item", "clip")
+
+class MarkerIndex:
+    """Every marker of a timeline and of the items and clips on it, in timeline frames and timecode.
+
+    Markers are sorted by frame once; a range query is two bisects into the frame list.
+    Each color gets its own sorted bucket so color-filtered queries never look at
+    markers of other colors.
+    """
+
+    def __init__(self, timeline_id, revision, markers, build_ms):
+        self.timeline_id = timeline_id
+        self.revision = revision
+        self.markers = sorted(markers, key=lambda marker: (marker["frame"], MARKER_SOURCES.index(marker["source"])))
+        self.frames = [marker["frame"] for marker in self.markers]
+        self.by_color = {}
+        for marker in self.markers:
+            bucket = self.by_color.setdefault(marker["color"].lower(), ([], []))
+            bucket[0].append(marker["frame"])
+            bucket[1].append(marker)
+        self.build_ms = build_ms
+        self.built_at = time.time()
+        self.created = time.monotonic()
+
+    def select(self, start=None, end=None, color=None, name=None, source=None):
+        """Markers whose frame lies in [start, end], optionally filtered.
+
+        Args:
+            start, end (int, optional): Inclusive timeline frame range, open-ended if omitted
+            color (str, optional): Marker color, case-insensitive
+            name (str, optional): Case-insensitive substring of the marker name
+            source (str, optional): "timeline", "item" or "clip"
+
+        Returns:
+            list: Matching marker dicts sorted by frame
+        """
+        if color is not None:
+            frames, markers = self.by_color.get(color.lower(), ((), ()))
+        else:
+            frames, markers = self.frames, self.markers
+        lo = bisect.bisect_left(frames, start) if start is not None else 0
+        hi = bisect.bisect_right(frames, end) if end is not None else len(frames)
+        selected = markers[lo:hi]
+
+        if name is not None:
+            needle = name.lower()
+            selected = [marker for marker in selected if needle in marker["name"].lower()]
+        if source is not None:
+            selected = [marker for marker in selected if marker["source"] == source]
+        return list(selected)
+
+    def summary(self):
+        return {
+            "timeline_id": self.timeline_id,
+            "revision": self.revision,
+            "marker_count": len(self.markers),
+            "colors": {color: len(bucket[1]) for color, bucket in sorted(self.by_color.items())},
+            "build_ms": self.build_ms,
+            "built_at": self.built_at
+        }
+
+def _marker_entry(frame, marker, source, item=None, clip_id=None):
+    return {
+        "frame": frame,
+        "duration": marker.get("duration", 1),
+        "color": marker.get("color", ""),
+        "name": marker.get("name", ""),
+        "note": marker.get("note", ""),
+        "custom_data": marker.get("customData", ""),
+        "source": source,
+        "item_id": item["id"] if item else None,
+        "clip_id": clip_id,
+        "track_type": item["track_type"] if item else None,
+        "track": item["track"] if item else None
+    }
+
+def build_marker_index(timeline, timeline_index):
+    """Collect the markers of a timeline, its items and their media pool clips.
+
+    Timeline marker frames are offsets from the timeline start. Item and clip marker
+    frames are source frames of the clip, so they are moved onto the timeline with
+    start + frame - left offset; clip markers outside the used part of the clip are
+    skipped. GetLeftOffset() is only called for items that have markers to place, and
+    each media pool clip's markers are read once however many items use it.
+
+    Args:
+        timeline: Resolve Timeline handle
+        timeline_index (TimelineIndex): Current item index of the same timeline
+
+    Returns:
+        MarkerIndex: The built index, tagged with the timeline index revision
+    """
+    started = time.perf_counter()
+    start_frame = timeline.GetStartFrame()
+    markers = [
+        _marker_entry(start_frame + int(frame), marker, "timeline")
+        for frame, marker in (timeline.GetMarkers() or {}).items()
+    ]
+
+    clip_markers = {}
+    for item in timeline_index.items:
+        handle = timeline_index.handles[item["id"]]
+        item_markers = handle.GetMarkers() or {}
+
+        clip_id = item["media_pool_item_id"]
+        if clip_id and clip_id not in clip_markers:
+            clip = handle.GetMediaPoolItem()
+            clip_markers[clip_id] = (clip.GetMarkers() or {}) if clip else {}
+        used_clip_markers = clip_markers.get(clip_id) or {}
+        if not item_markers and not used_clip_markers:
+            continue
+
+        left_offset = handle.GetLeftOffset() or 0
+        for frame, marker in item_markers.items():
+            markers.append(_marker_entry(item["start"] + int(frame) - left_offset, marker, "item", item, clip_id))
+        for frame, marker in used_clip_markers.items():
+            frame = int(frame)
+            if left_offset <= frame < left_offset + item["duration"]:
+                markers.append(_marker_entry(item["start"] + frame - left_offset, marker, "clip", item, clip_id))
+
+    timecodes = timeline_index.frame_rate.to_timecodes([marker["frame"] for marker in markers])
+    for marker, timecode in zip(markers, timecodes):
+        marker["timecode"] = timecode
+
+    build_ms = round((time.perf_counter() - started) * 1000, 2)
+    index = MarkerIndex(timeline_index.timeline_id, timeline_index.revision, markers, build_ms)
+    logger.info(f"Indexed {len(index.markers)} markers of {len(timeline_index.items)} timeline items in {build_ms} ms")
+    return index
@@ -0,0 +1,267 @@
+import logging
+import threading
+import time
+import traceback
+
+logger = logging.getLogger('DaVinciAPI.mediapool_crawler')
+
+# Seconds an inventory is served before a background re-crawl is started
+MEDIA_POOL_INVENTORY_MAX_AGE = 30.0
+
+class MediaPoolInventory:
+    """Immutable result of one media pool crawl.
+
+    folders maps folder ID to {id, name, path, parent_id, subfolder_ids, clip_ids} and
+    clips maps clip ID to {id, name, folder_id, properties}. The MediaPoolItem handles
+    are kept apart from the serializable dicts.
+    """
+
+    def __init__(self, project_id, root_id, folders, clips, handles, stats, source="resolve"):
+        self.project_id = project_id
+        self.root_id = root_id
+        self.folders = folders
+        self.clips = clips
+        self.handles = handles
+        self.stats = stats
+        # "store" for an inventory loaded from the metadata store, which has no clip handles
+        self.source = source
+        self.crawled_at = time.time()
+        self.created = time.monotonic()
+
+    def to_record(self):
+        """Serializable form for the metadata store (the clip handles are left out)."""
+        return {
+            "project_id": self.project_id,
+            "root_id": self.root_id,
+            "folders": self.folders,
+            "clips": self.clips,
+            "stats": self.stats,
+            "crawled_at": self.crawled_at
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild an inventory written by to_record(), without handles."""
+        inventory = cls(record["project_id"], record["root_id"], record["folders"], record["clips"], {},
+                        record["stats"], source="store")
+        inventory.crawled_at = record["crawled_at"]
+        return inventory
+
+    def same_contents(self, other):
+        """Whether other has the same folders and clips, so storing this one would rewrite an identical record."""
+        return (other is not None and other.project_id == self.project_id and other.root_id == self.root_id
+                and other.folders == self.folders and other.clips == self.clips)
+
+    def tree(self, folder_id=None):
+        """Nested folder tree with clip counts, starting at the root or folder_id."""
+        folder = self.folders.get(folder_id or self.root_id)
+        if not folder:
+            return None
+        return {
+            "id": folder["id"],
+            "name": folder["name"],
+            "path": folder["path"],
+            "clip_count": len(folder["clip_ids"]),
+            "folders": [self.tree(subfolder_id) for subfolder_id in folder["subfolder_ids"]]
+        }
+
+    def clip_ids(self, folder_id=None, recursive=False):
+        """IDs of the clips in a folder (optionally with its subfolders), or of every clip."""
+        if folder_id is None:
+            return list(self.clips)
+        folder = self.folders.get(folder_id)
+        if not folder:
+            return []
+        clip_ids = list(folder["clip_ids"])
+        if recursive:
+            for subfolder_id in folder["subfolder_ids"]:
+                clip_ids.extend(self.clip_ids(subfolder_id, recursive=True))
+        return clip_ids
+
+def _call(fn, *args):
+    return fn(*args)
+
+def crawl_media_pool(media_pool, project_id, previous=None, call=None, stale_clip_ids=None):
+    """Walk the media pool and build a new inventory.
+
+    Every folder's clip list is read and reduced to a set of clip IDs. When that set
+    matches the folder's set in the previous inventory, the previously read clip
+    properties are reused; properties are only read again for folders whose
+    membership changed. Pass previous=None to re-read everything.
+
+    Args:
+        media_pool: Resolve MediaPool handle
+        project_id (str): Unique ID of the project the media pool belongs to
+        previous (MediaPoolInventory, optional): Last inventory of the same project
+        call (callable, optional): call(fn, *args) runs one folder's worth of Resolve calls,
+            e.g. as a bridge job so other work can interleave with a long crawl
+        stale_clip_ids (set, optional): Clips whose properties are read again even in unchanged folders
+
+    Returns:
+        MediaPoolInventory: The new inventory
+    """
+    if previous and previous.project_id != project_id:
+        previous = None
+    if call is None:
+        call = _call
+    stale_clip_ids = stale_clip_ids or ()
+
+    stats = {"folders": 0, "changed_folders": 0, "clips": 0, "property_reads": 0}
+    started = time.perf_counter()
+    folders = {}
+    clips = {}
+    handles = {}
+
+    def read_folder(folder, folder_id, parent_id, parent_path):
+        name = folder.GetName()
+        path = f"{parent_path}/{name}"
+
+        folder_clips = folder.GetClipList() or []
+        clip_ids = [clip.GetUniqueId() for clip in folder_clips]
+        previous_folder = previous.folders.get(folder_id) if previous else None
+        unchanged = previous_folder is not None and set(previous_folder["clip_ids"]) == set(clip_ids)
+        if not unchanged:
+            stats["changed_folders"] += 1
+
+        for clip_id, clip in zip(clip_ids, folder_clips):
+            known = previous.clips.get(clip_id) if previous else None
+            if known and unchanged and clip_id not in stale_clip_ids:
+                clips[clip_id] = known
+            else:
+                # Without a key GetClipProperty returns every property in one bridge call
+                properties = clip.GetClipProperty() or {}
+                stats["property_reads"] += 1
+                clips[clip_id] = {
+                    "id": clip_id,
+                    "name": properties.get("Clip Name") or clip.GetName(),
+                    "folder_id": folder_id,
+                    "properties": properties
+                }
+            handles[clip_id] = clip
+
+        subfolders = folder.GetSubFolderList() or []
+        subfolder_ids = [subfolder.GetUniqueId() for subfolder in subfolders]
+        folders[folder_id] = {
+            "id": folder_id,
+            "name": name,
+            "path": path,
+            "parent_id": parent_id,
+            "subfolder_ids": subfolder_ids,
+            "clip_ids": clip_ids
+        }
+        # Reversed so folders are visited in media pool order
+        for subfolder, subfolder_id in reversed(list(zip(subfolders, subfolder_ids))):
+            pending.append((subfolder, subfolder_id, folder_id, path))
+
+    root = call(media_pool.GetRootFolder)
+    root_id = call(root.GetUniqueId)
+    pending = [(root, root_id, None, "")]
+    while pending:
+        call(read_folder, *pending.pop())
+
+    stats["folders"] = len(folders)
+    stats["clips"] = len(clips)
+    stats["crawl_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(f"Crawled media pool: {stats['folders']} folders, {stats['clips']} clips, "
+                f"{stats['changed_folders']} changed folders, {stats['property_reads']} property reads in {stats['crawl_ms']} ms")
+    return MediaPoolInventory(project_id, root_id, folders, clips, handles, stats)
+
+class MediaPoolCrawler:
+    """Keeps a media pool inventory fresh by re-crawling it in the background.
+
+    Requests are always answered from the last complete inventory; a crawl builds a
+    new inventory on the side and swaps it in when done, so readers never see a
+    half-finished walk.
+    """
+
+    def __init__(self, max_age=MEDIA_POOL_INVENTORY_MAX_AGE, bridge=None, on_crawled=None):
+        """
+        Args:
+            max_age (float): Seconds before an inventory is considered stale
+            bridge (BridgeWorker, optional): Runs the crawl's Resolve calls, one job per folder
+            on_crawled (callable, optional): Receives every newly crawled inventory whose contents changed
+        """
+        self.max_age = max_age
+        self.bridge = bridge
+        self.on_crawled = on_crawled
+        self.inventory = None
+        self.last_error = None
+        self._stale_clip_ids = set()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def crawling(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def reset(self):
+        """Forget the inventory, e.g. after reconnecting to Resolve."""
+        self.inventory = None
+
+    def mark_stale(self, clip_ids):
+        """Have the next crawl read these clips' properties again, e.g. after they were written."""
+        with self._lock:
+            self._stale_clip_ids.update(clip_ids)
+
+    def warm_start(self, inventory):
+        """Serve a stored inventory until the next crawl replaces it.
+
+        The inventory counts as stale right away, so the next ensure_fresh() starts the crawl
+        that reconciles it with Resolve. The crawl reuses its clip properties for every folder
+        whose clips did not change.
+        """
+        with self._lock:
+            if self.inventory is not None:
+                return
+            inventory.created = time.monotonic() - self.max_age
+            self.inventory = inventory
+
+    def ensure_fresh(self, resolve_handles, refresh=False, full=False, wait=False):
+        """Start a background crawl if the inventory is missing or older than max_age.
+
+        Args:
+            resolve_handles (callable): Returns (media_pool, project_id) for the current project
+            refresh (bool): Crawl even if the inventory is still fresh
+            full (bool): Re-read the properties of every clip, not only of changed folders
+            wait (bool): Block until the crawl has finished
+        """
+        with self._lock:
+            inventory = self.inventory
+            stale = inventory is None or refresh or full or time.monotonic() - inventory.created >= self.max_age
+            if stale and not self.crawling:
+                self._thread = threading.Thread(target=self._crawl, args=(resolve_handles, full),
+                                                name="media-pool-crawler", daemon=True)
+                self._thread.start()
+            thread = self._thread
+        if wait and thread:
+            thread.join()
+
+    def _crawl(self, resolve_handles, full):
+        with self._lock:
+            stale_clip_ids, self._stale_clip_ids = self._stale_clip_ids, set()
+        try:
+            media_pool, project_id = resolve_handles()
+            call = (lambda fn, *args: self.bridge.run(fn, args)) if self.bridge else None
+            previous = self.inventory
+            self.inventory = crawl_media_pool(media_pool, project_id, None if full else previous, call=call,
+                                              stale_clip_ids=stale_clip_ids)
+            self.last_error = None
+            # Unchanged folders reuse the previous clip dicts, so comparing is cheap next to serializing
+            if self.on_crawled and not self.inventory.same_contents(previous):
+                self.on_crawled(self.inventory)
+        except Exception as e:
+            logger.error(f"Error crawling media pool: {str(e)}")
+            logger.error(traceback.format_exc())
+            self.last_error = str(e)
+            with self._lock:
+                self._stale_clip_ids.update(stale_clip_ids)
+
+    def get_state(self):
+        inventory = self.inventory
+        return {
+            "crawling": self.crawling,
+            "crawled_at": inventory.crawled_at if inventory else None,
+            "source": inventory.source if inventory else None,
+            "last_crawl": inventory.stats if inventory else None,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,274 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from .paths import get_data_dir
+
+logger = logging.getLogger('DaVinciAPI.metadata_store')
+
+# Bumped whenever the table layout or the shape of a stored record changes; a store written
+# with another version is emptied on open, since everything in it can be crawled again
+METADATA_SCHEMA_VERSION = 2
+
+# Default file name of the store inside the data directory
+METADATA_STORE_FILE = "metadata.sqlite3"
+
+# Compressed bytes kept on disk before the least recently used records are evicted
+METADATA_STORE_MAX_BYTES = 256 * 1024 * 1024
+
+# Eviction stops once the store is down to this fraction of max_bytes, so it does not run on every flush
+METADATA_STORE_LOW_WATERMARK = 0.8
+
+# Seconds the writer thread collects records before committing them in one transaction
+METADATA_STORE_FLUSH_INTERVAL = 1.0
+
+class MetadataStore:
+    """SQLite-backed store of crawled Resolve metadata that survives backend restarts.
+
+    Records are JSON documents keyed by (project ID, kind, object unique ID), e.g. the
+    media pool inventory of a project or the item index of a timeline. Reads go to the
+    database (or to a write still waiting in memory); writes are handed to a writer
+    thread that serializes, compresses and commits them in batches, so the bridge never
+    waits on disk I/O. Records are evicted least recently used first once their total
+    compressed size exceeds max_bytes.
+    """
+
+    def __init__(self, path=None, max_bytes=METADATA_STORE_MAX_BYTES, flush_interval=METADATA_STORE_FLUSH_INTERVAL):
+        """
+        Args:
+            path (str, optional): SQLite file, defaults to METADATA_STORE_FILE in the data directory
+            max_bytes (int): Compressed size of all records before the oldest are evicted
+            flush_interval (float): Seconds between commits of the writer thread
+        """
+        self.path = path or os.path.join(get_data_dir(), METADATA_STORE_FILE)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._touched = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "flushes": 0, "evictions": 0, "errors": 0}
+        self._db = self._open()
+
+    def _open(self):
+        try:
+            return self._connect()
+        except sqlite3.DatabaseError as e:
+            # Only a cache: a damaged file is moved aside and the store starts empty
+            logger.warning(f"Metadata store {self.path} is unreadable, starting a new one: {str(e)}")
+        try:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.path + suffix):
+                    os.replace(self.path + suffix, f"{self.path}{suffix}.corrupt")
+            return self._connect()
+        except (OSError, sqlite3.DatabaseError) as e:
+            # E.g. another process still has the file open; keep this run's records in memory instead
+            logger.warning(f"Could not replace metadata store {self.path}, keeping it in memory: {str(e)}")
+            self.path = ":memory:"
+            return self._connect()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        try:
+            self._prepare(db)
+        except sqlite3.Error:
+            db.close()
+            raise
+        return db
+
+    def _prepare(self, db):
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version != METADATA_SCHEMA_VERSION:
+            if version:
+                logger.info(f"Metadata store schema changed ({version} -> {METADATA_SCHEMA_VERSION}), clearing it")
+            db.execute("DROP TABLE IF EXISTS records")
+            db.execute("""
+                CREATE TABLE records (
+                    project_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    object_id TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (project_id, kind, object_id)
+                )
+            """)
+            db.execute("CREATE INDEX records_accessed_at ON records (accessed_at)")
+            db.execute(f"PRAGMA user_version = {METADATA_SCHEMA_VERSION}")
+
+    def get(self, project_id, kind, object_id=None):
+        """Read a record, the most recently written one of the kind if object_id is omitted.
+
+        Returns:
+            dict or None: The stored record, None if there is none
+        """
+        with self._lock:
+            for (pending_project, pending_kind, pending_object), record in reversed(list(self._pending.items())):
+                if pending_project == project_id and pending_kind == kind and object_id in (None, pending_object):
+                    self._stats["hits"] += 1
+                    return record
+
+        query = "SELECT object_id, payload FROM records WHERE project_id = ? AND kind = ?"
+        params = [project_id, kind]
+        if object_id is not None:
+            query += " AND object_id = ?"
+            params.append(object_id)
+        query += " ORDER BY updated_at DESC LIMIT 1"
+        try:
+            with self._db_lock:
+                row = self._db.execute(query, params).fetchone()
+            record = json.loads(zlib.decompress(row[1])) if row else None
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning(f"Could not read {kind} of {project_id} from the metadata store: {str(e)}")
+            self._stats["errors"] += 1
+            record = None
+
+        with self._lock:
+            if record is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._touched[(project_id, kind, row[0])] = time.time()
+        self._ensure_writer()
+        return record
+
+    def get_all(self, kind):
+        """Every record of a kind across projects, written or pending; access times are not updated."""
+        with self._lock:
+            pending = {key: record for key, record in self._pending.items() if key[1] == kind}
+        try:
+            with self._db_lock:
+                rows = self._db.execute("SELECT project_id, object_id, payload FROM records WHERE kind = ?",
+                                        (kind,)).fetchall()
+            records = {(project_id, kind, object_id): json.loads(zlib.decompress(payload))
+                       for project_id, object_id, payload in rows}
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning(f"Could not read {kind} records from the metadata store: {str(e)}")
+            with self._lock:
+                self._stats["errors"] += 1
+            records = {}
+        records.update(pending)
+        return list(records.values())
+
+    def put(self, project_id, kind, object_id, record):
+        """Queue a record for writing; a later put of the same key replaces it before it is written.
+
+        The record is serialized on the writer thread, so it must not be mutated afterwards.
+        """
+        with self._lock:
+            key = (project_id, kind, object_id)
+            # Re-inserted so the newest write of a kind is found first by get()
+            self._pending.pop(key, None)
+            self._pending[key] = record
+        self._ensure_writer()
+
+    def delete_project(self, project_id):
+        """Drop every record of a project, written or pending."""
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == project_id]:
+                del self._pending[key]
+        with self._db_lock:
+            self._db.execute("DELETE FROM records WHERE project_id = ?", (project_id,))
+
+    def _ensure_writer(self):
+        if self._closed or (self._thread and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._closed or (self._thread and self._thread.is_alive()):
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metadata-store-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write every pending record and access time now, then evict if the store is too large."""
+        with self._lock:
+            if self._closed:
+                return
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+        if not pending and not touched:
+            return
+
+        now = time.time()
+        rows = []
+        for (project_id, kind, object_id), record in pending.items():
+            payload = zlib.compress(json.dumps(record, separators=(',', ':')).encode(), 1)
+            rows.append((project_id, kind, object_id, payload, len(payload), now, now))
+        try:
+            with self._db_lock:
+                self._db.execute("BEGIN")
+                self._db.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._db.executemany(
+                    "UPDATE records SET accessed_at = ? WHERE project_id = ? AND kind = ? AND object_id = ?",
+                    [(accessed_at, *key) for key, accessed_at in touched.items()]
+                )
+                self._db.execute("COMMIT")
+                evicted = self._evict()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing {len(rows)} records to the metadata store, retrying with the next flush: {str(e)}")
+            with self._db_lock:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+            with self._lock:
+                # Puts made since take precedence over the records put back
+                self._pending = {**pending, **self._pending}
+                self._touched = {**touched, **self._touched}
+                self._stats["errors"] += 1
+            return
+        self._stats["writes"] += len(rows)
+        self._stats["flushes"] += 1
+        self._stats["evictions"] += evicted
+
+    def _evict(self):
+        """Delete least recently used records until the store is under the low watermark."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM records").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        target = self.max_bytes * METADATA_STORE_LOW_WATERMARK
+        victims = []
+        for project_id, kind, object_id, size in self._db.execute(
+                "SELECT project_id, kind, object_id, size FROM records ORDER BY accessed_at"):
+            if total <= target:
+                break
+            victims.append((project_id, kind, object_id))
+            total -= size
+        self._db.executemany("DELETE FROM records WHERE project_id = ? AND kind = ? AND object_id = ?", victims)
+        logger.info(f"Evicted {len(victims)} records from the metadata store")
+        return len(victims)
+
+    def close(self):
+        """Write what is pending, stop the writer thread and close the database."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+        with self._lock:
+            self._closed = True
+        with self._db_lock:
+            self._db.close()
+
+    def get_stats(self):
+        with self._db_lock:
+            count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM records").fetchone()
+        with self._lock:
+            return dict(self._stats, path=self.path, schema_version=METADATA_SCHEMA_VERSION, records=count,
+                        bytes=size, max_bytes=self.max_bytes, pending=len(self._pending))
@@ -0,0 +1,20 @@
+import os
+
+# Environment variable that moves everything the backend stores on disk (scan results, caches)
+DATA_DIR_ENV = "NICE_COMPANION_DATA_DIR"
+
+# Where the backend stores its files unless DATA_DIR_ENV is set
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".nicecompanion")
+
+def get_data_dir(*parts):
+    """Directory under the backend's data directory, created if it does not exist yet.
+
+    Args:
+        *parts (str): Path components below the data directory, e.g. "scans"
+
+    Returns:
+        str: Absolute path of the directory
+    """
+    path = os.path.join(os.environ.get(DATA_DIR_ENV) or DEFAULT_DATA_DIR, *parts)
+    os.makedirs(path, exist_ok=True)
+    return os.path.abspath(path)
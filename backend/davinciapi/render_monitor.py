@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+import traceback
+
+from .timecode import FrameRate
+
+logger = logging.getLogger('DaVinciAPI.render_monitor')
+
+# Job states that never change again unless the job is re-rendered
+TERMINAL_STATUSES = ("Complete", "Failed", "Cancelled")
+
+# Seconds between polls while Resolve is rendering
+ACTIVE_POLL_INTERVAL = 0.5
+
+# Idle polling starts at the first value and doubles up to the second while nothing renders
+IDLE_POLL_INTERVAL = 2.0
+MAX_IDLE_POLL_INTERVAL = 30.0
+
+# Polls closer together than this are answered from the previous result
+MIN_POLL_SPACING = 0.25
+
+# Weight of the newest sample in the smoothed frames/sec
+THROUGHPUT_SMOOTHING = 0.3
+
+class RenderMonitor:
+    """Tracks the render queue while polling Resolve as little as possible.
+
+    Jobs in a terminal state are cached and not asked for their status again until
+    rendering starts anew. Active jobs get progress, ETA and frames/sec derived from
+    successive samples. A background thread polls fast while IsRenderingInProgress()
+    is true and backs off exponentially while the queue is idle.
+    """
+
+    def __init__(self, on_update=None, bridge=None):
+        """
+        Args:
+            on_update (callable, optional): Called with a list of changed job dicts and the
+                rendering flag whenever a poll finds changes
+            bridge (BridgeWorker, optional): Runs the background thread's polls
+        """
+        self.on_update = on_update
+        self.bridge = bridge
+        self.interval = IDLE_POLL_INTERVAL
+        self.status_polls = 0
+        self._project_id = None
+        self._jobs = {}
+        self._rendering = False
+        self._polled_at = 0.0
+        self._result = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def reset(self):
+        with self._lock:
+            self._project_id = None
+            self._jobs = {}
+            self._result = None
+            self._polled_at = 0.0
+
+    def get_last_result(self):
+        """Result of the last poll, None before the first one; does not wait for a running poll."""
+        return self._result
+
+    def poll(self, project, project_id):
+        """Refresh the render queue of a project.
+
+        Args:
+            project: Resolve Project handle
+            project_id (str): The project's unique ID, a different one drops all cached jobs
+
+        Returns:
+            dict: job_count, jobs (id, name, status, progress, eta_seconds, fps, mark in/out frames
+                and timecode, ...) and rendering
+        """
+        with self._lock:
+            now = time.monotonic()
+            if project_id == self._project_id and self._result and now - self._polled_at < MIN_POLL_SPACING:
+                return self._result
+            if project_id != self._project_id:
+                self._project_id = project_id
+                self._jobs = {}
+
+            rendering = bool(project.IsRenderingInProgress())
+            if rendering and not self._rendering:
+                # A finished job may be rendered again, so nothing stays cached across a render start
+                for job in self._jobs.values():
+                    job["terminal"] = False
+            self._rendering = rendering
+
+            listed_jobs = project.GetRenderJobList() or []
+            new_jobs = [self._new_job(listed) for listed in listed_jobs if listed['JobId'] not in self._jobs]
+            if new_jobs:
+                # The frame rate is only read when jobs were added
+                self._label_marks(new_jobs, FrameRate.from_project(project))
+                self._jobs.update((job["id"], job) for job in new_jobs)
+
+            changed = []
+            order = []
+            for listed in listed_jobs:
+                job_id = listed['JobId']
+                order.append(job_id)
+                job = self._jobs[job_id]
+                if job["terminal"]:
+                    continue
+                status = project.GetRenderJobStatus(job_id) or {}
+                self.status_polls += 1
+                if self._update_job(job, status, now):
+                    changed.append(self._public(job))
+
+            removed = set(self._jobs) - set(order)
+            for job_id in removed:
+                del self._jobs[job_id]
+            self._polled_at = now
+            self._result = {
+                "job_count": len(order),
+                "jobs": [self._public(self._jobs[job_id]) for job_id in order],
+                "rendering": rendering
+            }
+            result = self._result
+
+        if (changed or removed) and self.on_update:
+            self.on_update(changed, rendering)
+        return result
+
+    def _new_job(self, listed):
+        mark_in, mark_out = listed.get('MarkIn'), listed.get('MarkOut')
+        frames = mark_out - mark_in + 1 if isinstance(mark_in, int) and isinstance(mark_out, int) else None
+        return {
+            "id": listed['JobId'],
+            "name": listed.get('TimelineName', 'Unknown'),
+            "target": listed.get('OutputFilename') or listed.get('TargetDir'),
+            "mark_in": mark_in,
+            "mark_out": mark_out,
+            "mark_in_timecode": None,
+            "mark_out_timecode": None,
+            "frames": frames,
+            "status": "Unknown",
+            "progress": 0,
+            "eta_seconds": None,
+            "fps": None,
+            "terminal": False,
+            "sampled_at": None
+        }
+
+    @staticmethod
+    def _label_marks(jobs, frame_rate):
+        """Add the timecode of the mark in and out of new jobs, converted in one batch."""
+        marked = [job for job in jobs if job["frames"] is not None]
+        timecodes = frame_rate.to_timecodes([job["mark_in"] for job in marked] + [job["mark_out"] for job in marked])
+        for job, mark_in, mark_out in zip(marked, timecodes, timecodes[len(marked):]):
+            job["mark_in_timecode"] = mark_in
+            job["mark_out_timecode"] = mark_out
+
+    def _update_job(self, job, status, now):
+        """Apply a GetRenderJobStatus() result, returns True if anything visible changed."""
+        before = (job["status"], job["progress"], job["eta_seconds"], job["fps"])
+        job_status = status.get('JobStatus', 'Unknown')
+        progress = status.get('CompletionPercentage', 0) or 0
+
+        if job_status == "Rendering" and job["frames"] and job["sampled_at"] is not None and progress >= job["progress"]:
+            elapsed = now - job["sampled_at"]
+            if elapsed > 0:
+                frames_done = (progress - job["progress"]) / 100.0 * job["frames"]
+                sample_fps = frames_done / elapsed
+                job["fps"] = round(sample_fps if job["fps"] is None else
+                                   THROUGHPUT_SMOOTHING * sample_fps + (1 - THROUGHPUT_SMOOTHING) * job["fps"], 2)
+        elif job_status != "Rendering":
+            job["fps"] = None
+
+        remaining_ms = status.get('EstimatedTimeRemainingInMs')
+        if job_status != "Rendering":
+            job["eta_seconds"] = None
+        elif remaining_ms is not None:
+            job["eta_seconds"] = round(remaining_ms / 1000.0, 1)
+        elif job["fps"] and job["frames"]:
+            job["eta_seconds"] = round((100 - progress) / 100.0 * job["frames"] / job["fps"], 1)
+
+        job["status"] = job_status
+        job["progress"] = progress
+        job["sampled_at"] = now
+        job["terminal"] = job_status in TERMINAL_STATUSES
+        return before != (job["status"], job["progress"], job["eta_seconds"], job["fps"])
+
+    @staticmethod
+    def _public(job):
+        return {key: value for key, value in job.items() if key not in ("terminal", "sampled_at")}
+
+    def start(self, resolve_project, should_poll=None):
+        """Start the adaptive background poller if it is not running.
+
+        Args:
+            resolve_project (callable): Returns (project, project_id) or (None, None)
+            should_poll (callable, optional): Returns False while nobody needs updates
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(resolve_project, should_poll),
+                                        name="render-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Poll again right away, e.g. after a client subscribed."""
+        self._wake.set()
+
+    def _run(self, resolve_project, should_poll):
+        while not self._stop.is_set():
+            if should_poll is None or should_poll():
+                try:
+                    project, project_id = resolve_project()
+                    if project:
+                        if self.bridge:
+                            result = self.bridge.run(self.poll, (project, project_id))
+                        else:
+                            result = self.poll(project, project_id)
+                        active = result["rendering"] or any(job["status"] == "Rendering" for job in result["jobs"])
+                        if active:
+                            self.interval = ACTIVE_POLL_INTERVAL
+                        else:
+                            self.interval = min(MAX_IDLE_POLL_INTERVAL, max(IDLE_POLL_INTERVAL, self.interval * 2))
+                except Exception as e:
+                    logger.error(f"Error polling render jobs: {str(e)}")
+                    logger.error(traceback.format_exc())
+                    self.interval = MAX_IDLE_POLL_INTERVAL
+
+            self._wake.wait(self.interval)
+            if self._wake.is_set():
+                self._wake.clear()
+                self.interval = IDLE_POLL_INTERVAL
+
+    def get_stats(self):
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval": self.interval,
+            "rendering": self._rendering,
+            "cached_terminal_jobs": sum(1 for job in self._jobs.values() if job["terminal"]),
+            "status_polls": self.status_polls
+        }
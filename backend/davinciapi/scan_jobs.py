@@ -0,0 +1,302 @@
+import logging
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+
+from .timecode import FrameRate
+from .timeline_index import TRACK_TYPES
+
+logger = logging.getLogger('DaVinciAPI.scan_jobs')
+
+# Finished scan jobs kept for status queries, the oldest are dropped first
+SCAN_JOB_HISTORY = 20
+
+def summarize_timeline(timeline, index):
+    """Name, frame range, duration and per-type track and item counts of one timeline.
+
+    Item lists are only counted; no call is made on the items themselves.
+
+    Args:
+        timeline: Resolve Timeline handle
+        index (int): 1-based position of the timeline in its project
+
+    Returns:
+        dict: The timeline summary
+    """
+    start_frame = timeline.GetStartFrame()
+    end_frame = timeline.GetEndFrame()
+    start_timecode = timeline.GetStartTimecode()
+    frame_rate = timeline.GetSetting("timelineFrameRate")
+    # Drop-frame timelines write a ';' before the frames
+    drop_frame = ";" in (start_timecode or "")
+    track_counts = {}
+    item_counts = {}
+    for track_type in TRACK_TYPES:
+        track_count = timeline.GetTrackCount(track_type) or 0
+        track_counts[track_type] = track_count
+        item_counts[track_type] = sum(
+            len(timeline.GetItemListInTrack(track_type, track) or []) for track in range(1, track_count + 1)
+        )
+    return {
+        "index": index,
+        "id": timeline.GetUniqueId(),
+        "name": timeline.GetName(),
+        "frame_rate": frame_rate,
+        "drop_frame": drop_frame,
+        "start_frame": start_frame,
+        "end_frame": end_frame,
+        "duration_frames": end_frame - start_frame,
+        "start_timecode": start_timecode,
+        "end_timecode": FrameRate.from_setting(frame_rate, drop_frame).to_timecode(end_frame),
+        "track_counts": track_counts,
+        "item_counts": item_counts,
+        "total_items": sum(item_counts.values())
+    }
+
+def _call(fn, *args):
+    return fn(*args)
+
+def _project_header(project):
+    return project.GetUniqueId(), project.GetName(), project.GetTimelineCount() or 0
+
+def _summarize_timeline_at(project, index):
+    timeline = project.GetTimelineByIndex(index)
+    if not timeline:
+        return None
+    return summarize_timeline(timeline, index)
+
+def _totals(summary):
+    """A summary without its per-timeline entries."""
+    return {key: value for key, value in summary.items() if key != "timelines"}
+
+class ScanJob:
+    """Progress and outcome of one timeline summary scan."""
+
+    def __init__(self, all_projects):
+        self.id = uuid.uuid4().hex[:12]
+        self.all_projects = all_projects
+        self.state = "queued"
+        self.progress = {"projects_done": 0, "projects_total": None, "timelines_done": 0, "timelines_total": 0}
+        self.current = None
+        self.project_ids = []
+        self.errors = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    @property
+    def active(self):
+        return self.state in ("queued", "running")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "all_projects": self.all_projects,
+            "state": self.state,
+            "progress": dict(self.progress),
+            "current": self.current,
+            "project_ids": list(self.project_ids),
+            "errors": list(self.errors),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+class ScanJobManager:
+    """Runs timeline summary scans in the background and stores their results on disk.
+
+    Scans run one at a time on a worker thread. Each timeline is summarized by its own
+    bridge job, so requests keep being answered between timelines of a long scan. An
+    all-projects scan saves the current project, loads every project of the current
+    ProjectManager folder in turn and loads the original project again at the end.
+    Every scanned project's summary is kept in the metadata store, if given, and served
+    from there until the next scan of that project.
+    """
+
+    def __init__(self, bridge=None, store=None):
+        """
+        Args:
+            bridge (BridgeWorker, optional): Runs the scan's Resolve calls, one job per timeline
+            store (MetadataStore, optional): Persists the summaries across restarts
+        """
+        self.bridge = bridge
+        self.store = store
+        self._jobs = OrderedDict()
+        self._summaries = {}
+        # Project totals by project ID, read from the store once on the first listing
+        self._listing = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self, resolve_project_manager, all_projects=False, on_project_switch=None):
+        """Queue a scan, or return the queued or running scan of the same scope.
+
+        Args:
+            resolve_project_manager (callable): Returns the ProjectManager handle
+            all_projects (bool): Scan every project of the current folder, not only the current one
+            on_project_switch (callable, optional): Called after the scan loaded another project
+
+        Returns:
+            ScanJob: The queued (or already active) job
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.active and job.all_projects == all_projects:
+                    return job
+            job = ScanJob(all_projects)
+            self._jobs[job.id] = job
+            finished = [job_id for job_id, known in self._jobs.items() if not known.active]
+            for job_id in finished[:max(0, len(finished) - SCAN_JOB_HISTORY)]:
+                del self._jobs[job_id]
+
+            self._queue.put((job, resolve_project_manager, on_project_switch))
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="scan-jobs", daemon=True)
+                self._thread.start()
+        return job
+
+    def get_job(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        return [job.to_dict() for job in reversed(list(self._jobs.values()))]
+
+    def _run(self):
+        while True:
+            job, resolve_project_manager, on_project_switch = self._queue.get()
+            try:
+                self._run_job(job, resolve_project_manager, on_project_switch)
+            finally:
+                job.done.set()
+
+    def _run_job(self, job, resolve_project_manager, on_project_switch):
+        call = (lambda fn, *args: self.bridge.run(fn, args)) if self.bridge else _call
+        job.state = "running"
+        job.started_at = time.time()
+        try:
+            project_manager = call(resolve_project_manager)
+            original = call(project_manager.GetCurrentProject)
+            original_name = call(original.GetName) if original else None
+            if job.all_projects:
+                names = call(project_manager.GetProjectListInCurrentFolder) or []
+                if original:
+                    # LoadProject() drops unsaved changes of the project it switches away from
+                    call(project_manager.SaveProject)
+            elif original:
+                names = [original_name]
+            else:
+                raise LookupError("No project is currently open")
+            job.progress["projects_total"] = len(names)
+
+            try:
+                for name in names:
+                    job.current = {"project": name, "timeline": None}
+                    project = call(self._open_project, project_manager, name, on_project_switch)
+                    if not project:
+                        job.errors.append({"project": name, "error": "Could not load project"})
+                    else:
+                        self._scan_project(job, project, call)
+                    job.progress["projects_done"] += 1
+            finally:
+                if job.all_projects and original_name:
+                    call(self._open_project, project_manager, original_name, on_project_switch)
+            job.state = "done"
+        except Exception as e:
+            logger.error(f"Error scanning timelines: {str(e)}")
+            logger.error(traceback.format_exc())
+            job.state = "failed"
+            job.error = str(e)
+        job.current = None
+        job.finished_at = time.time()
+        logger.info(f"Timeline scan {job.id} {job.state}: {job.progress['projects_done']} projects, "
+                    f"{job.progress['timelines_done']} timelines in {round(job.finished_at - job.started_at, 2)} s")
+
+    def _open_project(self, project_manager, name, on_project_switch):
+        """Make the named project current (on the bridge), loading it only if it is not already."""
+        current = project_manager.GetCurrentProject()
+        if current and current.GetName() == name:
+            return current
+        project = project_manager.LoadProject(name)
+        if on_project_switch:
+            on_project_switch()
+        return project
+
+    def _scan_project(self, job, project, call):
+        started = time.perf_counter()
+        project_id, project_name, timeline_count = call(_project_header, project)
+        job.progress["timelines_total"] += timeline_count
+
+        timelines = []
+        for index in range(1, timeline_count + 1):
+            job.current = {"project": project_name, "timeline": index}
+            try:
+                summary = call(_summarize_timeline_at, project, index)
+            except Exception as e:
+                job.errors.append({"project": project_name, "timeline": index, "error": str(e)})
+                summary = None
+            if summary:
+                timelines.append(summary)
+            job.progress["timelines_done"] += 1
+
+        self._store({
+            "project_id": project_id,
+            "project_name": project_name,
+            "scanned_at": time.time(),
+            "scan_ms": round((time.perf_counter() - started) * 1000, 2),
+            "job_id": job.id,
+            "timeline_count": len(timelines),
+            "total_items": sum(timeline["total_items"] for timeline in timelines),
+            "timelines": timelines
+        })
+        job.project_ids.append(project_id)
+
+    def _store(self, summary):
+        with self._lock:
+            self._summaries[summary["project_id"]] = summary
+            if self._listing is not None:
+                self._listing[summary["project_id"]] = _totals(summary)
+        if self.store is not None:
+            # The totals are a record of their own so listing projects does not read every timeline
+            self.store.put(summary["project_id"], "scan_summary", summary["project_id"], summary)
+            self.store.put(summary["project_id"], "scan_totals", summary["project_id"], _totals(summary))
+
+    def get_summary(self, project_id):
+        """Stored summary of a project's timelines, None if it was never scanned."""
+        summary = self._summaries.get(project_id)
+        if summary is None and self.store is not None:
+            summary = self.store.get(project_id, "scan_summary", project_id)
+            if summary is not None:
+                with self._lock:
+                    self._summaries[project_id] = summary
+        return summary
+
+    def list_summaries(self):
+        """Project-level totals of every stored summary, most recently scanned first."""
+        with self._lock:
+            listing = self._listing
+        if listing is None:
+            listing = {totals["project_id"]: totals
+                       for totals in (self.store.get_all("scan_totals") if self.store is not None else ())}
+            with self._lock:
+                # Scans stored while the store was read are kept
+                self._listing = {**listing, **(self._listing or {})}
+                for project_id, summary in self._summaries.items():
+                    self._listing.setdefault(project_id, _totals(summary))
+                listing = self._listing
+        return sorted(listing.values(), key=lambda totals: totals.get("scanned_at", 0), reverse=True)
+
+    def get_stats(self):
+        jobs = list(self._jobs.values())
+        return {
+            "active": [job.id for job in jobs if job.active],
+            "jobs": len(jobs),
+            "stored": self.store is not None,
+            "cached_summaries": len(self._summaries)
+        }
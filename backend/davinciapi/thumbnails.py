@@ -0,0 +1,333 @@
+import base64
+import hashlib
+import io
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import traceback
+import zlib
+from collections import OrderedDict
+
+from .paths import get_data_dir
+
+try:
+    from PIL import Image, features
+except ImportError:
+    # Without Pillow thumbnails are stored as unscaled PNGs
+    Image = None
+
+logger = logging.getLogger('DaVinciAPI.thumbnails')
+
+# Longest edge of a stored thumbnail in pixels (only applied when Pillow is installed)
+THUMBNAIL_MAX_SIZE = 320
+
+# JPEG/WebP quality of stored thumbnails
+THUMBNAIL_QUALITY = 80
+
+# Thumbnails waiting to be generated; requests beyond this get the placeholder until there is room
+THUMBNAIL_QUEUE_SIZE = 64
+
+# Bytes of encoded thumbnails kept on disk before the least recently served are deleted
+THUMBNAIL_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Item states kept in memory before the least recently requested are forgotten (the store still has them)
+THUMBNAIL_MAX_ENTRIES = 10000
+
+# Seconds before a thumbnail that could not be generated is attempted again
+THUMBNAIL_RETRY_AFTER = 30.0
+
+# Subdirectory of the data directory holding the content-addressed thumbnail files
+THUMBNAIL_DIR = "thumbnails"
+
+# Served while a thumbnail is not ready
+PLACEHOLDER_SVG = (
+    b'<svg xmlns="http://www.w3.org/2000/svg" width="320" height="180" viewBox="0 0 320 180">'
+    b'<rect width="320" height="180" fill="#2b2b2b"/>'
+    b'<rect x="140" y="75" width="40" height="30" rx="3" fill="none" stroke="#5a5a5a" stroke-width="3"/>'
+    b'</svg>'
+)
+
+# File extension of every format a thumbnail can be stored in
+THUMBNAIL_EXTENSIONS = {"image/webp": ".webp", "image/jpeg": ".jpg", "image/png": ".png"}
+
+def thumbnail_key(item):
+    """Cache key of a timeline item's thumbnail; changes when the item is moved, trimmed or relinked."""
+    source = f"{item['id']}:{item['start']}:{item['end']}:{item['media_pool_item_id']}"
+    return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+def thumbnail_frame(timeline_index, item):
+    """Frame at which the item is the topmost video item, None if it is covered everywhere.
+
+    GetCurrentClipThumbnailImage() shows the topmost clip under the playhead, so the
+    item's first, middle and last frame are tried in that order.
+    """
+    for frame in (item["start"], item["start"] + item["duration"] // 2, item["end"] - 1):
+        covering = timeline_index.select(track_type="video", frame=frame)
+        if all(other["track"] <= item["track"] for other in covering):
+            return frame
+    return None
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def _encode_png(width, height, rgb):
+    """Minimal 8-bit RGB PNG encoder for when Pillow is not installed."""
+    stride = width * 3
+    scanlines = b"".join(b"\x00" + rgb[row * stride:(row + 1) * stride] for row in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + _png_chunk(b"IDAT", zlib.compress(scanlines, 6))
+            + _png_chunk(b"IEND", b""))
+
+def encode_thumbnail(grabbed, max_size=THUMBNAIL_MAX_SIZE, quality=THUMBNAIL_QUALITY):
+    """Encode a grabbed frame as a compact WebP (or JPEG) thumbnail.
+
+    Args:
+        grabbed (dict): {"image": GetCurrentClipThumbnailImage() result} or {"still": still file bytes}
+        max_size (int): Longest edge in pixels
+        quality (int): WebP/JPEG quality
+
+    Returns:
+        tuple: (bytes, mimetype)
+    """
+    if "image" in grabbed:
+        image = grabbed["image"]
+        width, height = int(image["width"]), int(image["height"])
+        rgb = base64.b64decode(image["data"])
+        if Image is None:
+            return _encode_png(width, height, rgb), "image/png"
+        picture = Image.frombytes("RGB", (width, height), rgb)
+    else:
+        if Image is None:
+            return grabbed["still"], "image/png"
+        picture = Image.open(io.BytesIO(grabbed["still"])).convert("RGB")
+
+    picture.thumbnail((max_size, max_size))
+    output = io.BytesIO()
+    if features.check("webp"):
+        picture.save(output, "WEBP", quality=quality, method=4)
+        return output.getvalue(), "image/webp"
+    picture.save(output, "JPEG", quality=quality, optimize=True)
+    return output.getvalue(), "image/jpeg"
+
+class ThumbnailCache:
+    """Content-addressed store of encoded thumbnails with LRU eviction by total size.
+
+    Files are named after the SHA-1 of their bytes, so identical frames are stored once.
+    Serving a file bumps its modification time, which orders the LRU across restarts.
+    """
+
+    def __init__(self, directory=None, max_bytes=THUMBNAIL_CACHE_MAX_BYTES):
+        self._directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self._files = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            self._directory = get_data_dir(THUMBNAIL_DIR)
+        return self._directory
+
+    def _load(self):
+        """Index the files already on disk, least recently used first."""
+        if self._files is not None:
+            return
+        entries = []
+        os.makedirs(self.directory, exist_ok=True)
+        for entry in os.scandir(self.directory):
+            digest, extension = os.path.splitext(entry.name)
+            if extension in THUMBNAIL_EXTENSIONS.values():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, digest, entry.path, stat.st_size))
+        self._files = OrderedDict((digest, (path, size)) for _, digest, path, size in sorted(entries))
+        self.total_bytes = sum(size for _, size in self._files.values())
+
+    def put(self, data, mimetype):
+        """Store encoded bytes, returns their digest."""
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            self._load()
+            if digest in self._files:
+                self._files.move_to_end(digest)
+                return digest
+            path = os.path.join(self.directory, digest + THUMBNAIL_EXTENSIONS[mimetype])
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            self._files[digest] = (path, len(data))
+            self.total_bytes += len(data)
+            self._evict()
+        return digest
+
+    def path(self, digest):
+        """Path of a stored thumbnail, None if it was evicted."""
+        with self._lock:
+            self._load()
+            entry = self._files.get(digest)
+            if entry is None:
+                return None
+            self._files.move_to_end(digest)
+        try:
+            os.utime(entry[0])
+        except OSError:
+            with self._lock:
+                if self._files.pop(digest, None):
+                    self.total_bytes -= entry[1]
+            return None
+        return entry[0]
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._files) > 1:
+            _, (path, size) = self._files.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "directory": self._directory,
+                "files": len(self._files) if self._files is not None else None,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
+
+class ThumbnailService:
+    """Generates timeline item thumbnails in the background and serves them from the cache.
+
+    A request for a thumbnail that is not ready queues it and returns at once, so a
+    client shows a placeholder and asks again. One worker thread takes thumbnails off a
+    bounded queue; each grab is a single bridge job (moving the playhead, reading the
+    image and moving it back), and encoding happens on the worker, off the bridge.
+    Which file holds an item's thumbnail is remembered in the metadata store, if given,
+    so thumbnails survive restarts.
+    """
+
+    def __init__(self, bridge=None, cache=None, store=None, queue_size=THUMBNAIL_QUEUE_SIZE,
+                 max_entries=THUMBNAIL_MAX_ENTRIES):
+        """
+        Args:
+            bridge (BridgeWorker, optional): Runs the grabs
+            cache (ThumbnailCache, optional): Where encoded thumbnails are stored
+            store (MetadataStore, optional): Persists the item -> thumbnail file mapping
+            queue_size (int): Thumbnails that can wait for generation at once
+            max_entries (int): Item states kept in memory, least recently requested are dropped first
+        """
+        self.bridge = bridge
+        self.cache = cache or ThumbnailCache()
+        self.store = store
+        self.max_entries = max_entries
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {"requests": 0, "ready": 0, "generated": 0, "failed": 0, "rejected": 0, "generate_ms": 0.0}
+
+    def request(self, project_id, item, grab, args=()):
+        """Get an item's thumbnail, queueing its generation if it is not ready.
+
+        Args:
+            project_id (str): Project the item belongs to
+            item (dict): Timeline index item
+            grab (callable): grab(*args) runs on the bridge and returns {"image": ...},
+                {"still": ...} or None if Resolve gave no image
+            args (tuple): Arguments of grab
+
+        Returns:
+            dict: state ("ready", "queued", "busy" or "failed") with path, etag and mimetype
+                when ready, or error when failed
+        """
+        key = thumbnail_key(item)
+        with self._lock:
+            self._stats["requests"] += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.store is not None:
+            # A disk read, kept outside the lock so other requests do not queue behind it
+            stored = self.store.get(project_id, "thumbnail", key)
+            if stored:
+                with self._lock:
+                    entry = self._entries.get(key) or dict(stored)
+                    self._remember(key, entry)
+
+        if entry and entry["state"] == "ready":
+            path = self.cache.path(entry["digest"])
+            if path:
+                with self._lock:
+                    self._stats["ready"] += 1
+                return {"state": "ready", "path": path, "etag": entry["digest"], "mimetype": entry["mimetype"]}
+        elif entry and entry["state"] == "queued":
+            return {"state": "queued"}
+        elif entry and entry["state"] == "failed" and time.time() - entry["updated_at"] < THUMBNAIL_RETRY_AFTER:
+            return {"state": "failed", "error": entry["error"]}
+
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current["state"] == "queued":
+                # Queued by a concurrent request in the meantime
+                return {"state": "queued"}
+            try:
+                self._queue.put_nowait((project_id, key, grab, args))
+            except queue.Full:
+                self._stats["rejected"] += 1
+                return {"state": "busy"}
+            self._remember(key, {"state": "queued", "updated_at": time.time()})
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="thumbnail-worker", daemon=True)
+                self._thread.start()
+        return {"state": "queued"}
+
+    def _remember(self, key, entry):
+        """Set an item's state as the most recently used one; the caller holds the lock."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _run(self):
+        while True:
+            project_id, key, grab, args = self._queue.get()
+            started = time.perf_counter()
+            try:
+                grabbed = self.bridge.run(grab, args) if self.bridge else grab(*args)
+                if not grabbed:
+                    raise LookupError("Resolve returned no image; thumbnails are only available on the Color page")
+                data, mimetype = encode_thumbnail(grabbed)
+                digest = self.cache.put(data, mimetype)
+                entry = {"state": "ready", "digest": digest, "mimetype": mimetype, "updated_at": time.time()}
+                if self.store is not None:
+                    self.store.put(project_id, "thumbnail", key, entry)
+            except Exception as e:
+                logger.warning(f"Could not generate thumbnail: {str(e)}")
+                logger.debug(traceback.format_exc())
+                entry = {"state": "failed", "error": str(e), "updated_at": time.time()}
+            with self._lock:
+                self._stats["generated" if entry["state"] == "ready" else "failed"] += 1
+                self._stats["generate_ms"] += (time.perf_counter() - started) * 1000
+                self._remember(key, entry)
+
+    def reset(self):
+        """Forget failed thumbnails so they are attempted again, e.g. after reconnecting to Resolve."""
+        with self._lock:
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in self._entries.items() if entry["state"] != "failed")
+
+    def get_stats(self):
+        with self._lock:
+            states = {}
+            for entry in self._entries.values():
+                states[entry["state"]] = states.get(entry["state"], 0) + 1
+            return dict(self._stats, generate_ms=round(self._stats["generate_ms"], 2), queued=self._queue.qsize(),
+                        states=states, pillow=Image is not None, cache=self.cache.get_stats())
@@ -0,0 +1,226 @@
+import logging
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy every frame is converted on its own
+    np = None
+
+logger = logging.getLogger('DaVinciAPI.timecode')
+
+# Frame labels skipped at the start of every minute (except each tenth) in drop-frame timecode, by nominal rate
+DROP_FRAMES_PER_MINUTE = {30: 2, 60: 4}
+
+# Timecode hours wrap around after a day
+HOURS_PER_DAY = 24
+
+# Below this many frames a plain Python loop beats the overhead of building NumPy arrays
+VECTORIZE_MIN_FRAMES = 32
+
+# Rate as Resolve writes it in timelineFrameRate, optionally followed by DF/NDF
+FRAME_RATE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*(DF|NDF)?$")
+
+# HH:MM:SS:FF with any of : ; . , before the frames
+TIMECODE_PATTERN = re.compile(r"^(\d{2}):(\d{2}):(\d{2})[:;.,](\d{2,3})$")
+
+class FrameRate:
+    """A frame rate and the timecode labels of its frames.
+
+    Frames are absolute timeline frames as Resolve counts them (GetStartFrame(), item
+    GetStart()), so frame 0 is 00:00:00:00. Fractional NTSC rates count frames at their
+    nominal integer rate. Drop-frame timecode (29.97 and 59.94 only) skips the labels
+    ;00 and ;01 (;00 to ;03 at 59.94) at the start of every minute except each tenth,
+    which keeps the labels in step with the clock.
+
+    to_timecodes() and to_frames() convert whole lists at once with NumPy; the scalar
+    to_timecode() and to_frame() are for single values.
+    """
+
+    def __init__(self, fps, drop_frame=False):
+        """
+        Args:
+            fps (float): Frames per second, e.g. 24, 23.976 or 29.97
+            drop_frame (bool): Use drop-frame timecode, ignored for rates that have none
+        """
+        self.fps = float(fps)
+        if self.fps <= 0:
+            raise ValueError(f"Frame rate must be positive, got {fps}")
+        self.nominal = round(self.fps)
+        self.drop_frame = bool(drop_frame) and self.nominal in DROP_FRAMES_PER_MINUTE and self.nominal != self.fps
+        self.dropped = DROP_FRAMES_PER_MINUTE[self.nominal] if self.drop_frame else 0
+        self.separator = ";" if self.drop_frame else ":"
+        self.frame_digits = max(2, len(str(self.nominal - 1)))
+
+    @classmethod
+    def parse(cls, frame_rate, drop_frame=None):
+        """Build from a timelineFrameRate setting such as "24", "29.97" or "29.97 DF".
+
+        Args:
+            frame_rate (str or float): The setting
+            drop_frame (bool, optional): Overrides a DF/NDF suffix of the setting
+
+        Raises:
+            ValueError: If the setting is not a frame rate
+        """
+        match = FRAME_RATE_PATTERN.match(str(frame_rate).strip().upper())
+        if not match:
+            raise ValueError(f"Unknown frame rate: {frame_rate!r}")
+        if drop_frame is None:
+            drop_frame = match.group(2) == "DF"
+        return cls(float(match.group(1)), drop_frame)
+
+    @classmethod
+    def from_timeline(cls, timeline, start_timecode=None):
+        """Frame rate of a Resolve timeline.
+
+        Resolve writes drop-frame timecode with a ';' before the frames, so the start
+        timecode tells whether the timeline uses it without another settings call.
+
+        Args:
+            timeline: Resolve Timeline handle
+            start_timecode (str, optional): Its GetStartTimecode() if already read
+        """
+        if start_timecode is None:
+            start_timecode = timeline.GetStartTimecode()
+        return cls.from_setting(timeline.GetSetting("timelineFrameRate"), ";" in (start_timecode or ""))
+
+    @classmethod
+    def from_project(cls, project):
+        """Frame rate of a Resolve project from its timelineFrameRate and timelineDropFrameTimecode settings."""
+        return cls.from_setting(project.GetSetting("timelineFrameRate"),
+                                 str(project.GetSetting("timelineDropFrameTimecode")) == "1")
+
+    @classmethod
+    def from_setting(cls, frame_rate, drop_frame=None):
+        """Like parse(), but falls back to 24 fps for a setting that cannot be read."""
+        try:
+            return cls.parse(frame_rate, drop_frame)
+        except ValueError:
+            logger.warning(f"Unknown timeline frame rate {frame_rate!r}, assuming 24")
+            return cls(24)
+
+    def to_record(self):
+        return {"fps": self.fps, "drop_frame": self.drop_frame}
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(record["fps"], record["drop_frame"])
+
+    def __eq__(self, other):
+        return isinstance(other, FrameRate) and (self.fps, self.drop_frame) == (other.fps, other.drop_frame)
+
+    def __repr__(self):
+        return f"FrameRate({self.fps:g}{' DF' if self.drop_frame else ''})"
+
+    def _split(self, frames):
+        """Hours, minutes, seconds and frame labels of frame counts; works on ints and NumPy arrays alike."""
+        if self.dropped:
+            per_ten_minutes = self.nominal * 600 - self.dropped * 9
+            per_minute = self.nominal * 60 - self.dropped
+            tens, rest = divmod(frames, per_ten_minutes)
+            # Add back the labels skipped so far; the first minute of every ten keeps all of them
+            frames = (frames + self.dropped * 9 * tens
+                      + self.dropped * ((rest - self.dropped) // per_minute) * (rest >= self.dropped))
+        seconds, labels = divmod(frames, self.nominal)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return hours % HOURS_PER_DAY, minutes, seconds, labels
+
+    def _join(self, hours, minutes, seconds, labels):
+        """Frame count of timecode fields; works on ints and NumPy arrays alike."""
+        total_minutes = hours * 60 + minutes
+        frames = (total_minutes * 60 + seconds) * self.nominal + labels
+        if self.dropped:
+            frames = frames - self.dropped * (total_minutes - total_minutes // 10)
+        return frames
+
+    def _check(self, timecode, minutes, seconds, labels):
+        if minutes > 59 or seconds > 59 or labels >= self.nominal:
+            raise ValueError(f"Invalid timecode at {self.fps:g} fps: {timecode!r}")
+        if self.dropped and seconds == 0 and labels < self.dropped and minutes % 10:
+            raise ValueError(f"{timecode!r} does not exist in drop-frame timecode")
+
+    def to_timecode(self, frame):
+        """Timecode label of one frame, e.g. "01:00:00:00" or "00:01:00;02"."""
+        hours, minutes, seconds, labels = self._split(int(frame))
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}{self.separator}{labels:0{self.frame_digits}d}"
+
+    def to_frame(self, timecode):
+        """Frame of one timecode label; any of : ; . , may precede the frames.
+
+        Raises:
+            ValueError: If the label is malformed or does not exist at this rate
+        """
+        match = TIMECODE_PATTERN.match(str(timecode).strip())
+        if not match:
+            raise ValueError(f"Invalid timecode: {timecode!r}")
+        hours, minutes, seconds, labels = (int(group) for group in match.groups())
+        self._check(timecode, minutes, seconds, labels)
+        return self._join(hours, minutes, seconds, labels)
+
+    def to_timecodes(self, frames):
+        """Timecode labels of many frames.
+
+        Args:
+            frames (iterable): Frame numbers
+
+        Returns:
+            list: One timecode string per frame
+        """
+        frames = list(frames)
+        if np is None or len(frames) < VECTORIZE_MIN_FRAMES:
+            return [self.to_timecode(frame) for frame in frames]
+
+        hours, minutes, seconds, labels = self._split(np.asarray(frames, dtype=np.float64).astype(np.int64))
+        # Write the ASCII digits straight into a fixed-width byte matrix, one row per label
+        width = 9 + self.frame_digits
+        text = np.empty((len(frames), width), dtype=np.uint8)
+        for column, field in ((0, hours), (3, minutes), (6, seconds)):
+            text[:, column] = field // 10 + 48
+            text[:, column + 1] = field % 10 + 48
+        for digit in range(self.frame_digits):
+            text[:, width - 1 - digit] = labels // 10 ** digit % 10 + 48
+        text[:, 2] = text[:, 5] = ord(":")
+        text[:, 8] = ord(self.separator)
+        return text.view(f"S{width}").ravel().astype(f"U{width}").tolist()
+
+    def to_frames(self, timecodes):
+        """Frames of many timecode labels.
+
+        Args:
+            timecodes (iterable): Timecode strings
+
+        Returns:
+            list: One frame number per label
+
+        Raises:
+            ValueError: If a label is malformed or does not exist at this rate
+        """
+        timecodes = list(timecodes)
+        if np is None or len(timecodes) < VECTORIZE_MIN_FRAMES:
+            return [self.to_frame(timecode) for timecode in timecodes]
+
+        width = 9 + self.frame_digits
+        text = np.asarray(timecodes, dtype=f"U{width + 1}")
+        # UCS-4 code points, one row per label; shorter labels end in zeros and fail the digit check
+        codes = text.view(np.uint32).reshape(len(timecodes), width + 1).astype(np.int64)
+        digits = codes[:, [0, 1, 3, 4, 6, 7] + list(range(9, width))] - 48
+        valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+        valid &= (codes[:, 2] == ord(":")) & (codes[:, 5] == ord(":")) & (codes[:, width] == 0)
+        valid &= np.isin(codes[:, 8], [ord(":"), ord(";"), ord("."), ord(",")])
+        digits = np.where(valid[:, None], digits, 0)
+
+        hours = digits[:, 0] * 10 + digits[:, 1]
+        minutes = digits[:, 2] * 10 + digits[:, 3]
+        seconds = digits[:, 4] * 10 + digits[:, 5]
+        labels = np.zeros(len(timecodes), dtype=np.int64)
+        for column in range(6, digits.shape[1]):
+            labels = labels * 10 + digits[:, column]
+        valid &= (minutes <= 59) & (seconds <= 59) & (labels < self.nominal)
+        if self.dropped:
+            valid &= ~((seconds == 0) & (labels < self.dropped) & (minutes % 10 != 0))
+        if not valid.all():
+            # Odd but valid labels (3-digit frames) are parsed one by one, the first bad one raises with its reason
+            return [self.to_frame(timecode) for timecode in timecodes]
+        return self._join(hours, minutes, seconds, labels).tolist()
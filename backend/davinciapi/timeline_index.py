@@ -0,0 +1,199 @@
+import bisect
+import hashlib
+import logging
+import time
+
+from .timecode import FrameRate
+
+logger = logging.getLogger('DaVinciAPI.timeline_index')
+
+# Track types walked when indexing a timeline, in output order
+TRACK_TYPES = ("video", "audio", "subtitle")
+
+class TrackIndex:
+    """Items of a single track sorted by start frame.
+
+    Alongside the start frames a running maximum of end frames is kept, which is
+    non-decreasing and therefore bisectable too. Together they bound any range query
+    to a contiguous slice even if items on the track overlap.
+    """
+
+    def __init__(self, track_type, track, items):
+        self.track_type = track_type
+        self.track = track
+        self.items = sorted(items, key=lambda item: (item["start"], item["end"]))
+        self.starts = [item["start"] for item in self.items]
+        self.max_ends = []
+        running_end = None
+        for item in self.items:
+            running_end = item["end"] if running_end is None else max(running_end, item["end"])
+            self.max_ends.append(running_end)
+
+    def overlapping(self, start, end):
+        """Items covering any frame in [start, end]. Item end frames are exclusive."""
+        # Nothing before lo can reach past start, nothing from hi on starts before end
+        lo = bisect.bisect_right(self.max_ends, start)
+        hi = bisect.bisect_right(self.starts, end)
+        return [item for item in self.items[lo:hi] if item["end"] > start]
+
+    def at(self, frame):
+        """Items under a single timeline frame."""
+        return self.overlapping(frame, frame)
+
+class TimelineIndex:
+    """In-memory index of every item on a timeline, built once per timeline revision.
+
+    Queries are answered from the index without calling into Resolve. The TimelineItem
+    handles are kept next to the serializable item dicts so later lookups by item ID do
+    not have to walk the tracks again.
+    """
+
+    def __init__(self, timeline_id, fingerprint, tracks, handles, build_ms, frame_rate, source="resolve"):
+        self.timeline_id = timeline_id
+        self.fingerprint = fingerprint
+        self.frame_rate = frame_rate
+        self.revision = hashlib.sha1(repr((fingerprint, time.time())).encode()).hexdigest()[:12]
+        self.tracks = tracks
+        self.handles = handles
+        self.build_ms = build_ms
+        self.built_at = time.time()
+        # "store" for an index loaded from the metadata store, which has no item handles
+        self.source = source
+        self.items = [item for track in tracks for item in track.items]
+        self.items_by_id = {item["id"]: item for item in self.items}
+
+    def _tracks(self, track_type=None, track=None):
+        return [
+            track_index for track_index in self.tracks
+            if (track_type is None or track_index.track_type == track_type)
+            and (track is None or track_index.track == track)
+        ]
+
+    def select(self, track_type=None, track=None, frame=None, start=None, end=None):
+        """Select items, optionally limited to a track and a frame or frame range.
+
+        Args:
+            track_type (str, optional): "video", "audio" or "subtitle"
+            track (int, optional): 1-based track number within track_type
+            frame (int, optional): Only items under this frame
+            start (int, optional): Only items ending after this frame
+            end (int, optional): Only items starting at or before this frame
+
+        Returns:
+            list: Matching item dicts in track order, then by start frame
+        """
+        if frame is not None:
+            start = end = frame
+        if start is None and end is None and track_type is None and track is None:
+            return self.items
+
+        selected = []
+        for track_index in self._tracks(track_type, track):
+            if start is None and end is None:
+                selected.extend(track_index.items)
+            else:
+                selected.extend(track_index.overlapping(
+                    start if start is not None else float("-inf"),
+                    end if end is not None else float("inf")
+                ))
+        return selected
+
+    def summary(self):
+        return {
+            "timeline_id": self.timeline_id,
+            "revision": self.revision,
+            "item_count": len(self.items),
+            "track_count": {
+                track_type: len(self._tracks(track_type)) for track_type in TRACK_TYPES
+            },
+            "frame_rate": self.frame_rate.fps,
+            "drop_frame": self.frame_rate.drop_frame,
+            "build_ms": self.build_ms,
+            "built_at": self.built_at,
+            "source": self.source
+        }
+
+    def to_record(self):
+        """Serializable form for the metadata store (the item handles are left out)."""
+        return {
+            "timeline_id": self.timeline_id,
+            "fingerprint": self.fingerprint,
+            "frame_rate": self.frame_rate.to_record(),
+            "build_ms": self.build_ms,
+            "tracks": [
+                {"track_type": track.track_type, "track": track.track, "items": track.items}
+                for track in self.tracks
+            ]
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild an index written by to_record(), without handles."""
+        timeline_id, end_frame, track_counts = record["fingerprint"]
+        tracks = [TrackIndex(track["track_type"], track["track"], track["items"]) for track in record["tracks"]]
+        return cls(record["timeline_id"], (timeline_id, end_frame, tuple(track_counts)), tracks, {},
+                   record["build_ms"], FrameRate.from_record(record["frame_rate"]), source="store")
+
+def get_timeline_fingerprint(timeline):
+    """Cheap signature of a timeline's structure: unique ID, end frame and track counts.
+
+    Costs a handful of bridge calls instead of the thousands a full walk needs, and
+    changes whenever the timeline is switched, lengthened/shortened or tracks are added.
+    """
+    return (
+        timeline.GetUniqueId(),
+        timeline.GetEndFrame(),
+        tuple(timeline.GetTrackCount(track_type) for track_type in TRACK_TYPES)
+    )
+
+def build_timeline_index(timeline, fingerprint=None):
+    """Walk every track of a timeline and index its items, with the timecode of their start and end.
+
+    Args:
+        timeline: Resolve Timeline handle
+        fingerprint (tuple, optional): Result of get_timeline_fingerprint() if already known
+
+    Returns:
+        TimelineIndex: The built index
+    """
+    started = time.perf_counter()
+    if fingerprint is None:
+        fingerprint = get_timeline_fingerprint(timeline)
+    timeline_id, _, track_counts = fingerprint
+    frame_rate = FrameRate.from_timeline(timeline)
+
+    tracks = []
+    handles = {}
+    for track_type, track_count in zip(TRACK_TYPES, track_counts):
+        for track in range(1, track_count + 1):
+            items = []
+            for timeline_item in timeline.GetItemListInTrack(track_type, track) or []:
+                item_id = timeline_item.GetUniqueId()
+                item_start = timeline_item.GetStart()
+                item_end = timeline_item.GetEnd()
+                media_pool_item = timeline_item.GetMediaPoolItem()
+                items.append({
+                    "id": item_id,
+                    "name": timeline_item.GetName(),
+                    "track_type": track_type,
+                    "track": track,
+                    "start": item_start,
+                    "end": item_end,
+                    # Derived locally rather than spending another bridge call on GetDuration()
+                    "duration": item_end - item_start,
+                    "media_pool_item_id": media_pool_item.GetUniqueId() if media_pool_item else None
+                })
+                handles[item_id] = timeline_item
+            tracks.append(TrackIndex(track_type, track, items))
+
+    # One vectorized conversion for every item, instead of one per item and request
+    items = [item for track_index in tracks for item in track_index.items]
+    timecodes = frame_rate.to_timecodes([item["start"] for item in items] + [item["end"] for item in items])
+    for item, start_timecode, end_timecode in zip(items, timecodes, timecodes[len(items):]):
+        item["start_timecode"] = start_timecode
+        item["end_timecode"] = end_timecode
+
+    build_ms = round((time.perf_counter() - started) * 1000, 2)
+    index = TimelineIndex(timeline_id, fingerprint, tracks, handles, build_ms, frame_rate)
+    logger.info(f"Indexed {len(index.items)} timeline items across {len(tracks)} tracks in {build_ms} ms")
+    return index
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+
+from davinciapi.davinciapi import SNAPSHOT_SECTIONS
+
+logger = logging.getLogger('DaVinciAPI.events')
+
+# Seconds between two Resolve samples while at least one client is listening
+POLL_INTERVAL = 0.5
+
+# Seconds between heartbeat events, lets clients notice a dead backend without pinging /api/health
+HEARTBEAT_INTERVAL = 15.0
+
+# Events buffered per client before a slow client is disconnected
+SUBSCRIBER_QUEUE_SIZE = 256
+
+def format_sse(event, data):
+    """Encode one server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+class Subscription:
+    """A single client's view of the event stream."""
+
+    def __init__(self, channels=None):
+        self.channels = set(channels) if channels else None
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.closed = False
+
+    def wants(self, event):
+        return self.channels is None or event in self.channels
+
+    def put_nowait(self, message):
+        """Deliver an (event, data) pair, raises queue.Full if the client stopped reading."""
+        self.queue.put_nowait(message)
+
+    def get(self, timeout):
+        """Wait for the next (event, data) pair, returns None on timeout or once closed."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class AsyncSubscription(Subscription):
+    """A subscription read from an asyncio event loop instead of a blocked thread.
+
+    Publishing threads still fill the bounded queue; they only schedule a wake-up of the
+    loop, so an idle client costs a queue and a coroutine rather than a server thread.
+    Must be created on the loop that reads it.
+    """
+
+    def __init__(self, channels=None):
+        super().__init__(channels)
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def put_nowait(self, message):
+        self.queue.put_nowait(message)
+        try:
+            self.loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # The loop is closed, so is the client
+            self.closed = True
+
+    async def get_async(self, timeout):
+        """Wait for the next (event, data) pair, returns None on timeout or once closed."""
+        deadline = self.loop.time() + timeout
+        while True:
+            self._ready.clear()
+            try:
+                return self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            remaining = deadline - self.loop.time()
+            if remaining <= 0 or self.closed:
+                return None
+            try:
+                await asyncio.wait_for(self._ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+class EventBroker:
+    """Fans published events out to every subscribed client.
+
+    The latest payload of each event is remembered so a new subscriber immediately
+    receives the current state instead of waiting for the next change. Events whose
+    payloads only carry what changed register a snapshot instead, see set_snapshot().
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._latest = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._subscribed = threading.Condition(self._lock)
+
+    def subscribe(self, channels=None, subscription_class=Subscription):
+        """Register a client.
+
+        Args:
+            channels (iterable, optional): Event names to receive, defaults to all of them
+            subscription_class (type): Subscription, or AsyncSubscription for clients served from an event loop
+        """
+        subscription = subscription_class(channels)
+        with self._lock:
+            for event, data in self._latest.items():
+                if subscription.wants(event):
+                    subscription.put_nowait((event, data))
+            for event, snapshot in self._snapshots.items():
+                data = snapshot() if subscription.wants(event) else None
+                if data is not None:
+                    subscription.put_nowait((event, data))
+            self._subscribers.add(subscription)
+            self._subscribed.notify_all()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscription.closed = True
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def wait_for_subscribers(self, timeout):
+        """Block until somebody is listening, returns True if there is a subscriber."""
+        with self._lock:
+            if not self._subscribers:
+                self._subscribed.wait(timeout)
+            return bool(self._subscribers)
+
+    def wanted(self, events):
+        """Return the subset of events at least one subscriber listens to."""
+        with self._lock:
+            return [event for event in events if any(subscription.wants(event) for subscription in self._subscribers)]
+
+    def set_snapshot(self, event, snapshot):
+        """Send new subscribers snapshot() for an event published with remember=False.
+
+        snapshot() is called under the broker lock, so a new subscriber gets every change
+        either in the snapshot or in a later publish; it must not block and may return None
+        when there is nothing to send.
+        """
+        with self._lock:
+            self._snapshots[event] = snapshot
+
+    def publish(self, event, data, remember=True):
+        """Send an event to every interested subscriber.
+
+        Args:
+            event (str): Event name, also the channel clients can filter on
+            data: JSON serializable payload
+            remember (bool): Keep the payload for replay to future subscribers
+        """
+        with self._lock:
+            if remember:
+                self._latest[event] = data
+            for subscription in list(self._subscribers):
+                if not subscription.wants(event):
+                    continue
+                try:
+                    subscription.put_nowait((event, data))
+                except queue.Full:
+                    # The client stopped reading; drop it rather than buffering without bound
+                    logger.warning("Dropping event subscriber with a full queue")
+                    subscription.closed = True
+                    self._subscribers.discard(subscription)
+
+    def forget(self, events=None):
+        """Clear remembered payloads so stale state is not replayed.
+
+        Args:
+            events (iterable, optional): Events to forget, defaults to all of them
+        """
+        with self._lock:
+            if events is None:
+                self._latest.clear()
+            for event in events or ():
+                self._latest.pop(event, None)
+
+class ChangePoller:
+    """Single background thread that samples Resolve and publishes changed sections.
+
+    Every client shares the same sample, so the bridge is polled once per interval no
+    matter how many dashboards are open. The poller idles while nobody is subscribed.
+    """
+
+    def __init__(self, api_getter, broker, interval=POLL_INTERVAL, sections=SNAPSHOT_SECTIONS):
+        """
+        Args:
+            api_getter (callable): Returns the current DaVinciResolveAPI instance or None
+            broker (EventBroker): Where changed sections are published
+            interval (float): Seconds between samples
+            sections (iterable): Snapshot sections to watch
+        """
+        self.api_getter = api_getter
+        self.broker = broker
+        # Called with the name of every section whose sample changed
+        self.on_change = None
+        # Called with (section, data) of every sampled section, changed or not
+        self.on_sample = None
+        self.interval = interval
+        self.sections = tuple(sections)
+        self.samples = 0
+        self.changes = 0
+        self._last = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def ensure_started(self):
+        """Start the poller thread if it is not running yet."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="resolve-change-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def sample(self):
+        """Take one sample and publish the sections that differ from the previous one.
+
+        Returns:
+            list: Names of the sections that changed
+        """
+        sections = self.broker.wanted(self.sections)
+        # Sections nobody listens to are not sampled, so their remembered state goes stale
+        unwatched = [section for section in self._last if section not in sections]
+        for section in unwatched:
+            del self._last[section]
+        self.broker.forget(unwatched)
+        if not sections:
+            return []
+
+        api = self.api_getter()
+        if api:
+            snapshot = api.get_snapshot(sections)
+            snapshot.pop("timings", None)
+        elif "status" in sections:
+            snapshot = {"status": {"status": False, "error": "Not connected to DaVinci Resolve"}}
+        else:
+            snapshot = {}
+
+        changed = []
+        for section, data in snapshot.items():
+            if self.on_sample:
+                self.on_sample(section, data)
+            if self._last.get(section) != data:
+                self._last[section] = data
+                self.broker.publish(section, data)
+                if self.on_change:
+                    self.on_change(section)
+                changed.append(section)
+
+        self.samples += 1
+        self.changes += len(changed)
+        return changed
+
+    def _run(self):
+        last_heartbeat = 0.0
+        while not self._stop.is_set():
+            if not self.broker.wait_for_subscribers(timeout=HEARTBEAT_INTERVAL):
+                # Nobody is listening; the next subscriber must not be replayed stale state
+                if self._last:
+                    self._last = {}
+                    self.broker.forget()
+                continue
+
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling Resolve state: {str(e)}")
+
+            if started - last_heartbeat >= HEARTBEAT_INTERVAL:
+                self.broker.publish("heartbeat", {"time": time.time(), "subscribers": self.broker.subscriber_count}, remember=False)
+                last_heartbeat = started
+
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def get_stats(self):
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval": self.interval,
+            "subscribers": self.broker.subscriber_count,
+            "samples": self.samples,
+            "changes": self.changes
+        }
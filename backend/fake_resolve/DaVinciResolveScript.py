@@ -0,0 +1,542 @@
+"""Pure-Python stand-in for DaVinci Resolve's DaVinciResolveScript module.
+
+Implements the part of the scripting object model used by davinciapi.py (Resolve,
+ProjectManager, Project, Timeline, MediaPool, Folder, MediaPoolItem, TimelineItem)
+on plain Python data, so DaVinciResolveAPI can be exercised and benchmarked without
+a running Resolve.
+
+Every public scripting method counts as one bridge call and can be slowed down by a
+configurable per-call latency to mimic the fusionscript IPC hop:
+
+    import DaVinciResolveScript as fake
+    fake.set_latency(0.0002)
+    resolve = fake.scriptapp("Resolve")
+    resolve.GetProjectManager().GetCurrentProject().GetName()
+
+generate_project() builds synthetic projects of any size (tracks, items, clips).
+"""
+import base64
+import hashlib
+import itertools
+import threading
+import time
+
+from davinciapi.timecode import FrameRate
+
+_latency = 0.0
+_running = True
+_call_count = 0
+_call_lock = threading.Lock()
+_ids = itertools.count(1)
+
+def set_latency(seconds):
+    """Set the simulated round-trip time of every bridge call."""
+    global _latency
+    _latency = seconds
+
+def set_running(running):
+    """Simulate Resolve quitting (False) and starting again (True).
+
+    While not running, every bridge call raises and scriptapp() returns None. After a
+    restart scriptapp() hands out a new Resolve; objects of the old one stay dead.
+    """
+    global _running, _resolve
+    if running and not _running and _resolve is not None:
+        _resolve._dead = True
+        _resolve = None
+    _running = running
+
+def get_call_count():
+    """Number of bridge calls made since the last reset_call_count()."""
+    return _call_count
+
+def reset_call_count():
+    global _call_count
+    with _call_lock:
+        _call_count = 0
+
+def _unique_id(prefix):
+    return f"{prefix}-{next(_ids):08d}"
+
+def _bridge_call(method):
+    def call(self, *args, **kwargs):
+        global _call_count
+        with _call_lock:
+            _call_count += 1
+        if not _running or getattr(self, "_dead", False):
+            raise RuntimeError("Lost connection to DaVinci Resolve")
+        if _latency:
+            time.sleep(_latency)
+        return method(self, *args, **kwargs)
+    call.__name__ = method.__name__
+    call.__doc__ = method.__doc__
+    return call
+
+class _ScriptObject:
+    """Base class turning every CamelCase method into a counted, delayed bridge call."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if name[:1].isupper() and callable(value):
+                setattr(cls, name, _bridge_call(value))
+
+# Marker colors offered by Resolve, cycled through by generate_project()
+MARKER_COLORS = ("Blue", "Cyan", "Green", "Yellow", "Red", "Pink", "Purple", "Fuchsia",
+                 "Rose", "Lavender", "Sky", "Mint", "Lemon", "Sand", "Cocoa", "Cream")
+
+# Size of the images returned by Timeline.GetCurrentClipThumbnailImage()
+THUMBNAIL_SIZE = (160, 90)
+
+def _marker(color, name, note="", duration=1, custom_data=""):
+    return {"color": color, "name": name, "note": note, "duration": duration, "customData": custom_data}
+
+class MediaPoolItem(_ScriptObject):
+    def __init__(self, name, frames=240, fps="24"):
+        self._id = _unique_id("mpi")
+        self._properties = {
+            "Clip Name": name,
+            "File Name": f"{name}.mov",
+            "File Path": f"/media/{name}.mov",
+            "FPS": fps,
+            "Frames": str(frames),
+            "Resolution": "1920x1080",
+            "Video Codec": "Apple ProRes 422",
+            "Audio Codec": "Linear PCM",
+            "Duration": "00:00:10:00",
+            "Start TC": "00:00:00:00",
+            "Clip Color": "",
+            "Comments": "",
+            "Type": "Video + Audio"
+        }
+        self._metadata = {}
+        self._markers = {}
+
+    def GetName(self):
+        return self._properties["Clip Name"]
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetClipProperty(self, propertyName=None):
+        if not propertyName:
+            return dict(self._properties)
+        return self._properties.get(propertyName, "")
+
+    def SetClipProperty(self, propertyName, propertyValue):
+        self._properties[propertyName] = propertyValue
+        return True
+
+    def GetMetadata(self, metadataType=None):
+        if not metadataType:
+            return dict(self._metadata)
+        return self._metadata.get(metadataType, "")
+
+    def SetMetadata(self, metadataType, metadataValue=None):
+        if isinstance(metadataType, dict):
+            self._metadata.update(metadataType)
+        else:
+            self._metadata[metadataType] = metadataValue
+        return True
+
+    def GetMarkers(self):
+        return {frame: dict(marker) for frame, marker in self._markers.items()}
+
+    def AddMarker(self, frameId, color, name, note, duration, customData=""):
+        if frameId in self._markers:
+            return False
+        self._markers[frameId] = _marker(color, name, note, duration, customData)
+        return True
+
+    def GetClipColor(self):
+        return self._properties["Clip Color"]
+
+    def SetClipColor(self, colorName):
+        self._properties["Clip Color"] = colorName
+        return True
+
+class Folder(_ScriptObject):
+    def __init__(self, name):
+        self._id = _unique_id("folder")
+        self._name = name
+        self._clips = []
+        self._subfolders = []
+
+    def GetName(self):
+        return self._name
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetClipList(self):
+        return list(self._clips)
+
+    def GetSubFolderList(self):
+        return list(self._subfolders)
+
+    def GetIsFolderStale(self):
+        return False
+
+class MediaPool(_ScriptObject):
+    def __init__(self):
+        self._id = _unique_id("mediapool")
+        self._root = Folder("Master")
+        self._current = self._root
+        self._selected = []
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetRootFolder(self):
+        return self._root
+
+    def GetCurrentFolder(self):
+        return self._current
+
+    def SetCurrentFolder(self, folder):
+        self._current = folder
+        return True
+
+    def GetSelectedClips(self):
+        return list(self._selected)
+
+class TimelineItem(_ScriptObject):
+    def __init__(self, name, start, end, media_pool_item=None):
+        self._id = _unique_id("item")
+        self._name = name
+        self._start = start
+        self._end = end
+        self._media_pool_item = media_pool_item
+        self._markers = {}
+        self._color = ""
+
+    def GetName(self):
+        return self._name
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetStart(self, subframe_precision=False):
+        return self._start
+
+    def GetEnd(self, subframe_precision=False):
+        return self._end
+
+    def GetDuration(self, subframe_precision=False):
+        return self._end - self._start
+
+    def GetLeftOffset(self, subframe_precision=False):
+        return 0
+
+    def GetMediaPoolItem(self):
+        return self._media_pool_item
+
+    def GetMarkers(self):
+        return {frame: dict(marker) for frame, marker in self._markers.items()}
+
+    def AddMarker(self, frameId, color, name, note, duration, customData=""):
+        if frameId in self._markers:
+            return False
+        self._markers[frameId] = _marker(color, name, note, duration, customData)
+        return True
+
+    def GetClipColor(self):
+        return self._color
+
+    def SetClipColor(self, colorName):
+        self._color = colorName
+        return True
+
+class Timeline(_ScriptObject):
+    def __init__(self, name, start_frame=None, frame_rate="24", drop_frame=False):
+        self._id = _unique_id("timeline")
+        self._name = name
+        self._frame_rate = frame_rate
+        self._drop_frame = drop_frame
+        if start_frame is None:
+            # 01:00:00:00; drop-frame timecode skips 108 labels (216 at 59.94) in the first hour
+            fps = round(float(frame_rate))
+            start_frame = fps * 3600 - (fps // 15 * 54 if drop_frame else 0)
+        self._start_frame = start_frame
+        self._tracks = {"video": [], "audio": [], "subtitle": []}
+        self._markers = {}
+        self._current_frame = start_frame
+
+    def GetName(self):
+        return self._name
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetStartFrame(self):
+        return self._start_frame
+
+    def GetEndFrame(self):
+        ends = [item._end for tracks in self._tracks.values() for track in tracks for item in track]
+        return max(ends, default=self._start_frame)
+
+    def GetStartTimecode(self):
+        return "01:00:00;00" if self._drop_frame else "01:00:00:00"
+
+    def GetCurrentTimecode(self):
+        return FrameRate(self._frame_rate, self._drop_frame).to_timecode(self._current_frame)
+
+    def SetCurrentTimecode(self, timecode):
+        try:
+            self._current_frame, = FrameRate(self._frame_rate, self._drop_frame).to_frames([timecode])
+        except ValueError:
+            return False
+        return True
+
+    def GetCurrentClipThumbnailImage(self):
+        """A flat image colored after the topmost video item under the playhead, {} if there is none.
+
+        Unlike Resolve, which only answers on the Color page, the fake answers on any page.
+        """
+        for track in reversed(self._tracks["video"]):
+            for item in track:
+                if item._start <= self._current_frame < item._end:
+                    width, height = THUMBNAIL_SIZE
+                    pixel = hashlib.sha1(item._id.encode()).digest()[:3]
+                    return {"width": width, "height": height, "format": "RGB 8 bit",
+                            "data": base64.b64encode(pixel * (width * height)).decode()}
+        return {}
+
+    def GetTrackCount(self, trackType):
+        return len(self._tracks.get(trackType, []))
+
+    def GetItemListInTrack(self, trackType, index):
+        tracks = self._tracks.get(trackType, [])
+        if not 1 <= index <= len(tracks):
+            return None
+        return list(tracks[index - 1])
+
+    def GetMarkers(self):
+        return {frame: dict(marker) for frame, marker in self._markers.items()}
+
+    def AddMarker(self, frameId, color, name, note, duration, customData=""):
+        if frameId in self._markers:
+            return False
+        self._markers[frameId] = _marker(color, name, note, duration, customData)
+        return True
+
+    def GetSetting(self, settingName=None):
+        settings = {"timelineFrameRate": self._frame_rate, "timelineDropFrameTimecode": "1" if self._drop_frame else "0"}
+        if not settingName:
+            return settings
+        return settings.get(settingName, "")
+
+    def Export(self, fileName, exportType, exportSubtype=None):
+        """Write a plain-text event list whatever the export type; False for unknown types."""
+        if exportType not in EXPORT_CONSTANTS.values():
+            return False
+        with open(fileName, "w", encoding="utf-8") as f:
+            f.write(f"TITLE: {self._name}\n")
+            for track, items in enumerate(self._tracks["video"], start=1):
+                for item in items:
+                    f.write(f"{item._id} V{track} {item._name} {item._start} {item._end}\n")
+        return True
+
+class Project(_ScriptObject):
+    def __init__(self, name, frame_rate="24", drop_frame=False):
+        self._id = _unique_id("project")
+        self._name = name
+        self._settings = {"timelineFrameRate": frame_rate, "timelineDropFrameTimecode": "1" if drop_frame else "0"}
+        self._timelines = []
+        self._current_timeline = None
+        self._media_pool = MediaPool()
+        self._render_jobs = []
+        self._rendering = False
+
+    def GetName(self):
+        return self._name
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetSetting(self, settingName=None):
+        if not settingName:
+            return dict(self._settings)
+        return self._settings.get(settingName, "")
+
+    def GetTimelineCount(self):
+        return len(self._timelines)
+
+    def GetTimelineByIndex(self, idx):
+        if not 1 <= idx <= len(self._timelines):
+            return None
+        return self._timelines[idx - 1]
+
+    def GetCurrentTimeline(self):
+        return self._current_timeline
+
+    def SetCurrentTimeline(self, timeline):
+        if timeline not in self._timelines:
+            return False
+        self._current_timeline = timeline
+        return True
+
+    def GetMediaPool(self):
+        return self._media_pool
+
+    def GetRenderJobList(self):
+        return [{key: value for key, value in job.items() if key != "status"} for job in self._render_jobs]
+
+    def GetRenderJobStatus(self, jobId):
+        for job in self._render_jobs:
+            if job["JobId"] == jobId:
+                return dict(job["status"])
+        return {}
+
+    def IsRenderingInProgress(self):
+        return self._rendering
+
+    def ExportCurrentFrameAsStill(self, filePath):
+        # The fake renders no frames; thumbnails come from GetCurrentClipThumbnailImage()
+        return False
+
+class ProjectManager(_ScriptObject):
+    def __init__(self):
+        self._projects = {}
+        self._current = None
+
+    def GetCurrentProject(self):
+        return self._current
+
+    def GetProjectListInCurrentFolder(self):
+        return list(self._projects)
+
+    def LoadProject(self, projectName):
+        project = self._projects.get(projectName)
+        if project:
+            self._current = project
+        return project
+
+    def SaveProject(self):
+        return self._current is not None
+
+    def add_project(self, project, make_current=True):
+        """Not part of the Resolve API: register a generated project."""
+        self._projects[project._name] = project
+        if make_current or self._current is None:
+            self._current = project
+        return project
+
+# Timeline.Export() type and subtype constants, exposed as attributes of the Resolve object
+EXPORT_CONSTANTS = {
+    name: value for value, name in enumerate((
+        "EXPORT_AAF", "EXPORT_DRT", "EXPORT_EDL", "EXPORT_FCP_7_XML", "EXPORT_FCPXML_1_8", "EXPORT_FCPXML_1_9",
+        "EXPORT_FCPXML_1_10", "EXPORT_TEXT_CSV", "EXPORT_TEXT_TAB", "EXPORT_OTIO", "EXPORT_ALE", "EXPORT_ALE_CDL",
+        "EXPORT_NONE", "EXPORT_AAF_NEW", "EXPORT_AAF_EXISTING", "EXPORT_CDL", "EXPORT_SDL", "EXPORT_MISSING_CLIPS"
+    ))
+}
+
+class Resolve(_ScriptObject):
+    def __init__(self, version="19.0.0.0"):
+        self._version = version
+        self._project_manager = ProjectManager()
+
+    def GetVersionString(self):
+        return self._version
+
+    def GetProductName(self):
+        return "DaVinci Resolve Studio"
+
+    def GetProjectManager(self):
+        return self._project_manager
+
+for _name, _value in EXPORT_CONSTANTS.items():
+    setattr(Resolve, _name, _value)
+
+def generate_project(name="Benchmark Project", video_tracks=2, audio_tracks=2, subtitle_tracks=0,
+                     items_per_track=50, item_frames=48, clips=100, folders=4, render_jobs=2, frame_rate="24",
+                     marker_every=10, timelines=1, drop_frame=False):
+    """Build a synthetic project with timelines, a media pool and a render queue.
+
+    Args:
+        video_tracks, audio_tracks, subtitle_tracks (int): Track counts of the timeline
+        items_per_track (int): Back-to-back items per track, each item_frames long
+        clips (int): Media pool clips, spread evenly over the root and `folders` subfolders
+        render_jobs (int): Render jobs in the queue, all of them already complete
+        timelines (int): Timelines in the project, all of the same shape; the first one is current
+        frame_rate (str): timelineFrameRate setting of the project and its timelines
+        drop_frame (bool): Use drop-frame timecode (only for "29.97" and "59.94")
+        marker_every (int): Every Nth video item, Nth clip and Nth item slot on the timeline gets a
+            marker (item, clip and timeline markers respectively); 0 for none
+
+    Returns:
+        Project: The generated project (register it with ProjectManager.add_project)
+    """
+    project = Project(name, frame_rate, drop_frame)
+    root = project._media_pool._root
+    bins = [root]
+    for index in range(folders):
+        folder = Folder(f"Bin {index + 1:02d}")
+        root._subfolders.append(folder)
+        bins.append(folder)
+
+    pool = [MediaPoolItem(f"clip_{index:06d}", fps=frame_rate) for index in range(clips)]
+    for index, clip in enumerate(pool):
+        bins[index % len(bins)]._clips.append(clip)
+
+    for timeline_number in range(1, timelines + 1):
+        suffix = f" {timeline_number}" if timeline_number > 1 else ""
+        project._timelines.append(_generate_timeline(f"{name} Edit{suffix}", pool, frame_rate, video_tracks, audio_tracks,
+                                                     subtitle_tracks, items_per_track, item_frames, marker_every,
+                                                     drop_frame))
+    timeline = project._timelines[0]
+    project._current_timeline = timeline
+
+    last_frame = timeline._start_frame + max(items_per_track * item_frames - 1, 0)
+    for index in range(render_jobs):
+        project._render_jobs.append({
+            "JobId": _unique_id("job"),
+            "TimelineName": timeline._name,
+            "MarkIn": timeline._start_frame,
+            "MarkOut": last_frame,
+            "TargetDir": "/renders",
+            "OutputFilename": f"render_{index + 1}.mov",
+            "status": {"JobStatus": "Complete", "CompletionPercentage": 100, "TimeTakenToRenderInMs": 1000}
+        })
+    if marker_every:
+        for index in range(0, len(pool), marker_every * 2):
+            pool[index]._markers[1] = _marker("Green", "Circled take")
+    return project
+
+def _generate_timeline(name, pool, frame_rate, video_tracks, audio_tracks, subtitle_tracks, items_per_track,
+                       item_frames, marker_every, drop_frame=False):
+    timeline = Timeline(name, frame_rate=frame_rate, drop_frame=drop_frame)
+    for track_type, track_count in (("video", video_tracks), ("audio", audio_tracks), ("subtitle", subtitle_tracks)):
+        for track in range(track_count):
+            items = []
+            for index in range(items_per_track):
+                start = timeline._start_frame + index * item_frames
+                clip = pool[(track * items_per_track + index) % len(pool)] if pool and track_type != "subtitle" else None
+                item = TimelineItem(f"{track_type[0].upper()}{track + 1} {index:05d}", start, start + item_frames, clip)
+                if marker_every and track_type == "video" and index % marker_every == 0:
+                    item._markers[item_frames // 2] = _marker(MARKER_COLORS[index // marker_every % len(MARKER_COLORS)], f"Note {index}")
+                items.append(item)
+            timeline._tracks[track_type].append(items)
+    timeline._markers[0] = _marker("Blue", "Start")
+    if marker_every:
+        for index in range(marker_every, items_per_track, marker_every):
+            timeline._markers[index * item_frames] = _marker(MARKER_COLORS[index // marker_every % len(MARKER_COLORS)], f"Scene {index}")
+    return timeline
+
+_resolve = None
+
+def install(resolve):
+    """Make scriptapp("Resolve") return the given Resolve object."""
+    global _resolve
+    _resolve = resolve
+    return resolve
+
+def scriptapp(app_name):
+    """Stand-in for DaVinciResolveScript.scriptapp(), returns a Resolve with one small project."""
+    if app_name != "Resolve" or not _running:
+        return None
+    if _resolve is None:
+        resolve = Resolve()
+        resolve._project_manager.add_project(generate_project("Fake Project"))
+        install(resolve)
+    return _resolve
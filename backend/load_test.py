@@ -0,0 +1,126 @@
+"""Compare the waitress (run_server.py) and ASGI (run_asgi.py) servers under many open event streams.
+
+Each server is started in a subprocess on a free port, connected to Resolve if it is
+running (the routes answer "not connected" otherwise, which still exercises them). The test
+opens --streams idle /api/events connections, then times --requests sequential requests
+of every --path while the streams stay open, and reports how many streams the server
+actually started serving.
+
+Run with:  python load_test.py [--mode waitress|asgi|both] [--streams 500] [--requests 50]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Module whose main(host, port) starts each server mode
+SERVER_MODULES = {"waitress": "run_server", "asgi": "run_asgi"}
+
+# Seconds a request (or the start of an event stream) may take before it counts as timed out
+REQUEST_TIMEOUT = 5.0
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(mode, port):
+    module = SERVER_MODULES[mode]
+    return subprocess.Popen(
+        [sys.executable, "-c", f"import {module}; {module}.main('127.0.0.1', {port})"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+async def request(port, path, timeout=REQUEST_TIMEOUT):
+    """GET a path over a new connection, returns (status, seconds) or (None, None) on timeout."""
+    started = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+        response = await asyncio.wait_for(reader.read(), timeout)
+        return int(response.split(b" ", 2)[1]), time.perf_counter() - started
+    except (asyncio.TimeoutError, OSError, IndexError, ValueError):
+        return None, None
+    finally:
+        if writer:
+            writer.close()
+
+async def wait_until_up(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, _ = await request(port, "/api/health", timeout=1.0)
+        if status == 200:
+            return
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not come up")
+
+async def open_stream(port, held):
+    """Open an /api/events stream and keep it open, returns True once the server started sending."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), REQUEST_TIMEOUT)
+    except (asyncio.TimeoutError, OSError):
+        return False
+    held.append(writer)
+    writer.write(b"GET /api/events?channels=status HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    try:
+        return bool(await asyncio.wait_for(reader.read(1), REQUEST_TIMEOUT))
+    except (asyncio.TimeoutError, OSError):
+        return False
+
+def summarize(latencies, failures):
+    if not latencies:
+        return f"all {failures} requests failed or timed out"
+    latencies = sorted(latency * 1000 for latency in latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return (f"median {statistics.median(latencies):.1f} ms, p95 {p95:.1f} ms, max {latencies[-1]:.1f} ms"
+            + (f", {failures} failed or timed out" if failures else ""))
+
+async def run_mode(mode, streams, requests, paths):
+    port = free_port()
+    server = start_server(mode, port)
+    held = []
+    try:
+        await wait_until_up(port)
+        started = time.perf_counter()
+        served = sum(await asyncio.gather(*(open_stream(port, held) for _ in range(streams))))
+        print(f"{mode}: {served}/{streams} event streams served after {time.perf_counter() - started:.1f} s")
+        for path in paths:
+            latencies, failures = [], 0
+            for _ in range(requests):
+                status, latency = await request(port, path)
+                if status == 200:
+                    latencies.append(latency)
+                else:
+                    failures += 1
+            print(f"{mode}: {path}: {summarize(latencies, failures)}")
+    finally:
+        for writer in held:
+            writer.close()
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=list(SERVER_MODULES) + ["both"], default="both")
+    parser.add_argument("--streams", type=int, default=500, help="Idle /api/events connections held open")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per path")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="Path to time while the streams are open (repeatable, default /api/health and /api/davinci/status)")
+    args = parser.parse_args()
+    modes = list(SERVER_MODULES) if args.mode == "both" else [args.mode]
+    for mode in modes:
+        asyncio.run(run_mode(mode, args.streams, args.requests, args.paths or ["/api/health", "/api/davinci/status"]))
+
+if __name__ == '__main__':
+    main()
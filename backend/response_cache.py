@@ -0,0 +1,100 @@
+import hashlib
+import logging
+import threading
+import time
+
+from flask import Response
+
+logger = logging.getLogger('DaVinciAPI.response_cache')
+
+# Seconds a cached response is served. The change poller drops a section as soon as it sees it
+# change, but it only samples sections an /api/events client listens to; otherwise the TTL
+# alone bounds how stale a response can be, so sections that move on their own (render
+# progress, the playhead timecode) only get a short window.
+RESPONSE_CACHE_TTLS = {
+    "project": 10.0,
+    "timeline": 1.0,
+    "mediapool": 2.0,
+    "renderjobs": 1.0,
+}
+
+class CachedResponse:
+    """A serialized JSON body together with its strong ETag."""
+
+    __slots__ = ("body", "etag", "scope", "created")
+
+    def __init__(self, body, scope):
+        self.body = body
+        self.etag = hashlib.sha1(body.encode()).hexdigest()[:20]
+        self.scope = scope
+        self.created = time.monotonic()
+
+class ResponseCache:
+    """Serialized responses of read-only Resolve routes.
+
+    An entry is reused until it is older than its route's TTL or invalidated, by the
+    change poller seeing the section change or by a write, and only within the scope
+    (Resolve connection) it was built in. Serving a cached entry makes no
+    Resolve call. The ETag is a hash of the body, so a rebuilt response that did not
+    change still answers If-None-Match with 304.
+    """
+
+    def __init__(self, ttls=None):
+        self.ttls = dict(RESPONSE_CACHE_TTLS if ttls is None else ttls)
+        self._entries = {}
+        # Bumped by every invalidation, so a body built before one is not cached after it
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+
+    def lookup(self, route, scope=None):
+        """Return the cached response of a route, or None and the generation to pass to store().
+
+        Args:
+            route (str): Route name, one of the TTL keys
+            scope (hashable, optional): Entries built under another scope are not reused
+
+        Returns:
+            tuple: (CachedResponse or None, generation)
+        """
+        with self._lock:
+            entry = self._entries.get(route)
+            if (entry is not None and entry.scope == scope
+                    and time.monotonic() - entry.created < self.ttls.get(route, 0.0)):
+                self._stats["hits"] += 1
+                return entry, None
+            self._stats["misses"] += 1
+            return None, self._generations.get(route, 0)
+
+    def store(self, route, body, generation, scope=None):
+        """Cache a body built after lookup() returned generation, unless the route was invalidated since."""
+        entry = CachedResponse(body, scope)
+        with self._lock:
+            if self._generations.get(route, 0) == generation:
+                self._entries[route] = entry
+        return entry
+
+    def invalidate(self, *routes):
+        """Drop the cached responses of the given routes, or of every route."""
+        with self._lock:
+            for route in routes or set(self._entries) | set(self.ttls):
+                self._generations[route] = self._generations.get(route, 0) + 1
+                if self._entries.pop(route, None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def respond(self, entry, request):
+        """Build the response for a cached entry, 304 if the client already holds it."""
+        if request.if_none_match.contains(entry.etag):
+            with self._lock:
+                self._stats["not_modified"] += 1
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, mimetype='application/json')
+        response.set_etag(entry.etag)
+        # Clients may keep the body but have to revalidate it on every use
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self._stats, ttls=self.ttls, cached=sorted(self._entries))
@@ -0,0 +1,13 @@
+import uvicorn
+from asgi_app import app
+
+# Seconds uvicorn waits for open requests on shutdown; event streams never finish on their own
+SHUTDOWN_TIMEOUT = 2
+
+def main(host='0.0.0.0', port=5001):
+    print(f"Starting server with uvicorn on port {port}")
+    # The connection supervisor is started by the app's lifespan handler
+    uvicorn.run(app, host=host, port=port, log_level="warning", timeout_graceful_shutdown=SHUTDOWN_TIMEOUT)
+
+if __name__ == '__main__':
+    main()
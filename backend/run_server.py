@@ -1,6 +1,17 @@
 from waitress import serve
-from app import app
+from app import app, connection_supervisor
+
+# Worker threads of the waitress server
+WAITRESS_THREADS = 16
+
+def main(host='0.0.0.0', port=5001):
+    print(f"Starting server with waitress on port {port}")
+    # Connects to Resolve in the background, the port is bound without waiting for it
+    connection_supervisor.ensure_started()
+    # Every open /api/events stream holds a worker thread, leave room for regular requests.
+    # Calls into Resolve itself are serialized on the API's single bridge worker thread.
+    # run_asgi.py serves the same routes without a thread per stream.
+    serve(app, host=host, port=port, threads=WAITRESS_THREADS)
 
 if __name__ == '__main__':
-    print("Starting server with waitress on port 5001")
-    serve(app, host='0.0.0.0', port=5001) 
\ No newline at end of file
+    main()
@@ -0,0 +1,107 @@
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+# The stand-in is importable under the real module's name, like Resolve's Modules folder
+sys.path.insert(0, os.path.join(BACKEND_DIR, "fake_resolve"))
+
+import DaVinciResolveScript as fake_resolve
+from davinciapi.davinciapi import DaVinciResolveAPI
+from davinciapi.metadata_store import MetadataStore
+from davinciapi.paths import DATA_DIR_ENV
+
+# Synthetic project shapes the route benchmarks run against
+PROJECT_SIZES = {
+    "episode": dict(video_tracks=4, audio_tracks=8, items_per_track=150, clips=2000, folders=20),
+    "conform": dict(video_tracks=8, audio_tracks=16, subtitle_tracks=1, items_per_track=400, clips=10000, folders=100),
+}
+
+def pytest_addoption(parser):
+    parser.addoption("--bridge-latency-ms", type=float, default=0.0,
+                     help="Simulated round-trip time of every fake Resolve bridge call")
+
+@pytest.fixture(scope="session", autouse=True)
+def data_dir(tmp_path_factory):
+    """Keep scan results and caches written during the tests out of the user's data directory."""
+    path = tmp_path_factory.mktemp("data")
+    previous = os.environ.get(DATA_DIR_ENV)
+    os.environ[DATA_DIR_ENV] = str(path)
+    yield path
+    if previous is None:
+        os.environ.pop(DATA_DIR_ENV, None)
+    else:
+        os.environ[DATA_DIR_ENV] = previous
+
+@pytest.fixture(scope="session")
+def app_module():
+    # Per-call INFO logging would dominate the measurements
+    logging.getLogger('DaVinciAPI').setLevel(logging.WARNING)
+    import app
+    return app
+
+@pytest.fixture(scope="session", params=list(PROJECT_SIZES))
+def fake_project(request):
+    return fake_resolve.generate_project(name=request.param, **PROJECT_SIZES[request.param])
+
+@pytest.fixture
+def resolve_api(request, fake_project, app_module, monkeypatch):
+    """A DaVinciResolveAPI on a fresh fake Resolve, installed as app.davinci_api."""
+    resolve = fake_resolve.Resolve()
+    resolve.GetProjectManager().add_project(fake_project)
+    fake_resolve.set_latency(request.config.getoption("--bridge-latency-ms") / 1000.0)
+    api = DaVinciResolveAPI(resolve=resolve)
+    monkeypatch.setattr(app_module, "davinci_api", api)
+    yield api
+    fake_resolve.set_latency(0.0)
+
+@pytest.fixture
+def client(app_module, resolve_api):
+    return app_module.app.test_client()
+
+@pytest.fixture(scope="session")
+def asgi_module(app_module):
+    pytest.importorskip("starlette")
+    pytest.importorskip("a2wsgi")
+    import asgi_app
+    return asgi_app
+
+@pytest.fixture
+def asgi_client(asgi_module, resolve_api):
+    pytest.importorskip("httpx")
+    from starlette.testclient import TestClient
+    return TestClient(asgi_module.app)
+
+@pytest.fixture
+def metadata_store(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "metadata.sqlite3"))
+    yield store
+    store.close()
+
+@pytest.fixture
+def restart_backend(app_module, fake_project, metadata_store, monkeypatch):
+    """Installs a new API on a new fake Resolve sharing the metadata store, as after a backend restart."""
+    def restart():
+        resolve = fake_resolve.Resolve()
+        resolve.GetProjectManager().add_project(fake_project)
+        api = DaVinciResolveAPI(resolve=resolve, metadata_store=metadata_store)
+        monkeypatch.setattr(app_module, "davinci_api", api)
+        return api
+    return restart
+
+@pytest.fixture
+def wait_for_thumbnail(client):
+    """Requests a thumbnail until it is no longer queued and returns that response."""
+    def wait(path, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            response = client.get(path)
+            if response.headers["X-Thumbnail-State"] != "queued":
+                return response
+            time.sleep(0.01)
+        raise AssertionError("Thumbnail was not generated in time")
+    return wait
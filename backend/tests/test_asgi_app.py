@@ -0,0 +1,22 @@
+"""The ASGI entry point: native routes and the Flask routes mounted below them.
+
+Run with:  python -m pytest tests/test_asgi_app.py
+"""
+
+def access_count(asgi_module):
+    stats = asgi_module.flask_app.access_log.get_stats()
+    return stats["logged"] + stats["sampled_out"]
+
+def test_native_health_route_matches_flask(asgi_client, client):
+    response = asgi_client.get("/api/health")
+    assert response.json() == client.get("/api/health").get_json()
+
+def test_native_and_mounted_routes_allow_any_origin(asgi_client):
+    for path in ("/api/health", "/api/davinci/status"):
+        assert asgi_client.get(path).headers["Access-Control-Allow-Origin"] == "*"
+
+def test_every_request_is_counted_once_by_the_access_log(asgi_module, asgi_client):
+    for path in ("/api/health", "/api/davinci/status"):
+        before = access_count(asgi_module)
+        assert asgi_client.get(path).status_code == 200
+        assert access_count(asgi_module) == before + 1
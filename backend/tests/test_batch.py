@@ -0,0 +1,31 @@
+"""Batch writes: dry runs, per-operation results and the operation limit.
+
+Run with:  python -m pytest tests/test_batch.py
+"""
+import DaVinciResolveScript as fake_resolve
+
+def test_batch_write(client, fake_project):
+    clips = client.get("/api/davinci/mediapool/clips?limit=200&wait=1").get_json()["clips"]
+    items = client.get("/api/davinci/timeline/items?track_type=video&limit=50").get_json()["items"]
+    operations = [{"op": "SetClipProperty", "clip": clip["id"], "key": "Comments", "value": "Selected"} for clip in clips]
+    operations += [{"op": "SetMetadata", "clip": clip["id"], "metadata": {"Scene": "12", "Take": "3"}} for clip in clips]
+    operations += [{"op": "SetClipColor", "item": item["id"], "color": "Orange"} for item in items]
+    operations += [{"op": "AddMarker", "timeline": "current", "frame": 7, "color": "Red", "name": "Batch"},
+                   {"op": "AddMarker", "timeline": "current", "frame": 7, "color": "Red", "name": "Duplicate"},
+                   {"op": "SetClipColor", "clip": "no-such-clip", "color": "Orange"},
+                   {"op": "DeleteClips", "clip": clips[0]["id"]}]
+    try:
+        dry = client.post("/api/davinci/batch", json={"operations": operations, "dry_run": True}).get_json()
+        assert dry["dry_run"] and dry["failed"] == 3, [r for r in dry["results"] if not r["ok"]]
+        assert dry["results"][0]["current"] != "Selected"
+
+        result = client.post("/api/davinci/batch", json={"operations": operations}).get_json()
+        assert [r["index"] for r in result["results"]] == list(range(len(operations)))
+        assert result["failed"] == 3 and result["targets"] == len(clips) + len(items) + 2
+        assert "Duplicate" not in str(client.get("/api/davinci/markers?source=timeline&refresh=1").get_json())
+
+        properties = client.get(f"/api/davinci/clips/properties?ids={clips[0]['id']}&keys=Comments").get_json()
+        assert properties["columns"] == [["Selected"]]
+        assert client.post("/api/davinci/batch", json={"operations": operations * 300}).status_code == 400
+    finally:
+        fake_project._timelines[0]._markers.pop(7, None)
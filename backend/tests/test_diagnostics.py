@@ -0,0 +1,16 @@
+"""The diagnostics route: reusing recent results and the detail levels.
+
+Run with:  python -m pytest tests/test_diagnostics.py
+"""
+import DaVinciResolveScript as fake_resolve
+
+def test_diagnostics_reuses_recent_results(client):
+    client.get("/api/davinci/snapshot?sections=status,project")
+    fake_resolve.reset_call_count()
+    diagnostics = client.get("/api/diagnostics").get_json()
+    # Status and project were fetched moments ago, so diagnostics makes no bridge calls
+    assert fake_resolve.get_call_count() == 0
+    assert diagnostics["project_info"]["name"] == client.get("/api/davinci/project").get_json()["name"]
+    assert "python_path" not in diagnostics["system"]
+    assert "bridge_calls" not in diagnostics["backend"]
+    assert client.get("/api/diagnostics?detail=everything").status_code == 400
@@ -0,0 +1,55 @@
+"""Bulk timeline exports: the route, reuse of unchanged timelines and files evicted while downloaded.
+
+Run with:  python -m pytest tests/test_export_jobs.py
+"""
+import io
+import os
+import zipfile
+
+import DaVinciResolveScript as fake_resolve
+from davinciapi.export_jobs import ExportJobManager
+
+def test_timeline_export(client, fake_project):
+    other = fake_resolve.Timeline("Alternate Cut")
+    other._tracks["video"].append(list(fake_project._timelines[0]._tracks["video"][0][:10]))
+    fake_project._timelines.append(other)
+    try:
+        body = {"timelines": ["Alternate Cut", fake_project._timelines[0].GetUniqueId()], "formats": ["edl", "otio"],
+                "wait": True}
+        job = client.post("/api/davinci/exports", json=body).get_json()
+        assert job["state"] == "done" and job["progress"] == {"done": 4, "total": 4, "reused": 0, "failed": 0}, job
+
+        download = client.get(f"/api/davinci/exports/{job['id']}/download")
+        names = zipfile.ZipFile(io.BytesIO(download.get_data())).namelist()
+        edit = fake_project._timelines[0].GetName()
+        assert sorted(names) == ["edl/Alternate Cut.edl", f"edl/{edit}.edl", "otio/Alternate Cut.otio", f"otio/{edit}.otio"]
+
+        # Unchanged timelines are not exported again
+        job = client.post("/api/davinci/exports", json=body).get_json()
+        assert job["progress"]["reused"] == 4
+        assert client.post("/api/davinci/exports", json=dict(body, formats=["mp4"])).status_code == 400
+    finally:
+        fake_project._timelines.remove(other)
+
+def run_export(manager, timeline):
+    listed = [(timeline.GetUniqueId(), timeline.GetName(), timeline)]
+    job = manager.start(lambda: (listed, None), lambda: fake_resolve.Resolve, timelines=[timeline.GetUniqueId()])
+    job.done.wait()
+    return job
+
+def test_evicted_export_outlives_its_download():
+    manager = ExportJobManager(max_files=1)
+    job = run_export(manager, fake_resolve.Timeline("First"))
+    path = job.results[0]["path"]
+    chunks = manager.stream_zip(job)
+    # The first chunk is written while the export file is open
+    data = [next(chunks)]
+
+    run_export(manager, fake_resolve.Timeline("Second"))
+    assert os.path.exists(path)
+    data.extend(chunks)
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(data)))
+    assert archive.namelist() == ["edl/First.edl"]
+    assert archive.read("edl/First.edl").startswith(b"TITLE: First")
+    # Deleted once the download ended
+    assert not os.path.exists(path)
@@ -0,0 +1,21 @@
+"""The cache of ProjectManager/Project/Timeline/MediaPool handles.
+
+Run with:  python -m pytest tests/test_handle_cache.py
+"""
+import DaVinciResolveScript as fake_resolve
+
+def test_project_switch_is_seen_by_the_next_call(resolve_api):
+    first = resolve_api.get_basic_project_info()
+    switched = fake_resolve.generate_project(name="switched", items_per_track=2, timelines=1)
+    resolve_api.resolve._target.GetProjectManager().add_project(switched)
+    assert resolve_api.get_basic_project_info()["name"] == "switched" != first["name"]
+    assert resolve_api.get_handle_cache_stats()["cached"]["project"] == switched.GetUniqueId()
+
+def test_project_manager_is_kept_between_calls(resolve_api):
+    resolve_api.get_snapshot()
+    resolve_api.get_snapshot()
+    stats = resolve_api.get_handle_cache_stats()["handles"]
+    assert stats["project_manager"]["misses"] == 1
+    # The second call checks the project once and finds it unchanged
+    assert stats["project"]["misses"] == 1
+    assert stats["project"]["revalidations"] == 1
@@ -0,0 +1,50 @@
+"""The media pool crawler: serving stored inventories and not blocking clip access on a re-crawl.
+
+Run with:  python -m pytest tests/test_mediapool_crawler.py
+"""
+import threading
+
+from davinciapi import mediapool_crawler
+
+def test_clip_access_does_not_wait_for_recrawl(client, resolve_api, monkeypatch):
+    clips = client.get("/api/davinci/mediapool/clips?limit=5&wait=1").get_json()["clips"]
+    crawler = resolve_api.media_pool_crawler
+    crawler.inventory.created -= crawler.max_age
+    # Hold the background re-crawl until both requests have been answered
+    release = threading.Event()
+    crawl = mediapool_crawler.crawl_media_pool
+    monkeypatch.setattr(mediapool_crawler, "crawl_media_pool",
+                        lambda *args, **kwargs: release.wait(5) and crawl(*args, **kwargs))
+    try:
+        response = client.get(f"/api/davinci/clips/properties?ids={clips[0]['id']}&keys=FPS")
+        assert response.status_code == 200 and response.get_json()["missing"] == []
+        operation = {"op": "SetClipProperty", "clip": clips[0]["id"], "key": "Comments", "value": "Aged"}
+        result = client.post("/api/davinci/batch", json={"operations": [operation], "dry_run": True}).get_json()
+        assert result["succeeded"] == 1
+        assert crawler.crawling
+    finally:
+        release.set()
+        resolve_api.get_media_pool_inventory(wait=True)
+
+def test_media_pool_tree_served_from_store_after_restart(app_module, metadata_store, restart_backend):
+    client = app_module.app.test_client()
+    restart_backend()
+    client.get("/api/davinci/mediapool/tree?wait=1")
+    metadata_store.flush()
+
+    api = restart_backend()
+    response = client.get("/api/davinci/mediapool/tree")
+    assert response.status_code == 200 and response.get_json()["crawl"]["source"] == "store"
+    # The reconciling crawl reuses the stored clip properties of unchanged folders
+    api.get_media_pool_inventory(wait=True)
+    assert api.media_pool_crawler.get_state()["last_crawl"]["property_reads"] == 0
+
+def test_unchanged_media_pool_is_not_stored_again(app_module, metadata_store, restart_backend):
+    client = app_module.app.test_client()
+    restart_backend()
+    client.get("/api/davinci/mediapool/tree?wait=1")
+    metadata_store.flush()
+    writes = metadata_store.get_stats()["writes"]
+    client.get("/api/davinci/mediapool/tree?refresh=1&wait=1")
+    metadata_store.flush()
+    assert metadata_store.get_stats()["writes"] == writes
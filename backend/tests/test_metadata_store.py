@@ -0,0 +1,68 @@
+"""The SQLite metadata store: failed writes, eviction and opening damaged files.
+
+Run with:  python -m pytest tests/test_metadata_store.py
+"""
+import os
+import sqlite3
+
+from davinciapi import metadata_store
+from davinciapi.metadata_store import MetadataStore
+
+def test_metadata_store_retries_failed_writes(tmp_path):
+    path = str(tmp_path / "metadata.sqlite3")
+    store = MetadataStore(path=path, flush_interval=60)
+    store._db.execute("PRAGMA busy_timeout = 0")
+    # Another connection holding the write lock makes the flush fail with "database is locked"
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    store.put("project", "record", "1", {"value": 1})
+    store.flush()
+    stats = store.get_stats()
+    assert (stats["errors"], stats["pending"], stats["records"]) == (1, 1, 0)
+
+    blocker.execute("ROLLBACK")
+    blocker.close()
+    store.put("project", "record", "2", {"value": 2})
+    store.flush()
+    stats = store.get_stats()
+    assert (stats["errors"], stats["pending"], stats["records"]) == (1, 0, 2)
+    store.close()
+
+def test_metadata_store_eviction(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "metadata.sqlite3"), max_bytes=4096)
+    for index in range(20):
+        store.put("project", "record", str(index), {"payload": [os.urandom(16).hex() for _ in range(20)]})
+        store.flush()
+    assert store.get("project", "record", "0") is None
+    assert store.get("project", "record", "19") is not None
+    assert store.get("project", "record") == store.get("project", "record", "19")
+    assert 0 < store.get_stats()["bytes"] <= 4096
+    store.close()
+
+def write_damaged_store(tmp_path):
+    path = tmp_path / "metadata.sqlite3"
+    path.write_bytes(b"not a database" * 100)
+    return str(path)
+
+def test_damaged_store_is_moved_aside(tmp_path):
+    path = write_damaged_store(tmp_path)
+    store = MetadataStore(path=path)
+    assert (tmp_path / "metadata.sqlite3.corrupt").exists()
+    store.put("project", "record", "1", {"value": 1})
+    store.flush()
+    assert store.get_stats()["records"] == 1
+    store.close()
+
+def test_damaged_store_that_cannot_be_moved_falls_back_to_memory(tmp_path, monkeypatch):
+    path = write_damaged_store(tmp_path)
+
+    def replace(source, target):
+        raise PermissionError(f"{source} is in use")
+
+    monkeypatch.setattr(metadata_store.os, "replace", replace)
+    store = MetadataStore(path=path)
+    assert store.get_stats()["path"] == ":memory:"
+    store.put("project", "record", "1", {"value": 1})
+    store.flush()
+    assert store.get("project", "record", "1") == {"value": 1}
+    store.close()
@@ -0,0 +1,15 @@
+"""The render monitor: what /api/events clients of the render channel receive.
+
+Run with:  python -m pytest tests/test_render_monitor.py
+"""
+
+def test_render_subscribers_get_current_jobs(app_module, resolve_api):
+    jobs = resolve_api.get_render_jobs()["jobs"]
+    assert jobs
+    # No job changes after this poll, yet a client joining now still gets the whole queue
+    subscription = app_module.subscribe_events("render")
+    try:
+        event, data = subscription.get(timeout=1)
+        assert event == "render" and [job["id"] for job in data["jobs"]] == [job["id"] for job in jobs]
+    finally:
+        app_module.event_broker.unsubscribe(subscription)
@@ -0,0 +1,38 @@
+"""The response cache of the read-only Resolve routes.
+
+Run with:  python -m pytest tests/test_response_cache.py
+"""
+import DaVinciResolveScript as fake_resolve
+from response_cache import ResponseCache
+
+def test_cached_responses_make_no_bridge_calls(client):
+    etag = client.get("/api/davinci/project").headers["ETag"]
+    fake_resolve.reset_call_count()
+    assert client.get("/api/davinci/project").status_code == 200
+    assert client.get("/api/davinci/project", headers={"If-None-Match": etag}).status_code == 304
+    assert fake_resolve.get_call_count() == 0
+
+def test_poller_change_drops_the_section(client, app_module, fake_project):
+    before = client.get("/api/davinci/project").get_json()
+    name = fake_project.GetName()
+    fake_project._name = "Renamed"
+    try:
+        # Still inside the TTL, until the poller reports the change
+        assert client.get("/api/davinci/project").get_json() == before
+        app_module.change_poller.on_change("project")
+        assert client.get("/api/davinci/project").get_json()["name"] == "Renamed"
+    finally:
+        fake_project._name = name
+
+def test_body_built_across_an_invalidation_is_not_cached():
+    cache = ResponseCache(ttls={"project": 60.0})
+    entry, generation = cache.lookup("project")
+    assert entry is None
+    # The section changes while the body is being built
+    cache.invalidate("project")
+    cache.store("project", '{"name": "old"}', generation)
+    assert cache.lookup("project")[0] is None
+
+    entry, generation = cache.lookup("project")
+    cache.store("project", '{"name": "new"}', generation)
+    assert cache.lookup("project")[0].body == '{"name": "new"}'
@@ -0,0 +1,268 @@
+"""Benchmarks of every Flask route against the fake Resolve at realistic project sizes.
+
+Run with:  python -m pytest tests/test_route_benchmarks.py [--bridge-latency-ms 0.2]
+Each benchmark records the number of bridge calls one request makes in extra_info.
+What the routes return is tested per subsystem in the other tests/test_<module>.py files.
+"""
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import DaVinciResolveScript as fake_resolve
+from davinciapi.davinciapi import DaVinciResolveAPI
+
+def bench_get(benchmark, client, path, expected_status=200):
+    """Warm the route once (recording its bridge calls), then benchmark it."""
+    fake_resolve.reset_call_count()
+    response = client.get(path)
+    assert response.status_code == expected_status, response.get_data(as_text=True)
+    benchmark.extra_info["bridge_calls"] = fake_resolve.get_call_count()
+
+    def request():
+        response = client.get(path)
+        response.get_data()
+        return response
+
+    response = benchmark(request)
+    assert response.status_code == expected_status
+    return response
+
+@pytest.mark.parametrize("path", [
+    "/api/health",
+    "/api/test",
+    "/api/davinci/status",
+    "/api/davinci/project",
+    "/api/davinci/timeline",
+    "/api/davinci/mediapool",
+    "/api/davinci/renderjobs",
+    "/api/diagnostics",
+    "/api/diagnostics?detail=full",
+    "/api/davinci/snapshot",
+    "/api/metrics",
+])
+def test_read_route(benchmark, client, path):
+    bench_get(benchmark, client, path)
+
+def test_diagnostics_reuses_recent_results(benchmark, client):
+    client.get("/api/davinci/snapshot?sections=status,project")
+    bench_get(benchmark, client, "/api/diagnostics")
+
+@pytest.mark.parametrize("path", [
+    "/api/davinci/project",
+    "/api/davinci/timeline",
+    "/api/davinci/mediapool",
+    "/api/davinci/renderjobs",
+])
+def test_conditional_get(benchmark, client, path):
+    etag = client.get(path).headers["ETag"]
+    fake_resolve.reset_call_count()
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    benchmark.extra_info["bridge_calls"] = fake_resolve.get_call_count()
+
+    def request():
+        return client.get(path, headers={"If-None-Match": etag})
+
+    assert benchmark(request).status_code == 304
+
+def test_timeline_items_index_build(benchmark, client):
+    bench_get(benchmark, client, "/api/davinci/timeline/items?refresh=1&limit=100")
+
+def test_timeline_items_index_build_uninstrumented(benchmark, client, resolve_api, app_module, monkeypatch):
+    # Baseline for the cost of the bridge call instrumentation
+    api = DaVinciResolveAPI(resolve=resolve_api.resolve._target, instrumented=False)
+    monkeypatch.setattr(app_module, "davinci_api", api)
+    bench_get(benchmark, client, "/api/davinci/timeline/items?refresh=1&limit=100")
+
+def test_timeline_items_page(benchmark, client):
+    first = client.get("/api/davinci/timeline/items?limit=500").get_json()
+    bench_get(benchmark, client, f"/api/davinci/timeline/items?limit=500&cursor={first['next_cursor']}")
+
+def test_timeline_items_frame_query(benchmark, client, fake_project):
+    frame = fake_project.GetCurrentTimeline().GetStartFrame() + 1000
+    response = bench_get(benchmark, client, f"/api/davinci/timeline/items?frame={frame}")
+    assert response.get_json()["total"] > 0
+
+def test_timeline_items_range_query(benchmark, client, fake_project):
+    start = fake_project.GetCurrentTimeline().GetStartFrame()
+    bench_get(benchmark, client, f"/api/davinci/timeline/items?start={start}&end={start + 2400}&limit=5000")
+
+def test_timeline_items_ndjson(benchmark, client):
+    bench_get(benchmark, client, "/api/davinci/timeline/items?format=ndjson")
+
+def test_markers_index_build(benchmark, client):
+    bench_get(benchmark, client, "/api/davinci/markers?refresh=1")
+
+def test_markers_range_query(benchmark, client, fake_project):
+    start = fake_project._timelines[0]._start_frame
+    bench_get(benchmark, client, f"/api/davinci/markers?start={start}&end={start + 2400}&color=Blue")
+
+def test_thumbnail(benchmark, client, fake_project, wait_for_thumbnail):
+    start = fake_project._timelines[0]._start_frame
+    items = client.get(f"/api/davinci/timeline/items?track_type=video&frame={start}").get_json()["items"]
+    path = f"/api/davinci/thumbnail/{max(items, key=lambda item: item['track'])['id']}"
+    wait_for_thumbnail(path)
+    bench_get(benchmark, client, path)
+
+def test_batch_write(benchmark, client, fake_project):
+    clips = client.get("/api/davinci/mediapool/clips?limit=200&wait=1").get_json()["clips"]
+    items = client.get("/api/davinci/timeline/items?track_type=video&limit=50").get_json()["items"]
+    operations = [{"op": "SetClipProperty", "clip": clip["id"], "key": "Comments", "value": "Selected"} for clip in clips]
+    operations += [{"op": "SetMetadata", "clip": clip["id"], "metadata": {"Scene": "12", "Take": "3"}} for clip in clips]
+    operations += [{"op": "SetClipColor", "item": item["id"], "color": "Orange"} for item in items]
+    operations += [{"op": "AddMarker", "timeline": "current", "frame": 7, "color": "Red", "name": "Batch"}]
+
+    fake_resolve.reset_call_count()
+    assert client.post("/api/davinci/batch", json={"operations": operations}).get_json()["failed"] == 0
+    benchmark.extra_info["bridge_calls"] = fake_resolve.get_call_count()
+
+    benchmark(lambda: client.post("/api/davinci/batch", json={"operations": operations}))
+    fake_project._timelines[0]._markers.pop(7, None)
+
+def test_timeline_export(benchmark, client, fake_project):
+    body = {"timelines": [fake_project._timelines[0].GetUniqueId()], "formats": ["edl", "otio"], "wait": True}
+    assert client.post("/api/davinci/exports", json=body).get_json()["state"] == "done"
+    # Unchanged timelines are reused, so this measures the check against the previous export
+    benchmark(lambda: client.post("/api/davinci/exports", json=body))
+
+def test_timeline_scan(benchmark, client):
+    fake_resolve.reset_call_count()
+    response = client.post("/api/davinci/scans", json={"wait": True})
+    assert response.status_code == 200 and response.get_json()["state"] == "done", response.get_data(as_text=True)
+    benchmark.extra_info["bridge_calls"] = fake_resolve.get_call_count()
+
+    def scan():
+        return client.post("/api/davinci/scans", json={"wait": True})
+
+    assert benchmark(scan).get_json()["state"] == "done"
+
+def test_timeline_summary(benchmark, client):
+    client.post("/api/davinci/scans", json={"wait": True})
+    bench_get(benchmark, client, "/api/davinci/timelines/summary")
+
+def test_media_pool_tree(benchmark, client):
+    client.get("/api/davinci/mediapool/tree?wait=1")
+    bench_get(benchmark, client, "/api/davinci/mediapool/tree")
+
+def test_media_pool_clips(benchmark, client):
+    client.get("/api/davinci/mediapool/tree?wait=1")
+    bench_get(benchmark, client, "/api/davinci/mediapool/clips?limit=500")
+
+def test_media_pool_incremental_crawl(benchmark, client):
+    client.get("/api/davinci/mediapool/tree?wait=1")
+    bench_get(benchmark, client, "/api/davinci/mediapool/tree?refresh=1&wait=1")
+
+def test_media_pool_full_crawl(benchmark, client):
+    bench_get(benchmark, client, "/api/davinci/mediapool/tree?refresh=full&wait=1")
+
+@pytest.mark.parametrize("keys", ["FPS", "FPS,Resolution,Frames,Video Codec,Clip Name"], ids=["per_key", "whole_dict"])
+def test_clip_properties(benchmark, client, keys):
+    clips = client.get("/api/davinci/mediapool/clips?limit=500&wait=1").get_json()["clips"]
+    ids = ",".join(clip["id"] for clip in clips)
+    bench_get(benchmark, client, f"/api/davinci/clips/properties?ids={ids}&keys={keys}")
+
+def test_events_first_frame(benchmark, client):
+    def first_event():
+        response = client.get("/api/events?channels=status", buffered=False)
+        for chunk in response.response:
+            if b"event:" in (chunk if isinstance(chunk, bytes) else chunk.encode()):
+                break
+        response.close()
+        return response
+
+    response = benchmark(first_event)
+    assert response.status_code == 200
+
+def test_concurrent_timeline_reads(benchmark, app_module, resolve_api):
+    # Ten dashboards refreshing at once share bridge jobs instead of queueing ten of them
+    def burst():
+        statuses = []
+        def get():
+            statuses.append(app_module.app.test_client().get("/api/davinci/timeline").status_code)
+        threads = [threading.Thread(target=get) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    statuses = benchmark(burst)
+    assert statuses == [200] * 10
+    benchmark.extra_info["coalesced"] = resolve_api.bridge.get_stats()["coalesced"]
+
+@pytest.mark.parametrize("path", [
+    "/api/health",
+    "/api/davinci/status",
+    "/api/davinci/timeline",
+])
+def test_asgi_read_route(benchmark, asgi_client, path):
+    fake_resolve.reset_call_count()
+    assert asgi_client.get(path).status_code == 200
+    benchmark.extra_info["bridge_calls"] = fake_resolve.get_call_count()
+    response = benchmark(asgi_client.get, path)
+    assert response.status_code == 200
+
+def test_asgi_events_first_frame(benchmark, asgi_module, resolve_api):
+    async def first_event():
+        disconnected = asyncio.Event()
+        body = []
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                body.append(message["status"])
+            elif b"event:" in message.get("body", b""):
+                body.append(message["body"])
+                disconnected.set()
+
+        scope = {"type": "http", "method": "GET", "path": "/api/events", "raw_path": b"/api/events",
+                 "query_string": b"channels=status", "headers": [], "scheme": "http", "http_version": "1.1",
+                 "server": ("testserver", 80), "client": ("testclient", 50000), "root_path": ""}
+        await asyncio.wait_for(asgi_module.app(scope, receive, send), 10)
+        return body
+
+    status, frame = benchmark(lambda: asyncio.run(first_event()))
+    assert status == 200
+    assert frame.startswith(b"event: status")
+    # The stream unsubscribed when the client went away
+    assert asgi_module.flask_app.event_broker.subscriber_count == 0
+
+def test_warm_start_timeline_items(benchmark, app_module, metadata_store, restart_backend):
+    client = app_module.app.test_client()
+    restart_backend()
+    fake_resolve.reset_call_count()
+    assert client.get("/api/davinci/timeline/items?limit=500").status_code == 200
+    benchmark.extra_info["cold_bridge_calls"] = fake_resolve.get_call_count()
+    metadata_store.flush()
+
+    def first_request():
+        response = client.get("/api/davinci/timeline/items?limit=500")
+        assert response.status_code == 200
+        return response
+
+    def restart():
+        restart_backend()
+
+    benchmark.pedantic(first_request, setup=restart, rounds=5)
+
+def test_warm_start_media_pool_tree(benchmark, app_module, metadata_store, restart_backend):
+    client = app_module.app.test_client()
+    restart_backend()
+    client.get("/api/davinci/mediapool/tree?wait=1")
+    metadata_store.flush()
+
+    def first_request():
+        response = client.get("/api/davinci/mediapool/tree")
+        assert response.status_code == 200
+        return response
+
+    def restart():
+        restart_backend()
+
+    benchmark.pedantic(first_request, setup=restart, rounds=5)
@@ -0,0 +1,43 @@
+"""Timeline summary scans: scanning every project and keeping the summaries in the metadata store.
+
+Run with:  python -m pytest tests/test_scan_jobs.py
+"""
+import DaVinciResolveScript as fake_resolve
+from davinciapi.davinciapi import DaVinciResolveAPI
+from davinciapi.metadata_store import MetadataStore
+
+def test_timeline_scan_all_projects(client, resolve_api, fake_project):
+    project_manager = resolve_api.resolve.GetProjectManager()
+    other = fake_resolve.generate_project(name="pickups", video_tracks=1, audio_tracks=2, items_per_track=20,
+                                          clips=20, folders=1, timelines=3)
+    project_manager.add_project(other, make_current=False)
+
+    job = client.post("/api/davinci/scans", json={"all_projects": True, "wait": True}).get_json()
+    assert job["state"] == "done" and job["progress"]["projects_done"] == 2, job
+    # The project that was open before the scan is loaded again
+    assert project_manager.GetCurrentProject().GetUniqueId() == fake_project.GetUniqueId()
+
+    summary = client.get(f"/api/davinci/timelines/summary?project_id={other.GetUniqueId()}").get_json()
+    assert [timeline["name"] for timeline in summary["timelines"]] == ["pickups Edit", "pickups Edit 2", "pickups Edit 3"]
+    assert summary["timelines"][0]["item_counts"] == {"video": 20, "audio": 40, "subtitle": 0}
+    assert client.get(f"/api/davinci/scans/{job['id']}").get_json()["state"] == "done"
+
+def start_backend(project, store):
+    resolve = fake_resolve.Resolve()
+    resolve.GetProjectManager().add_project(project)
+    return DaVinciResolveAPI(resolve=resolve, metadata_store=store)
+
+def test_summaries_survive_a_restart(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "metadata.sqlite3"))
+    project = fake_resolve.generate_project(name="scanned", items_per_track=5, timelines=2)
+    api = start_backend(project, store)
+    assert api.start_timeline_scan(wait=True)["state"] == "done"
+    summary = api.get_timeline_summary()
+    store.flush()
+
+    api = start_backend(project, store)
+    assert api.get_timeline_summary() == summary
+    totals = api.scan_jobs.list_summaries()
+    assert [(entry["project_id"], entry["timeline_count"]) for entry in totals] == [(project.GetUniqueId(), 2)]
+    assert "timelines" not in totals[0]
+    store.close()
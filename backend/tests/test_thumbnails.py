@@ -0,0 +1,80 @@
+"""Thumbnails of timeline items: the route, the bounded cache and reading them from Resolve.
+
+Run with:  python -m pytest tests/test_thumbnails.py
+"""
+import time
+
+import pytest
+
+import DaVinciResolveScript as fake_resolve
+
+@pytest.fixture
+def timeline(resolve_api):
+    project = resolve_api.resolve._target.GetProjectManager().GetCurrentProject()
+    return project.GetCurrentTimeline()
+
+def test_thumbnail_route(client, fake_project, wait_for_thumbnail):
+    start = fake_project._timelines[0]._start_frame
+    items = client.get(f"/api/davinci/timeline/items?track_type=video&frame={start}").get_json()["items"]
+    # Only the topmost video item under the playhead has a thumbnail
+    covered, item_id = items[0]["id"], max(items, key=lambda item: item["track"])["id"]
+    assert client.get(f"/api/davinci/thumbnail/{covered}?format=json").get_json()["state"] == "unavailable"
+    path = f"/api/davinci/thumbnail/{item_id}"
+    first = client.get(path)
+    assert first.status_code == 202 and first.mimetype == "image/svg+xml"
+
+    response = wait_for_thumbnail(path)
+    assert response.status_code == 200 and response.headers["X-Thumbnail-State"] == "ready"
+    assert response.mimetype in ("image/webp", "image/jpeg", "image/png")
+    assert client.get(path, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+def test_thumbnail_entries_are_bounded(tmp_path):
+    from davinciapi.thumbnails import ThumbnailCache, ThumbnailService
+    service = ThumbnailService(cache=ThumbnailCache(directory=str(tmp_path)), max_entries=4)
+    grab = lambda: {"image": {"width": 2, "height": 1, "data": "AAAA////"}}
+    for index in range(10):
+        item = {"id": str(index), "start": 0, "end": 1, "media_pool_item_id": "clip"}
+        while service.request("project", item, grab)["state"] != "ready":
+            time.sleep(0.01)
+    stats = service.get_stats()
+    assert stats["generated"] == 10 and stats["states"] == {"ready": 4}
+
+def test_thumbnail_png_without_pillow(monkeypatch):
+    from davinciapi import thumbnails
+    monkeypatch.setattr(thumbnails, "Image", None)
+    image = {"width": 2, "height": 1, "data": "AAAA////"}
+    data, mimetype = thumbnails.encode_thumbnail({"image": image})
+    assert mimetype == "image/png" and data.startswith(b"\x89PNG")
+
+def grab(resolve_api, timecode):
+    resolve_api.get_timeline_info()
+    timeline_id = resolve_api._cached_handle_id("timeline")
+    return resolve_api.bridge.run(resolve_api._grab_thumbnail, (timeline_id, timecode))
+
+def test_playhead_is_restored_when_the_grab_fails(resolve_api, timeline, monkeypatch):
+    playhead = timeline.GetCurrentTimecode()
+
+    def fail():
+        raise RuntimeError("Resolve went away")
+
+    monkeypatch.setattr(timeline, "GetCurrentClipThumbnailImage", fail)
+    with pytest.raises(RuntimeError):
+        grab(resolve_api, "01:00:01:00")
+    assert timeline.GetCurrentTimecode() == playhead
+
+def test_playhead_already_on_the_frame_is_not_moved(resolve_api, timeline, monkeypatch):
+    moves = []
+    set_timecode = timeline.SetCurrentTimecode
+    monkeypatch.setattr(timeline, "SetCurrentTimecode", lambda timecode: moves.append(timecode) or set_timecode(timecode))
+    grab(resolve_api, timeline.GetCurrentTimecode())
+    assert moves == []
+    grab(resolve_api, "01:00:01:00")
+    assert len(moves) == 2
+
+def test_fake_playhead_uses_drop_frame_labels():
+    timeline = fake_resolve.Timeline("DF", frame_rate="29.97", drop_frame=True)
+    assert timeline.SetCurrentTimecode("00:01:00;02")
+    assert timeline._current_frame == 1800
+    assert timeline.GetCurrentTimecode() == "00:01:00;02"
+    # ;00 and ;01 do not exist at the start of minute 1
+    assert not timeline.SetCurrentTimecode("00:01:00;00")
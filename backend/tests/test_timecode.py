@@ -0,0 +1,122 @@
+"""Correctness of the timecode engine against known drop-frame edge cases, and its speed in bulk.
+
+Run with:  python -m pytest tests/test_timecode.py
+"""
+import pytest
+
+import DaVinciResolveScript as fake_resolve
+from davinciapi import timecode
+from davinciapi.davinciapi import DaVinciResolveAPI
+from davinciapi.timecode import FrameRate
+
+# (fps, drop_frame, frame, timecode) pairs around minute, ten-minute, hour and day boundaries
+KNOWN_TIMECODES = [
+    (24, False, 0, "00:00:00:00"),
+    (24, False, 86400, "01:00:00:00"),
+    (23.976, False, 86400, "01:00:00:00"),
+    (25, False, 90000, "01:00:00:00"),
+    (30, False, 1800, "00:01:00:00"),
+    (29.97, False, 107892, "00:59:56:12"),
+    (29.97, True, 0, "00:00:00;00"),
+    (29.97, True, 1799, "00:00:59;29"),
+    (29.97, True, 1800, "00:01:00;02"),
+    (29.97, True, 3597, "00:01:59;29"),
+    (29.97, True, 3598, "00:02:00;02"),
+    (29.97, True, 17981, "00:09:59;29"),
+    (29.97, True, 17982, "00:10:00;00"),
+    (29.97, True, 17983, "00:10:00;01"),
+    (29.97, True, 19781, "00:10:59;29"),
+    (29.97, True, 19782, "00:11:00;02"),
+    (29.97, True, 107892, "01:00:00;00"),
+    (29.97, True, 2589407, "23:59:59;29"),
+    (59.94, True, 3599, "00:00:59;59"),
+    (59.94, True, 3600, "00:01:00;04"),
+    (59.94, True, 35964, "00:10:00;00"),
+    (59.94, True, 215784, "01:00:00;00"),
+    (120, False, 119, "00:00:00:119"),
+]
+
+@pytest.fixture(params=["scalar", "vectorized"])
+def conversion(request, monkeypatch):
+    """Run a test through the per-frame path and through the NumPy path."""
+    monkeypatch.setattr(timecode, "VECTORIZE_MIN_FRAMES", 10 ** 9 if request.param == "scalar" else 0)
+    return request.param
+
+@pytest.mark.parametrize("fps, drop_frame, frame, label", KNOWN_TIMECODES)
+def test_known_timecodes(conversion, fps, drop_frame, frame, label):
+    frame_rate = FrameRate(fps, drop_frame)
+    assert frame_rate.to_timecodes([frame]) == [label]
+    assert frame_rate.to_frames([label]) == [frame]
+
+def test_wraps_after_a_day(conversion):
+    frame_rate = FrameRate(29.97, True)
+    assert frame_rate.to_timecodes([2589408, -1]) == ["00:00:00;00", "23:59:59;29"]
+
+@pytest.mark.parametrize("fps, drop_frame", [(24, False), (25, False), (29.97, True), (59.94, True), (120, False)])
+def test_round_trip(fps, drop_frame):
+    frame_rate = FrameRate(fps, drop_frame)
+    frames = list(range(0, 24 * 3600 * frame_rate.nominal - 200000, 997))
+    labels = frame_rate.to_timecodes(frames)
+    assert labels == [frame_rate.to_timecode(frame) for frame in frames]
+    assert frame_rate.to_frames(labels) == frames
+
+def test_without_numpy(monkeypatch):
+    monkeypatch.setattr(timecode, "np", None)
+    frame_rate = FrameRate(29.97, True)
+    frames = list(range(0, 100000, 37))
+    assert frame_rate.to_frames(frame_rate.to_timecodes(frames)) == frames
+
+@pytest.mark.parametrize("label", [
+    "00:01:00;00",   # dropped label
+    "00:01:00;01",   # dropped label
+    "00:00:00;30",   # frames beyond the rate
+    "00:60:00;00",
+    "1:00:00;00",
+    "01:00:00;00;00",
+    "",
+])
+def test_invalid_drop_frame_labels(conversion, label):
+    # The bad label sits in a batch so the vectorized path checks it too
+    with pytest.raises(ValueError):
+        FrameRate(29.97, True).to_frames(["01:00:00;00"] * 40 + [label])
+
+def test_parse():
+    assert FrameRate.parse("29.97 DF") == FrameRate(29.97, True)
+    assert FrameRate.parse("29.97") == FrameRate(29.97, False)
+    assert FrameRate.parse("23.976").nominal == 24
+    # Only 29.97 and 59.94 have drop-frame timecode
+    assert not FrameRate.parse("25", drop_frame=True).drop_frame
+    assert not FrameRate.parse("30", drop_frame=True).drop_frame
+    with pytest.raises(ValueError):
+        FrameRate.parse("fast")
+    assert FrameRate.from_setting("") == FrameRate(24)
+
+def test_drop_frame_project():
+    resolve = fake_resolve.Resolve()
+    resolve.GetProjectManager().add_project(fake_resolve.generate_project(
+        name="df", frame_rate="29.97", drop_frame=True, items_per_track=60, item_frames=900))
+    api = DaVinciResolveAPI(resolve=resolve)
+
+    timeline = api.get_timeline_info()
+    assert (timeline["start_timecode"], timeline["drop_frame"]) == ("01:00:00;00", True)
+    assert timeline["end_timecode"] == "01:30:01;24"
+
+    items = api.get_timeline_items(track_type="video", track=1)["items"]
+    assert (items[0]["start_timecode"], items[0]["end_timecode"]) == ("01:00:00;00", "01:00:30;00")
+    assert items[2]["start_timecode"] == "01:01:00;02"
+    assert all(item["start_timecode"] == FrameRate(29.97, True).to_timecode(item["start"]) for item in items)
+
+    markers = api.get_markers(source="timeline")["markers"]
+    assert markers[0]["timecode"] == "01:00:00;00"
+
+    job = api.get_render_jobs()["jobs"][0]
+    assert (job["mark_in_timecode"], job["mark_out_timecode"]) == ("01:00:00;00", "01:30:01;23")
+
+@pytest.mark.parametrize("direction", ["to_timecodes", "to_frames"])
+def test_bulk_conversion_speed(benchmark, conversion, direction):
+    # Every item start and end of a 50,000 item timeline
+    frame_rate = FrameRate(29.97, True)
+    frames = list(range(107892, 107892 + 100000 * 7, 7))
+    values = frames if direction == "to_timecodes" else frame_rate.to_timecodes(frames)
+    result = benchmark(getattr(frame_rate, direction), values)
+    assert len(result) == len(frames)
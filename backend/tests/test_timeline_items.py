@@ -0,0 +1,29 @@
+"""The timeline items route: errors alike in its JSON and NDJSON formats, and the stored index.
+
+Run with:  python -m pytest tests/test_timeline_items.py
+"""
+import pytest
+
+@pytest.mark.parametrize("format", ["json", "ndjson"])
+def test_unknown_track_type(client, format):
+    response = client.get(f"/api/davinci/timeline/items?track_type=titles&format={format}")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Unknown track type: titles"}
+
+@pytest.mark.parametrize("format", ["json", "ndjson"])
+def test_no_timeline_open(client, resolve_api, fake_project, monkeypatch, format):
+    monkeypatch.setattr(fake_project, "GetCurrentTimeline", lambda: None)
+    resolve_api.invalidate_handles()
+    response = client.get(f"/api/davinci/timeline/items?format={format}")
+    assert response.status_code == 404 and "error" in response.get_json()
+
+def test_index_served_from_store_after_restart(app_module, metadata_store, restart_backend):
+    client = app_module.app.test_client()
+    restart_backend()
+    assert client.get("/api/davinci/timeline/items?limit=500").status_code == 200
+    metadata_store.flush()
+
+    api = restart_backend()
+    assert api.get_timeline_index().source == "store"
+    # A marker query needs the item handles and rebuilds the index from Resolve
+    assert client.get("/api/davinci/markers?source=item").get_json()["total"] > 0
@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import { checkBackendHealth } from '../utils/api';
+import { subscribeToConnection } from '../utils/events';
 
 const BackendStatusIndicator = () => {
   const [status, setStatus] = useState<'loading' | 'connected' | 'disconnected'>('loading');
@@ -19,10 +20,17 @@ const BackendStatusIndicator = () => {
     };
 
     checkConnection();
-    // Check connection periodically
-    const interval = setInterval(checkConnection, 30000);
-    
-    return () => clearInterval(interval);
+    // The shared event stream reports drops and reconnects as they happen, no periodic ping needed
+    const unsubscribe = subscribeToConnection((connected) => {
+      if (connected) {
+        setStatus('connected');
+        setMessage('Connected to backend');
+      } else {
+        checkConnection();
+      }
+    });
+
+    return unsubscribe;
   }, []);
 
   return (
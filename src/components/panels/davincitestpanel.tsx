@@ -1,12 +1,20 @@
 import React, { useState, useEffect } from 'react';
 import './davincitestpanel.css';
-import { API_BASE_URL } from '../../config';
-import { getDiagnostics } from '../../utils/api';
+import { getDiagnostics, getSnapshot } from '../../utils/api';
+import { subscribeToEvent } from '../../utils/events';
+
+interface ConnectionState {
+  state: 'connected' | 'connecting' | 'disconnected';
+  attempts: number;
+  last_error?: string | null;
+  retry_in?: number | null;
+}
 
 interface ResolveStatus {
   status: boolean;
   version?: string;
   error?: string;
+  connection?: ConnectionState;
 }
 
 interface BasicProjectInfo {
@@ -21,6 +29,9 @@ interface TimelineInfo {
   start_frame: number;
   end_frame: number;
   start_timecode: string;
+  end_timecode?: string;
+  frame_rate?: number;
+  drop_frame?: boolean;
   track_count: {
     video: number;
     audio: number;
@@ -44,16 +55,23 @@ interface RenderJobInfo {
     status: string;
     progress: number;
     name: string;
+    eta_seconds?: number | null;
+    fps?: number | null;
+    mark_in_timecode?: string | null;
+    mark_out_timecode?: string | null;
   }>;
+  rendering?: boolean;
   error?: string;
 }
 
 interface Diagnostics {
+  detail: 'summary' | 'stats' | 'full';
   system: {
     platform: string;
     python_version: string;
-    python_path: string[];
-    environment_variables: {
+    // Only included at detail=full
+    python_path?: string[];
+    environment_variables?: {
       RESOLVE_SCRIPT_API: string;
       RESOLVE_SCRIPT_LIB: string;
       PYTHONPATH: string;
@@ -67,6 +85,15 @@ interface Diagnostics {
   project_info?: BasicProjectInfo;
 }
 
+interface Snapshot {
+  status: ResolveStatus;
+  project?: BasicProjectInfo;
+  timeline?: TimelineInfo;
+  mediapool?: MediaPoolInfo;
+  renderjobs?: RenderJobInfo;
+  timings: Record<string, number>;
+}
+
 const DavinciTestPanel: React.FC = () => {
   const [resolveStatus, setResolveStatus] = useState<ResolveStatus | null>(null);
   const [projectInfo, setProjectInfo] = useState<BasicProjectInfo | null>(null);
@@ -79,90 +106,55 @@ const DavinciTestPanel: React.FC = () => {
   const [showDiagnostics, setShowDiagnostics] = useState<boolean>(false);
   const [activeTab, setActiveTab] = useState<string>('project');
 
-  const fetchResolveStatus = async () => {
+  const fetchData = async () => {
+    setLoading(true);
+    setError(null);
     try {
-      const response = await fetch(`${API_BASE_URL}/api/davinci/status`);
-      const data = await response.json();
-      setResolveStatus(data);
+      // One request returns every section, so the backend resolves the project handles only once
+      const snapshot: Snapshot = await getSnapshot(['status', 'project', 'timeline', 'mediapool', 'renderjobs']);
+      setResolveStatus(snapshot.status);
+      setProjectInfo(snapshot.project ?? null);
+      setTimelineInfo(snapshot.timeline ?? null);
+      setMediaPoolInfo(snapshot.mediapool ?? null);
+      setRenderJobs(snapshot.renderjobs ?? null);
+      if (showDiagnostics) {
+        await fetchDiagnostics();
+      }
     } catch (error) {
-      console.error('Error fetching Resolve status:', error);
+      console.error('Error fetching Resolve snapshot:', error);
       setError('Failed to connect to backend server. Is it running?');
       setResolveStatus({ status: false, error: 'Connection error' });
     }
-  };
-
-  const fetchProjectInfo = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/api/davinci/project`);
-      const data = await response.json();
-      setProjectInfo(data);
-    } catch (error) {
-      console.error('Error fetching project info:', error);
-      setError('Failed to fetch project information');
-      setProjectInfo(null);
-    }
-  };
-
-  const fetchTimelineInfo = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/api/davinci/timeline`);
-      const data = await response.json();
-      setTimelineInfo(data);
-    } catch (error) {
-      console.error('Error fetching timeline info:', error);
-      setTimelineInfo(null);
-    }
-  };
-
-  const fetchMediaPoolInfo = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/api/davinci/mediapool`);
-      const data = await response.json();
-      setMediaPoolInfo(data);
-    } catch (error) {
-      console.error('Error fetching media pool info:', error);
-      setMediaPoolInfo(null);
-    }
-  };
-
-  const fetchRenderJobs = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/api/davinci/renderjobs`);
-      const data = await response.json();
-      setRenderJobs(data);
-    } catch (error) {
-      console.error('Error fetching render jobs:', error);
-      setRenderJobs(null);
-    }
+    setLoading(false);
   };
 
   const fetchDiagnostics = async () => {
     try {
-      const data = await getDiagnostics();
-      setDiagnostics(data);
+      // Only fetched while shown; the backend reuses the status and project it just served
+      setDiagnostics(await getDiagnostics('full'));
     } catch (error) {
       console.error('Error fetching diagnostics:', error);
-      setError('Failed to fetch diagnostic information');
+      setDiagnostics(null);
     }
   };
 
-  const fetchData = async () => {
-    setLoading(true);
-    setError(null);
-    await fetchResolveStatus();
-    await fetchProjectInfo();
-    await fetchTimelineInfo();
-    await fetchMediaPoolInfo();
-    await fetchRenderJobs();
-    await fetchDiagnostics();
-    setLoading(false);
-  };
+  useEffect(() => {
+    if (showDiagnostics) {
+      fetchDiagnostics();
+    }
+  }, [showDiagnostics]);
 
   useEffect(() => {
     fetchData();
-    // Setup periodic refresh (every 10 seconds)
-    const interval = setInterval(fetchData, 10000);
-    return () => clearInterval(interval);
+    // The backend pushes a section only when it changes, so there is no refresh interval
+    const unsubscribers = [
+      subscribeToEvent('status', setResolveStatus),
+      subscribeToEvent('project', setProjectInfo),
+      subscribeToEvent('timeline', setTimelineInfo),
+      subscribeToEvent('mediapool', setMediaPoolInfo),
+      subscribeToEvent('renderjobs', setRenderJobs),
+    ];
+    return () => unsubscribers.forEach(unsubscribe => unsubscribe());
   }, []);
 
   const handleRefresh = () => {
@@ -202,7 +194,10 @@ const DavinciTestPanel: React.FC = () => {
           {resolveStatus?.status ? (
             <span>Connected to DaVinci Resolve {resolveStatus.version}</span>
           ) : (
-            <span>Not connected to DaVinci Resolve: {resolveStatus?.error}</span>
+            <span>
+              Not connected to DaVinci Resolve: {resolveStatus?.connection?.last_error || resolveStatus?.error}
+              {resolveStatus?.connection?.retry_in != null && ` (retrying in ${resolveStatus.connection.retry_in}s)`}
+            </span>
           )}
         </div>
       </div>
@@ -283,6 +278,10 @@ const DavinciTestPanel: React.FC = () => {
               <div className="label">Start Timecode</div>
               <div className="value">{timelineInfo.start_timecode}</div>
             </div>
+            <div className="info-item">
+              <div className="label">End Timecode</div>
+              <div className="value">{timelineInfo.end_timecode || "N/A"}</div>
+            </div>
             <div className="info-item">
               <div className="label">Current Timecode</div>
               <div className="value">{timelineInfo.current_timecode || "N/A"}</div>
@@ -342,7 +341,12 @@ const DavinciTestPanel: React.FC = () => {
             <div className="render-jobs-list">
               {renderJobs.jobs.map(job => (
                 <div key={job.id} className="render-job-item">
-                  <div className="render-job-name">{job.name}</div>
+                  <div className="render-job-name">
+                    {job.name}
+                    {job.mark_in_timecode && job.mark_out_timecode && (
+                      <span className="render-job-range"> {job.mark_in_timecode} - {job.mark_out_timecode}</span>
+                    )}
+                  </div>
                   <div className="render-job-status">
                     <span className={`status-badge status-${job.status.toLowerCase()}`}>
                       {job.status}
@@ -356,6 +360,11 @@ const DavinciTestPanel: React.FC = () => {
                         <span className="progress-text">{job.progress}%</span>
                       </div>
                     )}
+                    {job.status === 'Rendering' && job.fps != null && (
+                      <span className="render-job-rate">
+                        {job.fps} fps{job.eta_seconds != null && `, ${Math.ceil(job.eta_seconds)}s left`}
+                      </span>
+                    )}
                   </div>
                 </div>
               ))}
@@ -391,11 +400,11 @@ const DavinciTestPanel: React.FC = () => {
             <div className="info-grid">
               <div className="info-item">
                 <div className="label">RESOLVE_SCRIPT_API</div>
-                <div className="value">{diagnostics.system.environment_variables.RESOLVE_SCRIPT_API}</div>
+                <div className="value">{diagnostics.system.environment_variables?.RESOLVE_SCRIPT_API}</div>
               </div>
               <div className="info-item">
                 <div className="label">RESOLVE_SCRIPT_LIB</div>
-                <div className="value">{diagnostics.system.environment_variables.RESOLVE_SCRIPT_LIB}</div>
+                <div className="value">{diagnostics.system.environment_variables?.RESOLVE_SCRIPT_LIB}</div>
               </div>
             </div>
             
@@ -412,8 +421,8 @@ const DavinciTestPanel: React.FC = () => {
             </div>
             
             <h4>Python Path (hover to see full list)</h4>
-            <div className="python-path" title={diagnostics.system.python_path.join('\n')}>
-              {diagnostics.system.python_path.length} entries...
+            <div className="python-path" title={diagnostics.system.python_path?.join('\n')}>
+              {diagnostics.system.python_path?.length ?? 0} entries...
             </div>
           </div>
         </div>
@@ -30,8 +30,19 @@ export async function checkBackendHealth() {
 export const getAssets = () => fetchFromApi('assets');
 
 /**
- * Get detailed diagnostic information from the backend
+ * Get diagnostic information from the backend
+ *
+ * 'summary' holds the connection and Resolve state, 'stats' adds per-subsystem stats and
+ * 'full' adds the Python path and the Resolve environment variables.
  */
-export async function getDiagnostics() {
-  return fetchFromApi('/api/diagnostics');
-} 
\ No newline at end of file
+export async function getDiagnostics(detail: 'summary' | 'stats' | 'full' = 'summary') {
+  return fetchFromApi(`/api/diagnostics?detail=${detail}`);
+} 
+
+/**
+ * Get status, project, timeline, media pool, render jobs and diagnostics in a single request
+ */
+export async function getSnapshot(sections?: string[]) {
+  const query = sections ? `?sections=${sections.join(',')}` : '';
+  return fetchFromApi(`/api/davinci/snapshot${query}`);
+}
\ No newline at end of file
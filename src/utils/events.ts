@@ -0,0 +1,109 @@
+/**
+ * Shared server-sent event stream from the Flask backend (/api/events)
+ */
+
+import { API_BASE_URL } from '../config';
+
+type EventHandler = (data: any) => void;
+type ConnectionHandler = (connected: boolean) => void;
+
+const eventHandlers = new Map<string, Set<EventHandler>>();
+const connectionHandlers = new Set<ConnectionHandler>();
+let source: EventSource | null = null;
+// Channel list the open source was requested with, and the events it already has listeners for
+let sourceChannels = '';
+const attachedEvents = new Set<string>();
+let reopenTimer: ReturnType<typeof setTimeout> | null = null;
+
+// Components mounting together change the channel list several times in a row; wait this long and reopen once
+const REOPEN_DELAY_MS = 50;
+
+function notifyConnection(connected: boolean) {
+  connectionHandlers.forEach(handler => handler(connected));
+}
+
+function attachListener(eventSource: EventSource, event: string) {
+  if (attachedEvents.has(event)) {
+    return;
+  }
+  attachedEvents.add(event);
+  eventSource.addEventListener(event, (message) => {
+    const data = JSON.parse((message as MessageEvent).data);
+    eventHandlers.get(event)?.forEach(handler => handler(data));
+  });
+}
+
+/**
+ * Open, update or close the single EventSource shared by every component.
+ * The backend only samples the sections somebody listens to, so the channel
+ * list is sent along; the stream is only reconnected when that list changes.
+ */
+function openSource() {
+  reopenTimer = null;
+  if (eventHandlers.size === 0 && connectionHandlers.size === 0) {
+    source?.close();
+    source = null;
+    sourceChannels = '';
+    return;
+  }
+  const channels = ['heartbeat', ...[...eventHandlers.keys()].sort()].join(',');
+  if (!source || channels !== sourceChannels) {
+    source?.close();
+    attachedEvents.clear();
+    const eventSource = new EventSource(`${API_BASE_URL}/api/events?channels=${channels}`);
+    eventSource.onopen = () => notifyConnection(true);
+    // EventSource reconnects by itself, we only report the state
+    eventSource.onerror = () => notifyConnection(false);
+    source = eventSource;
+    sourceChannels = channels;
+  }
+  eventHandlers.forEach((_handlers, event) => attachListener(source!, event));
+}
+
+function scheduleOpen() {
+  if (reopenTimer === null) {
+    reopenTimer = setTimeout(openSource, REOPEN_DELAY_MS);
+  }
+}
+
+/**
+ * Listen for one backend event (status, project, timeline, mediapool, renderjobs, heartbeat).
+ * Returns a function that removes the listener.
+ */
+export function subscribeToEvent(event: string, handler: EventHandler) {
+  let handlers = eventHandlers.get(event);
+  const isNewEvent = !handlers;
+  if (!handlers) {
+    handlers = new Set();
+    eventHandlers.set(event, handlers);
+  }
+  handlers.add(handler);
+  if (isNewEvent || !source) {
+    scheduleOpen();
+  }
+
+  return () => {
+    handlers!.delete(handler);
+    if (handlers!.size === 0 && eventHandlers.get(event) === handlers) {
+      eventHandlers.delete(event);
+      scheduleOpen();
+    }
+  };
+}
+
+/**
+ * Be notified when the event stream connects or drops. Returns a function that removes the listener.
+ */
+export function subscribeToConnection(handler: ConnectionHandler) {
+  connectionHandlers.add(handler);
+  if (!source) {
+    scheduleOpen();
+  }
+
+  return () => {
+    connectionHandlers.delete(handler);
+    if (eventHandlers.size === 0 && connectionHandlers.size === 0) {
+      scheduleOpen();
+    }
+  };
+}